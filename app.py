@@ -1,12 +1,28 @@
+import os
 import re
-import math
+import uuid
+import numpy as np
 import pandas as pd
 import streamlit as st
 import plotly.express as px
+import plotly.graph_objects as go
 
 # Imports from your modules
-from modules.risk_profile import calculate_risk_profile
-from modules.goals import Goal, describe_goal_plan
+from modules.risk_scoring import default_scorer
+from modules.goals import sip_factor_grid, sip_from_grid, WHATIF_YEARS, WHATIF_RETURNS
+from modules.planning import (
+    GOAL_TYPES, extract_goal_details, sip_growth_schedule, glide_growth_schedule, get_allocation_for_profile,
+    generate_insights, get_investment_suggestions, get_detailed_investment_split, build_goal_plan,
+)
+from modules import instrumentation
+from modules.glide_path import ASSET_CLASSES, DERISK_YEARS, glide_template, glide_sip_required
+from modules.household import project_household
+from modules.optimizer import allocate_budget
+from modules.plan_model import PlanPortfolio
+from modules.sensitivity import tornado
+from modules.session import ChatHistory, SessionRegistry, enforce_budget
+from modules.simulation import simulate_goal
+from modules.storage import GoalStore
 
 # 1. PAGE CONFIGURATION
 st.set_page_config(
@@ -15,10 +31,17 @@ st.set_page_config(
     layout="wide",
     initial_sidebar_state="collapsed"
 )
+instrumentation.begin_run()
+instrumentation.lap("page.styling")
 
 # 2. CUSTOM CSS (Rocket Theme + Screenshot Styles)
-def apply_custom_styling():
-    st.markdown("""
+@st.cache_resource
+def minified_markup(markup: str) -> str:
+    """Static CSS/SVG markup with comments and indentation stripped, built once per process."""
+    markup = re.sub(r"/\*.*?\*/", "", markup, flags=re.S)
+    return re.sub(r"\s*\n\s*", " ", markup).strip()
+
+CUSTOM_CSS = """
         <style>
             @import url('https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;600;700&display=swap');
             
@@ -111,7 +134,10 @@ def apply_custom_styling():
             .pill-yellow { background-color: rgba(251, 191, 36, 0.2); border: 1px solid rgba(251, 191, 36, 0.5); }
             .pill-red { background-color: rgba(239, 68, 68, 0.2); border: 1px solid rgba(239, 68, 68, 0.5); }
         </style>
-    """, unsafe_allow_html=True)
+"""
+
+def apply_custom_styling():
+    st.markdown(minified_markup(CUSTOM_CSS), unsafe_allow_html=True)
 
 apply_custom_styling()
 
@@ -143,9 +169,31 @@ ROCKET_SVG = """
 """
 
 # 3. STATE MANAGEMENT
-if "messages" not in st.session_state: st.session_state.messages = []
+instrumentation.lap("page.state")
+@st.cache_resource
+def get_goal_store():
+    return GoalStore(os.environ.get("ROBO_DB_PATH", "roboadvisor.db"))
+
+# Saved goals are keyed by a user id kept in the URL so they survive a refresh
+if "uid" not in st.query_params: st.query_params["uid"] = uuid.uuid4().hex
+if "user_id" not in st.session_state: st.session_state.user_id = st.query_params["uid"]
+# Chat history keeps recent messages in memory and spills the rest to disk
+MAX_CHAT_IN_MEMORY = int(os.environ.get("ROBO_MAX_CHAT", "40"))
+SESSION_BUDGET_BYTES = int(os.environ.get("ROBO_SESSION_BUDGET_KB", "2048")) * 1024
+
+@st.cache_resource
+def get_session_registry():
+    return SessionRegistry(idle_seconds=float(os.environ.get("ROBO_SESSION_IDLE_SECONDS", "1800")),
+                           expire_seconds=float(os.environ.get("ROBO_SESSION_EXPIRE_SECONDS", "86400")))
+
+if "session_id" not in st.session_state: st.session_state.session_id = uuid.uuid4().hex
+if "messages" not in st.session_state:
+    st.session_state.messages = ChatHistory(get_session_registry().chat_path(st.session_state.session_id), MAX_CHAT_IN_MEMORY)
+# Rebuildable per-session state lives in the registry so idle sessions can be shed
+session_data = get_session_registry().touch(st.session_state.session_id, st.session_state.messages)
+get_session_registry().evict_idle()
 if "risk_profile" not in st.session_state: st.session_state.risk_profile = None
-if "goals" not in st.session_state: st.session_state.goals = []
+if "goals" not in session_data: session_data["goals"] = get_goal_store().list_goals(st.session_state.user_id)
 if "last_plan" not in st.session_state: st.session_state.last_plan = None
 if "last_plan_saved" not in st.session_state: st.session_state.last_plan_saved = True
 if "current_page" not in st.session_state: st.session_state.current_page = "home"
@@ -163,130 +211,130 @@ if "inflation" not in st.session_state: st.session_state.inflation = 5.0
 if "monthly_income" not in st.session_state: st.session_state.monthly_income = 50000.0
 if "goal_type" not in st.session_state: st.session_state.goal_type = "General"
 
-# 4. META & HELPER LOGIC
-GOAL_TYPES = {
-    "General": {"icon": "📌", "note": "Flexible goal.", "default_return": 12.0, "amount_hint": "2L, 5L, 10L"},
-    "Education": {"icon": "🎓", "note": "Equity-heavy.", "default_return": 11.0, "amount_hint": "15L - 30L"},
-    "House": {"icon": "🏠", "note": "Medium/Long term.", "default_return": 10.0, "amount_hint": "40L - 1.5Cr"},
-    "Marriage": {"icon": "💍", "note": "5-15 years.", "default_return": 11.0, "amount_hint": "10L - 25L"},
-    "Vehicle": {"icon": "🚗", "note": "Shorter term.", "default_return": 9.0, "amount_hint": "8L - 15L"},
-    "Retirement": {"icon": "🧓", "note": "Long term.", "default_return": 12.0, "amount_hint": "1Cr - 3Cr"},
-}
-
-def extract_goal_details(text: str):
-    text = text.lower()
-    amount = None
-    m_amt = re.search(r"(\d+)\s*(l|lac|lakh|crore|cr|k|rs|₹)", text)
-    if m_amt:
-        n = float(m_amt.group(1))
-        unit = m_amt.group(2)
-        if unit in ("l", "lac", "lakh"): amount = n * 1_00_000
-        elif unit in ("cr", "crore"): amount = n * 1_00_00_000
-        elif unit == "k": amount = n * 1_000
-        else: amount = n
-    years = None
-    m_years = re.search(r"(\d+)\s*(year|years|yr|yrs)", text)
-    if m_years: years = int(m_years.group(1))
-    expected_return = None
-    m_ret = re.search(r"(\d+(\.\d+)?)\s*%", text)
-    if m_ret: expected_return = float(m_ret.group(1))
-    return amount, years, expected_return
-
-def calculate_sip(target_amount, years, annual_return):
-    r = annual_return / 100.0
-    monthly_rate = r / 12.0
-    months = years * 12
-    if monthly_rate == 0: return target_amount / months
-    sip = target_amount * monthly_rate / ((1 + monthly_rate) ** months - 1)
-    return sip
-
-def sip_growth_schedule(monthly_sip, years, annual_return):
-    r = annual_return / 100.0
-    monthly_rate = r / 12.0
-    values = []
-    for yr in range(1, years + 1):
-        m = yr * 12
-        if monthly_rate == 0: fv = monthly_sip * m
-        else: fv = monthly_sip * ((1 + monthly_rate) ** m - 1) / monthly_rate
-        values.append((yr, fv))
-    return values
-
-def get_allocation_for_profile(profile: str):
-    if not profile: profile = "Moderate"
-    p = profile.lower()
-    if "aggress" in p: return {"Equity Funds": 70, "Hybrid / Balanced": 20, "Debt / Liquid": 10}
-    if "conserv" in p: return {"Equity Funds": 20, "Hybrid / Balanced": 30, "Debt / Liquid": 50}
-    return {"Equity Funds": 50, "Hybrid / Balanced": 30, "Debt / Liquid": 20}
-
-def risk_heat_label(risk_profile: str, years: int):
-    rp = (risk_profile or "Moderate").lower()
-    if years <= 5: horizon_factor = "short"
-    elif years <= 12: horizon_factor = "medium"
-    else: horizon_factor = "long"
-    if "aggress" in rp and horizon_factor == "short": return "🔥 High execution risk", "High return expectations over a short horizon. Consider more debt / hybrid."
-    if "conserv" in rp and horizon_factor == "long": return "🟡 Cautious but slow", "Very conservative profile for a long-term goal. You may fall short if SIP is too low."
-    if horizon_factor == "short": return "🟠 Medium–High risk", "Short horizon means limited time to recover from volatility."
-    if horizon_factor == "long": return "🟢 Comfortable zone", "Long horizon gives you time to ride out market volatility."
-    return "🟡 Balanced risk", "Overall risk and horizon look reasonably aligned."
-
-def affordability_comment(monthly_sip: float, monthly_income: float):
-    if monthly_income <= 0: return "ℹ️ Add income in Budget Planner to see hints."
-    ratio = monthly_sip / monthly_income
-    if ratio > 0.5: return "🔴 This SIP is > 50% of your income. It may not be affordable."
-    if ratio > 0.3: return "🟠 This SIP is 30–50% of your income. A bit tight."
-    if ratio > 0.15: return "🟡 This SIP is moderate (15–30% of income)."
-    return "🟢 This SIP is under 15% of your income. Affordable."
-
-def generate_insights(lp):
-    insights = []
-    years = lp["years"]
-    ret = lp["return"]
-    infl = lp["inflation"]
-    if years < 5 and ret >= 12: insights.append("For <5 years, assuming 12%+ returns is aggressive.")
-    if years >= 10 and ret <= 9: insights.append("For 10+ years, consider higher equity allocation to beat inflation.")
-    if infl < 4: insights.append("Inflation assumption is low. 5-7% is standard.")
-    if infl > 7: insights.append("High inflation assumption keeps you safe.")
-    if not insights: insights.append("Assumptions look broadly reasonable.")
-    return insights
-
-def get_investment_suggestions(profile: str, goal_type: str, years: int):
-    profile = (profile or "Moderate").lower()
-    goal_type = (goal_type or "General").lower()
-    horizon = "short" if years <= 5 else "medium" if years <= 10 else "long"
-    suggestions = []
-    if horizon == "short":
-        suggestions.append({"title": "Debt / Liquid mutual funds", "desc": "Focus on capital protection for goals under 5 years."})
-        suggestions.append({"title": "High-interest RD / FD", "desc": "Predictable, low-risk returns."})
-    elif horizon == "medium":
-        suggestions.append({"title": "Hybrid / Balanced Advantage", "desc": "Blends equity and debt, adjusting automatically."})
-        if "aggress" in profile or "moderate" in profile: suggestions.append({"title": "Large-cap index funds", "desc": "Growth with lower volatility than mid-caps."})
-    else: # long
-        suggestions.append({"title": "Equity index funds", "desc": "Low-cost broad market growth for 10+ years."})
-        suggestions.append({"title": "Flexi-cap funds", "desc": "Active management across market caps."})
-        if "conserv" in profile: suggestions.append({"title": "Hybrid equity-oriented", "desc": "Equity potential with debt cushioning."})
-    if "house" in goal_type: suggestions.append({"title": "Dedicated House Portfolio", "desc": "Keep separate to avoid dipping."})
-    if "education" in goal_type: suggestions.append({"title": "Inflation-focused", "desc": "Edu inflation is often higher than CPI."})
-    return suggestions
-
-def get_detailed_investment_split(profile: str, years: int):
-    profile = (profile or "Moderate").lower()
-    horizon = "short" if years <= 5 else "medium" if years <= 10 else "long"
-    split = []
-    if "aggress" in profile:
-        if horizon == "long": split = [{"Bucket": "Core Equity", "Percent": 45}, {"Bucket": "Mid/Small Cap", "Percent": 20}, {"Bucket": "Thematic", "Percent": 10}, {"Bucket": "Hybrid", "Percent": 15}, {"Bucket": "Debt", "Percent": 10}]
-        elif horizon == "medium": split = [{"Bucket": "Core Equity", "Percent": 35}, {"Bucket": "Mid Cap", "Percent": 15}, {"Bucket": "Hybrid", "Percent": 25}, {"Bucket": "Debt", "Percent": 25}]
-        else: split = [{"Bucket": "Large Cap", "Percent": 25}, {"Bucket": "Hybrid", "Percent": 25}, {"Bucket": "Debt", "Percent": 30}, {"Bucket": "Cash", "Percent": 20}]
-    elif "conserv" in profile:
-        if horizon == "long": split = [{"Bucket": "Large Cap", "Percent": 30}, {"Bucket": "Hybrid", "Percent": 30}, {"Bucket": "Debt", "Percent": 30}, {"Bucket": "Cash", "Percent": 10}]
-        elif horizon == "medium": split = [{"Bucket": "Large Cap", "Percent": 25}, {"Bucket": "Hybrid", "Percent": 30}, {"Bucket": "Debt", "Percent": 35}, {"Bucket": "Cash", "Percent": 10}]
-        else: split = [{"Bucket": "Debt", "Percent": 50}, {"Bucket": "Cash", "Percent": 30}, {"Bucket": "Hybrid", "Percent": 20}]
-    else: # moderate
-        if horizon == "long": split = [{"Bucket": "Core Equity", "Percent": 40}, {"Bucket": "Mid Cap", "Percent": 15}, {"Bucket": "Hybrid", "Percent": 20}, {"Bucket": "Debt", "Percent": 15}, {"Bucket": "Cash", "Percent": 10}]
-        elif horizon == "medium": split = [{"Bucket": "Core Equity", "Percent": 30}, {"Bucket": "Hybrid", "Percent": 30}, {"Bucket": "Debt", "Percent": 30}, {"Bucket": "Cash", "Percent": 10}]
-        else: split = [{"Bucket": "Debt", "Percent": 45}, {"Bucket": "Cash", "Percent": 25}, {"Bucket": "Hybrid", "Percent": 30}]
-    return split
+# 4. CACHED UI HELPERS (domain logic lives in modules/planning.py)
+@st.cache_data(show_spinner=False, max_entries=64)
+def cached_goal_simulation(monthly_sip, years, target, annual_return, risk_profile, n_paths=100_000):
+    return simulate_goal(monthly_sip, years, target, annual_return=annual_return,
+                         risk_profile=risk_profile, n_paths=n_paths, seed=42)
+
+def sync_saved_goals():
+    """Apply inflation / risk profile changes to saved goals, recomputing only what they affect."""
+    current = {"inflation": st.session_state.inflation, "risk_profile": st.session_state.risk_profile}
+    previous = st.session_state.get("last_assumptions")
+    st.session_state.last_assumptions = current
+    goals = session_data["goals"]
+    if "plan_portfolio" not in session_data or len(session_data["plan_portfolio"].plans) != len(goals):
+        session_data["plan_portfolio"] = PlanPortfolio.from_saved_goals(goals)
+    if previous is None or previous == current or not goals: return
+
+    portfolio = session_data["plan_portfolio"]
+    changed = set()
+    for name, value in current.items():
+        if value is not None and value != previous[name]: changed.update(portfolio.set_assumption(name, value))
+    if not changed: return
+    changed = sorted(changed)
+    for i, values in zip(changed, portfolio.refresh(("inflated_target", "sip"), changed)):
+        plan = portfolio.plans[i]
+        goals[i].update({
+            "Inflation (%)": plan.get("inflation"), "Risk": plan.get("risk_profile"),
+            "Inflation-adjusted Target (₹)": round(values["inflated_target"]), "Monthly SIP (₹)": round(values["sip"]),
+        })
+    get_goal_store().update_goals(st.session_state.user_id, [goals[i] for i in changed])
+
+# Figures depend only on their arguments, so they are built once per argument set. cache_data hands
+# every caller its own copy: st.plotly_chart mutates the figure it is given.
+@st.cache_data(max_entries=256, show_spinner=False)
+def budget_pie_figure(essential, lifestyle, investments, free_cash):
+    df_pie = pd.DataFrame({"Category": ["Essentials", "Lifestyle", "Investments", "Free Cash"], "Amount": [essential, lifestyle, investments, free_cash]})
+    fig = px.pie(df_pie, values="Amount", names="Category", hole=0.4, template="plotly_dark", color_discrete_sequence=['#3B82F6', '#F472B6', '#6C28FE', '#10B981'])
+    fig.update_layout(paper_bgcolor="rgba(0,0,0,0)")
+    return fig
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def allocation_figures(risk_profile, years):
+    alloc = get_allocation_for_profile(risk_profile)
+    fig = px.pie(values=list(alloc.values()), names=list(alloc.keys()), hole=0.4, template="plotly_dark")
+    fig.update_layout(paper_bgcolor="rgba(0,0,0,0)")
+    df_det = pd.DataFrame(get_detailed_investment_split(risk_profile, years))
+    fig2 = px.bar(df_det, x="Bucket", y="Percent", template="plotly_dark")
+    fig2.update_layout(paper_bgcolor="rgba(0,0,0,0)")
+    df_glide = pd.DataFrame(glide_template(risk_profile, years * 12) * 100, columns=ASSET_CLASSES)
+    df_glide.insert(0, "Month", range(1, len(df_glide) + 1))
+    fig3 = px.area(df_glide, x="Month", y=list(ASSET_CLASSES), template="plotly_dark", labels={"value": "Percent"})
+    fig3.update_layout(paper_bgcolor="rgba(0,0,0,0)")
+    return fig, fig2, fig3
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def sip_grid_figure(target):
+    fig_grid = px.imshow(sip_factor_grid() * target, x=WHATIF_RETURNS, y=WHATIF_YEARS,
+                         labels={"x": "Return %", "y": "Years", "color": "SIP (₹)"},
+                         aspect="auto", origin="lower", template="plotly_dark", color_continuous_scale="Plasma")
+    fig_grid.update_layout(paper_bgcolor="rgba(0,0,0,0)")
+    return fig_grid
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def household_figures(rows, budget):
+    names, sips, years, returns = zip(*rows)
+    timeline = project_household(sips, years, returns, names=names, budget=budget)
+    df_t = timeline.to_frame(yearly=True)
+    df_t["Year"] = df_t["Month"] / 12
+    fig = px.area(df_t, x="Year", y="Corpus", color="Goal", template="plotly_dark", labels={"Corpus": "Corpus (₹)"})
+    matured = df_t[df_t["Payout"] > 0]
+    fig.add_scatter(x=matured["Year"], y=matured["Payout"], mode="markers", name="Goal matures", marker={"symbol": "star", "size": 11})
+    fig.update_layout(paper_bgcolor="rgba(0,0,0,0)")
+    df_flow = pd.DataFrame({"Year": np.arange(1, timeline.months + 1) / 12, "Goal SIPs": timeline.total_contributions})
+    fig2 = px.line(df_flow, x="Year", y="Goal SIPs", line_shape="hv", template="plotly_dark", labels={"Goal SIPs": "Monthly outflow (₹)"})
+    if budget is not None: fig2.add_hline(y=budget, line_dash="dash", line_color="#10B981", annotation_text="Budget")
+    fig2.update_layout(paper_bgcolor="rgba(0,0,0,0)")
+    return fig, fig2, int(timeline.over_budget().sum())
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def tornado_figure(original_target, sip, inflation, annual_return, years):
+    base = {"inflation": inflation, "return": annual_return, "years": years, "step_up": 0.0}
+    ranges = {"inflation": (max(inflation - 2, 0), inflation + 2), "return": (max(annual_return - 3, 1), annual_return + 3),
+              "years": (max(years - 3, 1), years + 3), "step_up": (0.0, 10.0)}
+    df_t = tornado(original_target, sip, base, ranges).iloc[::-1]
+    labels = {"inflation": "Inflation", "return": "Return", "years": "Horizon", "step_up": "Step-up"}
+    fig = go.Figure()
+    for end, color in (("sip_low", "#3B82F6"), ("sip_high", "#F472B6")):
+        fig.add_bar(y=df_t["axis"].map(labels), x=df_t[end] - sip, base=sip, orientation="h", marker_color=color,
+                    name="Low value" if end == "sip_low" else "High value",
+                    customdata=df_t[[end[4:], end]].to_numpy(), hovertemplate="%{customdata[0]} → ₹%{customdata[1]:,.0f}<extra></extra>")
+    fig.update_layout(barmode="overlay", template="plotly_dark", paper_bgcolor="rgba(0,0,0,0)", xaxis_title="Monthly SIP (₹)")
+    return fig
+
+# Fragments rerun on their own widgets without re-executing the whole page
+fragment = getattr(st, "fragment", None) or st.experimental_fragment
+
+@fragment
+def render_whatif(lp):
+    st.markdown("#### Simulation")
+    c1, c2 = st.columns(2)
+    base_years = min(max(lp['years'], 1), 40)
+    base_return = min(max(round(lp['return'] * 2) / 2, 5.0), 20.0)
+    w_years = c1.slider("Years", 1, 40, base_years)
+    w_return = c2.slider("Return %", 5.0, 20.0, base_return, step=0.5)
+    # Baseline and slider SIP both come from the grid, so the delta is 0 until a slider moves
+    base_sip = sip_from_grid(lp['inflated_target'], base_years, base_return)
+    w_sip = sip_from_grid(lp['inflated_target'], w_years, w_return)
+    st.metric("New SIP Required", f"₹{w_sip:,.0f}", delta=f"{base_sip-w_sip:,.0f} saved")
+    if (base_years, base_return) != (lp['years'], lp['return']): st.caption(f"Sliders start from the nearest grid point ({base_years} years, {base_return:.1f}%) to your plan.")
+    render_simulation(cached_goal_simulation(w_sip, w_years, lp['inflated_target'], w_return, lp['risk_profile']))
+    st.markdown("#### SIP Trade-off Surface")
+    st.plotly_chart(sip_grid_figure(lp['inflated_target']), use_container_width=True)
+    st.markdown("#### What moves your SIP most")
+    st.plotly_chart(tornado_figure(lp['original_target'], lp['sip'], lp['inflation'], lp['return'], lp['years']), use_container_width=True)
+    st.caption("Each bar varies one assumption (inflation ±2%, return ±3%, horizon ±3 years, annual SIP step-up 0–10%) with the rest unchanged.")
+
+def render_simulation(sim):
+    c1, c2, c3 = st.columns(3)
+    c1.metric("Chance of reaching target", f"{sim.success_probability*100:.0f}%")
+    c2.metric("Median corpus", f"₹{sim.percentiles[50]:,.0f}")
+    c3.metric("Bad case (5th pct.)", f"₹{sim.percentiles[5]:,.0f}")
+    st.caption(f"Based on {sim.n_paths:,} simulated market paths. Range: ₹{sim.percentiles[5]:,.0f} – ₹{sim.percentiles[95]:,.0f}.")
 
 # ---------- GLOBAL NAVIGATION ----------
+instrumentation.lap("page.navigation")
 c1, c2, c3, c4, c5 = st.columns([0.4, 0.15, 0.15, 0.15, 0.15])
 with c1: st.markdown("### 🚀 Robo<span class='gradient-text'>Advisor</span>", unsafe_allow_html=True)
 with c2: 
@@ -300,6 +348,7 @@ with c5:
 st.markdown("<br>", unsafe_allow_html=True)
 
 page = st.session_state.current_page
+instrumentation.lap(f"page.{page}")
 
 # === HOME PAGE ===
 if page == "home":
@@ -314,7 +363,7 @@ if page == "home":
         with c_h2:
             if st.button("Check Budget ➝", use_container_width=True): st.session_state.current_page = "budget"; st.rerun()
         st.markdown("<br><div class='card-like'><p> Create Your Plans Now &nbsp;&nbsp;</p></div>", unsafe_allow_html=True)
-    with col_img: st.markdown(ROCKET_SVG, unsafe_allow_html=True)
+    with col_img: st.markdown(minified_markup(ROCKET_SVG), unsafe_allow_html=True)
 
 # === CHAT / PLANNER PAGE (EXACT ORIGINAL LOGIC RESTORED) ===
 elif page == "chat":
@@ -367,14 +416,13 @@ elif page == "chat":
                 st.session_state.monthly_income = st.number_input("Approx. monthly income (₹)", min_value=0.0, value=st.session_state.monthly_income, step=5000.0)
 
                 if st.button("Update risk profile", use_container_width=True):
-                    age_score = 5 if st.session_state.age < 30 else 3 if st.session_state.age < 50 else 1
-                    answers = [age_score, st.session_state.income_stability, st.session_state.horizon_years / 5,
-                               st.session_state.crash_reaction, st.session_state.experience, st.session_state.dip_behavior]
-                    profile = calculate_risk_profile(answers)
+                    profile, score = default_scorer().profile_for(
+                        **{q: st.session_state[q] for q in default_scorer().questions})
                     st.session_state.risk_profile = profile
-                    st.success(f"Risk profile updated: **{profile}**")
+                    st.success(f"Risk profile updated: **{profile}** (score {score:.1f})")
 
         st.caption("These settings influence how your plans and suggestions are interpreted.")
+    sync_saved_goals()
 
     st.markdown("---")
     st.subheader("💬 Chat with your robo-advisor")
@@ -390,6 +438,11 @@ elif page == "chat":
         if st.button("🎓 20L in 10 yrs @ 12%"): st.session_state.prefill_text = "Plan a SIP for 20 lakh in 10 years at 12%"
 
     # Chat History
+    if st.session_state.messages.spilled_count:
+        if st.toggle(f"Show {st.session_state.messages.spilled_count} earlier messages"):
+            for msg in st.session_state.messages.older(MAX_CHAT_IN_MEMORY):
+                with st.chat_message(msg["role"]):
+                    st.markdown(msg["content"])
     for msg in st.session_state.messages:
         with st.chat_message(msg["role"]):
             st.markdown(msg["content"])
@@ -430,19 +483,11 @@ elif page == "chat":
         
         # CASE B: Full plan
         else:
-            assumed_return = expected_return if expected_return is not None else gt_meta_local["default_return"]
             infl = st.session_state.inflation
-            inflated_target = amount * ((1 + infl / 100.0) ** years)
-            monthly_sip = calculate_sip(inflated_target, years, assumed_return)
-
-            goal = Goal(f"{goal_type} Goal (inflation-adjusted)", inflated_target, years, assumed_return, rp)
-            plan_text = describe_goal_plan(goal)
-
-            st.session_state.last_plan = {
-                "original_target": amount, "inflated_target": inflated_target, "years": years,
-                "inflation": infl, "return": assumed_return, "sip": monthly_sip, 
-                "risk_profile": rp, "goal_type": goal_type
-            }
+            st.session_state.last_plan, plan_text = build_goal_plan(amount, years, expected_return, infl, goal_type, rp)
+            assumed_return = st.session_state.last_plan["return"]
+            inflated_target = st.session_state.last_plan["inflated_target"]
+            monthly_sip = st.session_state.last_plan["sip"]
             st.session_state.last_plan_saved = False
 
             reply = (
@@ -471,15 +516,17 @@ elif page == "chat":
         with col1:
             if st.button("✅ Yes, save this goal"):
                 lp = st.session_state.last_plan
-                st.session_state.goals.append({
-                    "Goal": f"Goal {len(st.session_state.goals) + 1}",
+                goal = {
+                    "Goal": f"Goal {len(session_data['goals']) + 1}",
                     "Goal type": lp.get("goal_type", "General"),
                     "Original Target (₹)": round(lp["original_target"]),
                     "Inflation-adjusted Target (₹)": round(lp["inflated_target"]),
                     "Years": lp["years"], "Risk": lp["risk_profile"],
                     "Inflation (%)": lp["inflation"], "Return (%)": lp["return"],
                     "Monthly SIP (₹)": round(lp["sip"]),
-                })
+                }
+                goal["id"] = get_goal_store().add_goal(st.session_state.user_id, goal)
+                session_data["goals"].append(goal)
                 st.session_state.last_plan_saved = True
                 st.success("Goal saved to your dashboard.")
         with col2:
@@ -503,6 +550,7 @@ elif page == "budget":
         total_exp = essential + lifestyle
         free_cash = max(income - total_exp - current_sip, 0)
         savings_rate = (current_sip + free_cash) / income if income > 0 else 0
+        st.session_state.monthly_budget = free_cash + current_sip
     with col_sum:
         st.markdown("#### Summary")
         c1, c2 = st.columns(2)
@@ -512,10 +560,7 @@ elif page == "budget":
         if savings_rate < 0.1: habit_cls, habit_txt = "pill-red", "Low"
         elif savings_rate < 0.2: habit_cls, habit_txt = "pill-yellow", "Okay"
         st.markdown(f"<span class='pill {habit_cls}'>Habit: {habit_txt} ({savings_rate*100:.1f}%)</span>", unsafe_allow_html=True)
-        df_pie = pd.DataFrame({"Category": ["Essentials", "Lifestyle", "Investments", "Free Cash"], "Amount": [essential, lifestyle, current_sip, free_cash]})
-        fig = px.pie(df_pie, values="Amount", names="Category", hole=0.4, template="plotly_dark", color_discrete_sequence=['#3B82F6', '#F472B6', '#6C28FE', '#10B981'])
-        fig.update_layout(paper_bgcolor="rgba(0,0,0,0)")
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(budget_pie_figure(essential, lifestyle, current_sip, free_cash), use_container_width=True)
     st.markdown("---")
     tab_em, tab_goalcheck, tab_deploy = st.tabs(["🛟 Emergency", "🎯 Goal Check", "🧭 Deployment"])
     with tab_em:
@@ -528,11 +573,26 @@ elif page == "budget":
         if gap > 0: st.warning(f"Build emergency fund! You are short by ₹{gap:,.0f}")
         else: st.success("Emergency fund fully sorted!")
     with tab_goalcheck:
-        if st.session_state.goals:
-            df_g = pd.DataFrame(st.session_state.goals)
-            req_sip = df_g["Monthly SIP (₹)"].sum()
+        totals = get_goal_store().totals(st.session_state.user_id)
+        if totals.goal_count:
+            req_sip = totals.total_sip
             st.metric("Total Goal SIP Needed", f"₹{req_sip:,.0f}")
-            if req_sip > (free_cash + current_sip): st.error("Shortfall! Your budget cannot support all goal SIPs.")
+            if req_sip > (free_cash + current_sip):
+                st.error("Shortfall! Your budget cannot support all goal SIPs.")
+                strategy = st.radio("Split budget by", ["Deadline first", "Proportional"], horizontal=True)
+                goals = session_data["goals"]
+                alloc = allocate_budget(
+                    [g["Inflation-adjusted Target (₹)"] for g in goals], [g["Years"] for g in goals],
+                    [g["Return (%)"] for g in goals], free_cash + current_sip,
+                    strategy="priority" if strategy == "Deadline first" else "proportional",
+                )
+                st.dataframe(pd.DataFrame({
+                    "Goal": [g["Goal"] for g in goals],
+                    "Needed SIP (₹)": alloc.required.round(),
+                    "Affordable SIP (₹)": alloc.allocated.round(),
+                    "Extra years needed": alloc.extra_years,
+                }), hide_index=True, use_container_width=True)
+                st.caption("Affordable SIP is the first month's share; it rises as earlier goals mature and free their SIP. Extra years: how much each deadline must move (∞ = never funded).")
             else: st.success("On Track! Your budget covers your goals.")
         else: st.info("No goals saved yet.")
     with tab_deploy:
@@ -557,48 +617,55 @@ elif page == "analytics":
             insights = generate_insights(lp)
             st.markdown("#### Insights")
             for i in insights: st.markdown(f"- {i}")
-            sched = sip_growth_schedule(lp['sip'], lp['years'], lp['return'])
-            df_chart = pd.DataFrame(sched, columns=["Year", "Corpus"])
-            st.line_chart(df_chart, x="Year", y="Corpus")
+            monthly_view = st.toggle("Monthly resolution", value=False)
+            period = "Month" if monthly_view else "Year"
+            glide_sip = lp.get('glide_sip') or glide_sip_required(lp['inflated_target'], lp['years'], lp['risk_profile'])
+            sched = sip_growth_schedule(lp['sip'], lp['years'], lp['return'], monthly=monthly_view)
+            glide = glide_growth_schedule(glide_sip, lp['years'], lp['risk_profile'], monthly=monthly_view)
+            df_chart = pd.DataFrame(sched, columns=[period, "Flat return"])
+            df_chart["Glide path"] = [v for _, v in glide]
+            st.line_chart(df_chart, x=period, y=["Flat return", "Glide path"])
+            st.caption(f"Glide path: ₹{glide_sip:,.0f}/month with equity shifted to debt over the last {DERISK_YEARS} years.")
+            st.markdown("#### Market Simulation")
+            render_simulation(cached_goal_simulation(lp['sip'], lp['years'], lp['inflated_target'], lp['return'], lp['risk_profile']))
         else: st.info("Plan a goal to see overview.")
     with tab_whatif:
-        if lp:
-            st.markdown("#### Simulation")
-            c1, c2 = st.columns(2)
-            w_years = c1.slider("Years", 1, 40, lp['years'])
-            w_return = c2.slider("Return %", 5.0, 20.0, lp['return'])
-            w_sip = calculate_sip(lp['inflated_target'], w_years, w_return)
-            st.metric("New SIP Required", f"₹{w_sip:,.0f}", delta=f"{lp['sip']-w_sip:,.0f} saved")
+        if lp: render_whatif(lp)
         else: st.info("Plan a goal to run simulations.")
     with tab_alloc:
         if lp:
-            alloc = get_allocation_for_profile(lp['risk_profile'])
-            detailed = get_detailed_investment_split(lp['risk_profile'], lp['years'])
+            fig, fig2, fig3 = allocation_figures(lp['risk_profile'], lp['years'])
             c1, c2 = st.columns(2)
             with c1:
                 st.markdown("#### Asset Class")
-                fig = px.pie(values=list(alloc.values()), names=list(alloc.keys()), hole=0.4, template="plotly_dark")
-                fig.update_layout(paper_bgcolor="rgba(0,0,0,0)")
                 st.plotly_chart(fig, use_container_width=True)
             with c2:
                 st.markdown("#### Detailed Split")
-                df_det = pd.DataFrame(detailed)
-                fig2 = px.bar(df_det, x="Bucket", y="Percent", template="plotly_dark")
-                fig2.update_layout(paper_bgcolor="rgba(0,0,0,0)")
                 st.plotly_chart(fig2, use_container_width=True)
+            st.markdown("#### Glide Path")
+            st.plotly_chart(fig3, use_container_width=True)
+            glide_sip = lp.get('glide_sip') or glide_sip_required(lp['inflated_target'], lp['years'], lp['risk_profile'])
+            st.metric("SIP following the glide path", f"₹{glide_sip:,.0f}", delta=f"{glide_sip - lp['sip']:,.0f} vs flat return", delta_color="inverse")
+            st.caption(f"Equity is shifted to debt over the last {DERISK_YEARS} years; SIP uses assumed returns per asset class.")
         else: st.info("Plan a goal to see allocations.")
     with tab_goals:
-        if st.session_state.goals:
-            df = pd.DataFrame(st.session_state.goals)
-            total_sip = df["Monthly SIP (₹)"].sum()
-            total_future = df["Inflation-adjusted Target (₹)"].sum()
+        totals = get_goal_store().totals(st.session_state.user_id)
+        if totals.goal_count:
             c1, c2, c3 = st.columns(3)
-            c1.metric("Total Goals", len(df))
-            c2.metric("Total Monthly SIP", f"₹{total_sip:,.0f}")
-            c3.metric("Total Target Wealth", f"₹{total_future:,.0f}")
+            c1.metric("Total Goals", totals.goal_count)
+            c2.metric("Total Monthly SIP", f"₹{totals.total_sip:,.0f}")
+            c3.metric("Total Target Wealth", f"₹{totals.total_target:,.0f}")
+            st.markdown("#### 📅 Household Timeline")
+            budget = st.session_state.get("monthly_budget")
+            rows = tuple((g["Goal"], g["Monthly SIP (₹)"], g["Years"], g["Return (%)"]) for g in session_data["goals"])
+            fig_corpus, fig_flow, months_over = household_figures(rows, budget)
+            st.plotly_chart(fig_corpus, use_container_width=True)
+            st.plotly_chart(fig_flow, use_container_width=True)
+            if budget is None: st.caption("Set your income and expenses on the Budget page to overlay your monthly budget.")
+            elif months_over: st.warning(f"Goal SIPs exceed your ₹{budget:,.0f} monthly budget for {months_over // 12} years {months_over % 12} months.")
             st.markdown("---")
             st.markdown("#### 🗂 Your Goal Cards")
-            for g in st.session_state.goals:
+            for g in session_data["goals"]:
                 icon = GOAL_TYPES.get(g["Goal type"], GOAL_TYPES["General"])["icon"]
                 risk = (g["Risk"] or "Moderate").lower()
                 pill_cls = "pill-red" if "aggress" in risk else "pill-green" if "conserv" in risk else "pill-yellow"
@@ -626,4 +693,23 @@ elif page == "analytics":
     </div>
 </div>
 """, unsafe_allow_html=True)
-        else: st.info("No saved goals. Use the Planner to create one.")
\ No newline at end of file
+        else: st.info("No saved goals. Use the Planner to create one.")
+
+# ---------- DEBUG TIMINGS (ROBO_PROFILE=1) ----------
+instrumentation.end_run()
+# Keep this session under its memory budget; dropped goals reload from the goal store next rerun
+enforce_budget(session_data, SESSION_BUDGET_BYTES)
+if instrumentation.is_enabled():
+    with st.expander("⏱ Debug: rerun timings"):
+        runs = [t for t in instrumentation.timings() if t.name == "rerun.total"]
+        if runs:
+            last = runs[-1]
+            st.metric("Last rerun", f"{last.seconds * 1000:.1f} ms")
+            df_bd = pd.DataFrame(list(instrumentation.breakdown(last.run).items()), columns=["Section", "Seconds"])
+            df_bd["ms"] = (df_bd["Seconds"] * 1000).round(2)
+            st.dataframe(df_bd[["Section", "ms"]], hide_index=True, use_container_width=True)
+            st.line_chart(pd.DataFrame({"Rerun ms": [t.seconds * 1000 for t in runs[-100:]]}))
+        out_dir = os.environ.get("ROBO_PROFILE_DIR", ".")
+        e1, e2 = st.columns(2)
+        if e1.button("Export JSON"): st.success(f"Wrote {instrumentation.export_json(os.path.join(out_dir, 'timings.json'))}")
+        if e2.button("Export Prometheus"): st.success(f"Wrote {instrumentation.export_prometheus(os.path.join(out_dir, 'timings.prom'))}")
@@ -0,0 +1,75 @@
+# benchmarks/bench_parser.py
+"""
+Throughput benchmark for the goal parser.
+
+    python -m benchmarks.bench_parser --rows 200000
+"""
+
+import argparse
+import random
+import re
+import time
+
+from modules.parser import parse_goal, parse_many, parse_series
+
+SAMPLES = [
+    "Plan a SIP for {a} lakh in {y} years",
+    "{a} lakh in {y} yrs at {r}%",
+    "rs {n} for a car in {y} years",
+    "Need ₹{a}.5 cr for retirement in {y} years @ {r}%",
+    "{a}-{b} lakh for marriage in {y}-{z} years",
+    "general savings, no details",
+]
+
+
+def make_corpus(rows, seed=0):
+    rng = random.Random(seed)
+    return [
+        rng.choice(SAMPLES).format(a=rng.randint(1, 90), b=rng.randint(91, 99), n=rng.randint(10_000, 99_999),
+                                   y=rng.randint(1, 30), z=rng.randint(31, 40), r=rng.randint(6, 15))
+        for _ in range(rows)
+    ]
+
+
+def legacy_extract(text):
+    """The original three-search extractor, kept as a baseline."""
+    text = text.lower()
+    amount = years = ret = None
+    m_amt = re.search(r"(\d+)\s*(l|lac|lakh|crore|cr|k|rs|₹)", text)
+    if m_amt:
+        amount = float(m_amt.group(1))
+    m_years = re.search(r"(\d+)\s*(year|years|yr|yrs)", text)
+    if m_years:
+        years = int(m_years.group(1))
+    m_ret = re.search(r"(\d+(\.\d+)?)\s*%", text)
+    if m_ret:
+        ret = float(m_ret.group(1))
+    return amount, years, ret
+
+
+def timed(label, fn, rows):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {rows / elapsed:>14,.0f} rows/s  ({elapsed:.3f}s)")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--rows", type=int, default=200_000)
+    args = ap.parse_args()
+
+    corpus = make_corpus(args.rows)
+    timed("legacy re.search x3", lambda: [legacy_extract(t) for t in corpus], args.rows)
+    timed("parse_goal", lambda: [parse_goal(t) for t in corpus], args.rows)
+    timed("parse_many (streaming)", lambda: sum(1 for _ in parse_many(iter(corpus))), args.rows)
+    try:
+        import pandas as pd
+    except ImportError:
+        return
+    series = pd.Series(corpus)
+    timed("parse_series (.str.extract)", lambda: parse_series(series), args.rows)
+
+
+if __name__ == "__main__":
+    main()
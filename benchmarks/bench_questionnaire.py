@@ -0,0 +1,60 @@
+# benchmarks/bench_questionnaire.py
+"""
+Throughput benchmark for questionnaire validation and risk scoring.
+
+    python -m benchmarks.bench_questionnaire --rows 500000 --invalid 0.02
+"""
+
+import argparse
+import random
+import time
+
+from modules.risk_profile import QUESTIONS, profile_responses, read_responses, validate_frame, validate_response
+
+
+def make_responses(rows, invalid=0.02, seed=0):
+    """Random response dicts; roughly `invalid` of them carry one bad answer."""
+    rng = random.Random(seed)
+    out = []
+    for _ in range(rows):
+        record = {"age": rng.randint(18, 80), "horizon_years": rng.randint(1, 40)}
+        record.update({q.key: rng.randint(1, 5) for q in QUESTIONS if q.kind == "scale"})
+        if rng.random() < invalid:
+            record[rng.choice(QUESTIONS).key] = rng.choice(["", "abc", -3, 9, 2.5])
+        out.append(record)
+    return out
+
+
+def timed(label, fn, rows):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {rows / elapsed:>14,.0f} rows/s  ({elapsed:.3f}s)")
+
+
+def _per_record(records):
+    for r in records:
+        try:
+            validate_response(r)
+        except ValueError:
+            pass
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--rows", type=int, default=500_000)
+    ap.add_argument("--invalid", type=float, default=0.02, help="fraction of rows with a bad answer")
+    ap.add_argument("--batch-size", type=int, default=50_000)
+    args = ap.parse_args()
+
+    records = make_responses(args.rows, args.invalid)
+    frames = list(read_responses(records, args.batch_size))
+    sample = min(args.rows, 5_000)
+    timed("validate_response (1 row)", lambda: _per_record(records[:sample]), sample)
+    timed("validate_frame (batched)", lambda: [validate_frame(f) for f in frames], args.rows)
+    timed("profile_responses (stream)", lambda: sum(len(s) for s, _ in profile_responses(iter(records), args.batch_size)),
+          args.rows)
+
+
+if __name__ == "__main__":
+    main()
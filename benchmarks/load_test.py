@@ -0,0 +1,92 @@
+# benchmarks/load_test.py
+"""
+Load test for the plan API (modules/api.py) on localhost.
+
+    python -m modules.api --port 8080 &
+    python -m benchmarks.load_test --requests 5000 --concurrency 32
+    python -m benchmarks.load_test --endpoint /plans --batch 1000 --requests 50
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+
+
+def make_goal(rng):
+    return {
+        "target_amount": rng.randint(1, 200) * 1_00_000,
+        "years": rng.randint(1, 30),
+        "expected_return": rng.choice([8, 10, 12, 14]),
+        "inflation": 5.0,
+        "goal_type": rng.choice(["General", "House", "Education", "Retirement"]),
+        "risk_profile": rng.choice(["Conservative", "Moderate", "Aggressive"]),
+    }
+
+
+async def worker(host, port, endpoint, bodies, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while bodies:
+            body = bodies.pop()
+            start = time.perf_counter()
+            writer.write(
+                f"POST {endpoint} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+            status = int((await reader.readline()).split()[1])
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":")[1])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def run(args):
+    rng = random.Random(args.seed)
+    if args.endpoint == "/plans":
+        bodies = [json.dumps({"goals": [make_goal(rng) for _ in range(args.batch)]}).encode()
+                  for _ in range(args.requests)]
+    else:
+        bodies = [json.dumps(make_goal(rng)).encode() for _ in range(args.requests)]
+
+    latencies, errors = [], []
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(args.host, args.port, args.endpoint, bodies, latencies, errors)
+                           for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    pct = lambda p: latencies[min(int(p / 100 * len(latencies)), len(latencies) - 1)] * 1000
+    goals = args.requests * (args.batch if args.endpoint == "/plans" else 1)
+    print(f"{args.requests:,} requests ({goals:,} goals) in {elapsed:.2f}s, {len(errors)} errors")
+    print(f"throughput: {args.requests / elapsed:,.0f} req/s, {goals / elapsed:,.0f} goals/s")
+    print(f"latency ms: mean {statistics.mean(latencies) * 1000:.2f}  p50 {pct(50):.2f}  "
+          f"p95 {pct(95):.2f}  p99 {pct(99):.2f}  max {latencies[-1] * 1000:.2f}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Load test the local plan API.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8080)
+    ap.add_argument("--endpoint", default="/plan", choices=["/plan", "/plans"])
+    ap.add_argument("--requests", type=int, default=2000)
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--batch", type=int, default=500, help="goals per /plans request")
+    ap.add_argument("--seed", type=int, default=0)
+    asyncio.run(run(ap.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+# benchmarks/run.py
+"""
+Benchmark suite for the financial math and parsing hot paths.
+
+    python -m benchmarks.run                                  # print results
+    python -m benchmarks.run --save benchmarks/baseline.json  # record a baseline
+    python -m benchmarks.run --compare benchmarks/baseline.json --threshold 0.2
+
+Each case runs at every batch size (items per call). ops/sec counts items,
+so scalar and vectorized cases are directly comparable. Peak memory is
+measured with tracemalloc on a separate run. --compare exits with status 1
+if any case is slower than the baseline by more than --threshold.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from benchmarks.bench_parser import make_corpus
+from modules.cashflows import required_return, required_sip
+from modules.goals import Goal, corpus_schedule, sip_required, sip_required_batch
+from modules.parser import parse_series
+from modules.planning import (
+    calculate_sip, extract_goal_details, get_detailed_investment_split, get_investment_suggestions, risk_heat_label,
+    sip_growth_schedule,
+)
+from modules.risk_profile import calculate_risk_profile, calculate_risk_profile_batch
+from modules.rules import apply_rules
+
+DEFAULT_SIZES = [1, 100, 10_000, 1_000_000]
+# Pure-Python loops are capped so a full run stays in the minutes range
+SCALAR_MAX_SIZE = 100_000
+
+
+def make_inputs(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return {
+        "target": rng.uniform(1e5, 1e8, n),
+        "years": rng.integers(1, 41, n),
+        "ret": rng.choice([0.0, 8.0, 10.5, 12.0, 15.0], n),
+        "answers": rng.integers(1, 6, (n, 6)).astype(float),
+        "profiles": rng.choice(["Conservative", "Moderate", "Aggressive"], n),
+        "texts": make_corpus(n, seed),
+    }
+
+
+def _scalar_sip(d):
+    for t, y, r in zip(d["target"].tolist(), d["years"].tolist(), d["ret"].tolist()):
+        calculate_sip(t, y, r)
+
+
+def _scalar_sip_required(d):
+    for t, y, r in zip(d["target"].tolist(), d["years"].tolist(), d["ret"].tolist()):
+        sip_required(Goal("bench", t, y, r))
+
+
+def _schedule(d):
+    # Start cold so the LRU cache does not hide the work
+    corpus_schedule.cache_clear()
+    for t, y, r in zip(d["target"].tolist(), d["years"].tolist(), d["ret"].tolist()):
+        sip_growth_schedule(t / 1000, y, r)
+
+
+def _extract(d):
+    for text in d["texts"]:
+        extract_goal_details(text)
+
+
+def _rules(d):
+    for p, y in zip(d["profiles"].tolist(), d["years"].tolist()):
+        get_investment_suggestions(p, "General", y)
+        get_detailed_investment_split(p, y)
+        risk_heat_label(p, y)
+
+
+def _risk(d):
+    for row in d["answers"].tolist():
+        calculate_risk_profile(row)
+
+
+CASES = {
+    # name: (function taking the input dict, vectorized?)
+    "calculate_sip": (_scalar_sip, False),
+    "sip_required": (_scalar_sip_required, False),
+    "sip_growth_schedule": (_schedule, False),
+    "extract_goal_details": (_extract, False),
+    "calculate_risk_profile": (_risk, False),
+    "planning_rules": (_rules, False),
+    "sip_required_batch": (lambda d: sip_required_batch(d["target"], d["years"], d["ret"]), True),
+    "calculate_risk_profile_batch": (lambda d: calculate_risk_profile_batch(d["answers"]), True),
+    "parse_series": (lambda d: parse_series(d["series"]), True),
+    "required_sip_step_up": (lambda d: required_sip(d["target"], d["years"], d["ret"], 10.0, 1e5), True),
+    "apply_rules": (lambda d: apply_rules(d["goals"]), True),
+    "required_return": (lambda d: required_return(d["target"], d["years"], d["target"] / 1000, 10.0), True),
+}
+
+
+def measure(fn, data, n, min_time=0.2, repeat=3):
+    """Best-of-`repeat` items/sec, each sample looping for at least min_time."""
+    fn(data)  # warm-up
+    best = 0.0
+    for _ in range(repeat):
+        loops, start = 0, time.perf_counter()
+        while True:
+            fn(data)
+            loops += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        best = max(best, loops * n / elapsed)
+
+    tracemalloc.start()
+    fn(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def run(sizes, cases, min_time):
+    results = {}
+    for n in sizes:
+        data = make_inputs(n)
+        if "parse_series" in cases:
+            import pandas as pd
+            data["series"] = pd.Series(data["texts"])
+        if "apply_rules" in cases:
+            import pandas as pd
+            data["goals"] = pd.DataFrame({"risk_profile": data["profiles"], "years": data["years"]})
+        for name in cases:
+            fn, vectorized = CASES[name]
+            if not vectorized and n > SCALAR_MAX_SIZE:
+                continue
+            ops, peak = measure(fn, data, n, min_time)
+            key = f"{name}[{n}]"
+            results[key] = {"ops_per_sec": ops, "peak_bytes": peak}
+            print(f"{key:<40} {ops:>16,.0f} ops/s {peak / 1024:>12,.1f} KiB peak", flush=True)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Return the list of cases that regressed beyond threshold."""
+    regressions = []
+    for key, now in results.items():
+        before = baseline.get("results", {}).get(key)
+        if not before:
+            continue
+        change = now["ops_per_sec"] / before["ops_per_sec"] - 1
+        flag = "REGRESSION" if change < -threshold else ""
+        print(f"{key:<40} {change * 100:>+8.1f}% ops/s {flag}")
+        if flag:
+            regressions.append(key)
+    return regressions
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark the planning hot paths.")
+    ap.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                    help="comma-separated batch sizes (default 1,100,10000,1000000)")
+    ap.add_argument("--cases", default=",".join(CASES), help="comma-separated case names")
+    ap.add_argument("--min-time", type=float, default=0.2, help="seconds per timing sample")
+    ap.add_argument("--save", help="write results to this JSON baseline file")
+    ap.add_argument("--compare", help="compare against this JSON baseline file")
+    ap.add_argument("--threshold", type=float, default=0.2,
+                    help="allowed fractional slowdown before flagging (default 0.2)")
+    args = ap.parse_args(argv)
+
+    cases = [c for c in args.cases.split(",") if c]
+    unknown = set(cases) - set(CASES)
+    if unknown:
+        ap.error(f"unknown cases: {', '.join(sorted(unknown))}")
+    results = run([int(s) for s in args.sizes.split(",")], cases, args.min_time)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({
+                "python": sys.version.split()[0],
+                "numpy": np.__version__,
+                "machine": platform.machine(),
+                "results": results,
+            }, f, indent=2)
+        print(f"Saved baseline to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,2 @@
+# conftest.py
+# Lets `pytest` import the `modules` package from the repo root.
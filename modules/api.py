@@ -0,0 +1,259 @@
+# modules/api.py
+"""
+Local JSON HTTP API for plan computation (stdlib asyncio, no framework).
+
+    python -m modules.api --port 8080 --workers 4
+
+    GET  /health
+    POST /plan    {"target_amount": 5000000, "years": 15, "expected_return": 12,
+                   "inflation": 5, "goal_type": "House", "risk_profile": "Moderate"}
+    POST /plans   {"goals": [{...}, {...}]}
+
+target_amount is in today's money; the response carries the inflation-adjusted
+target, SIP, describe_goal_plan text and allocation, as in the Planner chat.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import types
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import MISSING, fields
+from http import HTTPStatus
+
+from modules.goals import Goal
+from modules.planning import GOAL_TYPES, build_goal_plan, get_allocation_for_profile
+
+MAX_BODY_BYTES = 10 * 1024 * 1024
+MAX_BATCH = 10_000
+# Batches at least this large are computed in the process pool
+POOL_THRESHOLD = 256
+# Accepted range (%) for expected_return and inflation; wider values overflow or divide by zero
+RATE_RANGE = (-50.0, 100.0)
+
+_GOAL_FIELDS = {f.name: f for f in fields(Goal)}
+
+
+class ValidationError(ValueError):
+    def __init__(self, message, details=None):
+        super().__init__(message)
+        self.details = details
+
+
+def _coerce(name, value, expected):
+    """Check one value against a Goal field annotation."""
+    allowed = expected.__args__ if isinstance(expected, types.UnionType) else (expected,)
+    if value is None:
+        if type(None) in allowed:
+            return None
+        raise ValidationError(f"'{name}' is required")
+    if int in allowed:
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        if isinstance(value, bool) or not isinstance(value, int):
+            raise ValidationError(f"'{name}' must be an integer")
+        return value
+    if float in allowed:
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValidationError(f"'{name}' must be a number")
+        if not math.isfinite(value):
+            raise ValidationError(f"'{name}' must be a finite number")
+        return float(value)
+    if str in allowed:
+        if not isinstance(value, str):
+            raise ValidationError(f"'{name}' must be a string")
+        return value
+    return value
+
+
+def validate_goal(payload) -> tuple:
+    """
+    Validate a request body against the Goal dataclass fields.
+    Returns (Goal, inflation, goal_type); expected_return and name default
+    from the goal type like the Planner chat does.
+    """
+    if not isinstance(payload, dict):
+        raise ValidationError("goal must be a JSON object")
+    unknown = set(payload) - set(_GOAL_FIELDS) - {"inflation", "goal_type"}
+    if unknown:
+        raise ValidationError(f"unknown fields: {', '.join(sorted(unknown))}")
+
+    goal_type = payload.get("goal_type", "General")
+    if goal_type not in GOAL_TYPES:
+        raise ValidationError(f"'goal_type' must be one of: {', '.join(GOAL_TYPES)}")
+    data = dict(payload)
+    data.setdefault("name", f"{goal_type} Goal")
+    data.setdefault("expected_return", GOAL_TYPES[goal_type]["default_return"])
+
+    values = {}
+    for name, f in _GOAL_FIELDS.items():
+        if name not in data and f.default is MISSING:
+            raise ValidationError(f"'{name}' is required")
+        values[name] = _coerce(name, data.get(name, f.default), f.type)
+    if values["target_amount"] <= 0:
+        raise ValidationError("'target_amount' must be positive")
+    if not 1 <= values["years"] <= 100:
+        raise ValidationError("'years' must be between 1 and 100")
+    inflation = _coerce("inflation", payload.get("inflation", 5.0), float)
+    low, high = RATE_RANGE
+    for name, value in (("expected_return", values["expected_return"]), ("inflation", inflation)):
+        if not low <= value <= high:
+            raise ValidationError(f"'{name}' must be between {low:g} and {high:g} (%)")
+    return Goal(**values), inflation, goal_type
+
+
+def compute_plan(goal: Goal, inflation: float, goal_type: str) -> dict:
+    plan, plan_text = build_goal_plan(goal.target_amount, goal.years, goal.expected_return,
+                                      inflation, goal_type, goal.risk_profile)
+    plan["name"] = goal.name
+    plan["plan_text"] = plan_text
+    plan["allocation"] = get_allocation_for_profile(plan["risk_profile"])
+    return plan
+
+
+def compute_plans(validated) -> list:
+    return [compute_plan(*v) for v in validated]
+
+
+def _content_length(value) -> int | None:
+    """Parsed Content-Length header (0 if absent), or None if malformed or negative."""
+    if value is None or value == "":
+        return 0
+    if not value.isdigit():
+        return None
+    return int(value)
+
+
+class PlanServer:
+    def __init__(self, workers: int = 0):
+        self.pool = ProcessPoolExecutor(max_workers=workers) if workers > 0 else None
+        self.workers = workers
+
+    async def plan(self, body):
+        return compute_plan(*validate_goal(body))
+
+    async def plans(self, body):
+        if not isinstance(body, dict) or not isinstance(body.get("goals"), list):
+            raise ValidationError("body must be {\"goals\": [...]}")
+        goals = body["goals"]
+        if len(goals) > MAX_BATCH:
+            raise ValidationError(f"at most {MAX_BATCH} goals per batch")
+
+        validated, errors = [], []
+        for i, g in enumerate(goals):
+            try:
+                validated.append(validate_goal(g))
+            except ValidationError as e:
+                errors.append({"index": i, "error": str(e)})
+        if errors:
+            raise ValidationError(f"{len(errors)} invalid goal(s)", errors)
+
+        if self.pool is None or len(validated) < POOL_THRESHOLD:
+            return {"plans": compute_plans(validated)}
+        loop = asyncio.get_running_loop()
+        size = -(-len(validated) // self.workers)
+        parts = [validated[i:i + size] for i in range(0, len(validated), size)]
+        results = await asyncio.gather(*(loop.run_in_executor(self.pool, compute_plans, p) for p in parts))
+        return {"plans": [plan for part in results for plan in part]}
+
+    async def route(self, method, path, body):
+        if path == "/health":
+            return HTTPStatus.OK, {"status": "ok"}
+        handler = {"/plan": self.plan, "/plans": self.plans}.get(path)
+        if handler is None:
+            return HTTPStatus.NOT_FOUND, {"error": "not found"}
+        if method != "POST":
+            return HTTPStatus.METHOD_NOT_ALLOWED, {"error": "use POST"}
+        try:
+            payload = json.loads(body or b"null")
+        except ValueError:
+            return HTTPStatus.BAD_REQUEST, {"error": "invalid JSON"}
+        try:
+            return HTTPStatus.OK, await handler(payload)
+        except ValidationError as e:
+            error = {"error": str(e)}
+            if e.details:
+                error["details"] = e.details
+            return HTTPStatus.UNPROCESSABLE_ENTITY, error
+
+    async def handle(self, reader, writer):
+        """Serve HTTP/1.1 requests on one connection, with keep-alive."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+
+                length = _content_length(headers.get("content-length"))
+                if length is None:
+                    # The body can't be skipped reliably, so the connection is closed after replying
+                    status, result = HTTPStatus.BAD_REQUEST, {"error": "invalid Content-Length"}
+                    keep_alive = False
+                elif length > MAX_BODY_BYTES:
+                    status, result = HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "body too large"}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    keep_alive = headers.get("connection", "").lower() != "close"
+                    try:
+                        status, result = await self.route(method, path.split("?", 1)[0], body)
+                    except Exception as e:  # e.g. ArithmeticError from extreme inputs; still answer the client
+                        status, result = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"internal error: {type(e).__name__}"}
+
+                data = json.dumps(result).encode()
+                writer.write(
+                    f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8080):
+        server = await asyncio.start_server(self.handle, host, port)
+        print(f"Plan API listening on http://{host}:{port}")
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Local JSON API for goal plans.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8080)
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                    help="process pool size for batch requests; 0 = compute inline")
+    args = ap.parse_args(argv)
+
+    server = PlanServer(args.workers)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
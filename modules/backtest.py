@@ -0,0 +1,175 @@
+# modules/backtest.py
+"""
+Rolling-window SIP backtester over historical monthly bucket returns.
+
+The returns file is a CSV with a `date` column and one column per bucket
+("Core Equity", "Mid Cap", "Hybrid", "Debt", "Cash", ...) holding monthly
+returns as decimals (0.012 = 1.2%). On first load it is converted to a .npy
+cache and later loads memory-map that cache. Caches live in ROBO_CACHE_DIR
+(default: a directory under the system temp dir), so the data directory
+can be read-only.
+
+    python -m modules.backtest returns.csv --profile Moderate --years 10 --sip 10000 --target 2500000
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+from modules.planning import get_detailed_investment_split
+
+
+@dataclass
+class ReturnSeries:
+    dates: list
+    buckets: list
+    returns: np.ndarray       # (months, buckets), read-only memmap
+
+
+@dataclass
+class BacktestResult:
+    start_dates: list
+    final_value: np.ndarray   # per start date
+    invested: float
+    cagr: np.ndarray          # time-weighted, annualized
+    max_drawdown: np.ndarray  # as a positive fraction
+    hit_rate: float | None    # share of windows that reached the target
+
+    def summary(self) -> dict:
+        return {
+            "windows": len(self.start_dates),
+            "invested": self.invested,
+            "median_final_value": float(np.median(self.final_value)),
+            "median_cagr": float(np.median(self.cagr)),
+            "worst_cagr": float(self.cagr.min()),
+            "median_max_drawdown": float(np.median(self.max_drawdown)),
+            "worst_max_drawdown": float(self.max_drawdown.max()),
+            "hit_rate": self.hit_rate,
+        }
+
+
+def default_cache_dir() -> Path:
+    return Path(os.environ.get("ROBO_CACHE_DIR", os.path.join(tempfile.gettempdir(), "roboadvisor-cache")))
+
+
+def _cache_paths(path: Path, cache_dir: Path):
+    # Keyed by the full source path so same-named files in different folders don't clash
+    key = f"{path.stem}-{hashlib.sha1(str(path).encode()).hexdigest()[:12]}"
+    return cache_dir / f"{key}.returns.npy", cache_dir / f"{key}.returns.json"
+
+
+@lru_cache(maxsize=8)
+def _load_cached(path: str, mtime: float, cache_dir: str) -> ReturnSeries:
+    csv_path = Path(path)
+    npy_path, meta_path = _cache_paths(csv_path, Path(cache_dir))
+    fresh = npy_path.exists() and meta_path.exists() and npy_path.stat().st_mtime >= mtime
+
+    if not fresh:
+        import pandas as pd
+        df = pd.read_csv(csv_path)
+        if "date" not in df.columns:
+            raise ValueError(f"{csv_path} needs a 'date' column")
+        buckets = [c for c in df.columns if c != "date"]
+        npy_path.parent.mkdir(parents=True, exist_ok=True)
+        np.save(npy_path, df[buckets].to_numpy(dtype=np.float64))
+        meta_path.write_text(json.dumps({"dates": df["date"].astype(str).tolist(), "buckets": buckets}))
+
+    meta = json.loads(meta_path.read_text())
+    returns = np.load(npy_path, mmap_mode="r")
+    return ReturnSeries(meta["dates"], meta["buckets"], returns)
+
+
+def load_returns(path, cache_dir=None) -> ReturnSeries:
+    """Load a returns CSV through its memory-mapped .npy cache (in cache_dir, default default_cache_dir())."""
+    path = Path(path).resolve()
+    cache_dir = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+    return _load_cached(str(path), os.path.getmtime(path), str(cache_dir.resolve()))
+
+
+def weights_for_split(split, buckets) -> np.ndarray:
+    """Weight vector aligned to `buckets` from a get_detailed_investment_split list."""
+    weights = np.zeros(len(buckets))
+    for row in split:
+        if row["Bucket"] not in buckets:
+            raise ValueError(f"No return series for bucket '{row['Bucket']}'")
+        weights[buckets.index(row["Bucket"])] += row["Percent"] / 100
+    return weights
+
+
+def backtest(series: ReturnSeries, weights, monthly_sip: float, months: int,
+             rebalance_every: int = 12, target: float | None = None) -> BacktestResult:
+    """
+    Simulate an end-of-month SIP into `weights` for every `months`-long window
+    of the series at once, rebalancing to target weights every
+    `rebalance_every` months (0 = never).
+    """
+    returns = series.returns
+    weights = np.asarray(weights, dtype=float)
+    n_windows = returns.shape[0] - months + 1
+    if n_windows <= 0:
+        raise ValueError(f"Series has {returns.shape[0]} months, need at least {months}")
+
+    holdings = np.zeros((n_windows, returns.shape[1]))
+    nav = np.ones(n_windows)
+    peak = np.ones(n_windows)
+    max_dd = np.zeros(n_windows)
+
+    for m in range(months):
+        r = returns[m:m + n_windows]                 # month m of every window
+        before = holdings.sum(axis=1)
+        holdings *= 1 + r
+        after = holdings.sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            period = np.where(before > 0, after / before, 1 + r @ weights)
+        nav *= period
+        np.maximum(peak, nav, out=peak)
+        np.maximum(max_dd, 1 - nav / peak, out=max_dd)
+
+        holdings += monthly_sip * weights
+        if rebalance_every and (m + 1) % rebalance_every == 0:
+            holdings = holdings.sum(axis=1, keepdims=True) * weights
+
+    final_value = holdings.sum(axis=1)
+    return BacktestResult(
+        start_dates=series.dates[:n_windows],
+        final_value=final_value,
+        invested=monthly_sip * months,
+        cagr=nav ** (12 / months) - 1,
+        max_drawdown=max_dd,
+        hit_rate=None if target is None else float(np.mean(final_value >= target)),
+    )
+
+
+def backtest_profile(path, risk_profile: str, years: int, monthly_sip: float,
+                     target: float | None = None, rebalance_every: int = 12, cache_dir=None) -> BacktestResult:
+    """Backtest the get_detailed_investment_split allocation for a profile and horizon."""
+    series = load_returns(path, cache_dir)
+    weights = weights_for_split(get_detailed_investment_split(risk_profile, years), series.buckets)
+    return backtest(series, weights, monthly_sip, years * 12, rebalance_every, target)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Backtest a profile's allocation over rolling windows.")
+    ap.add_argument("returns", help="CSV of monthly bucket returns")
+    ap.add_argument("--profile", default="Moderate")
+    ap.add_argument("--years", type=int, default=10)
+    ap.add_argument("--sip", type=float, default=10_000)
+    ap.add_argument("--target", type=float)
+    ap.add_argument("--rebalance", type=int, default=12, help="months between rebalances; 0 = never")
+    ap.add_argument("--cache-dir", help="where the .npy cache is kept (default: $ROBO_CACHE_DIR or the temp dir)")
+    args = ap.parse_args(argv)
+
+    result = backtest_profile(args.returns, args.profile, args.years, args.sip, args.target, args.rebalance,
+                              args.cache_dir)
+    print(json.dumps(result.summary(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
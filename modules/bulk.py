@@ -0,0 +1,165 @@
+# modules/bulk.py
+"""
+Bulk plan generation from a CSV or Parquet file of client goals.
+
+    python -m modules.bulk goals.csv plans.csv --chunksize 100000 --workers 0
+
+Input columns: amount, years, inflation, age, income_stability,
+horizon_years, crash_reaction, experience, dip_behavior and optionally
+return (%) and goal_type. Rows are processed chunk by chunk and written out
+incrementally, so memory stays flat regardless of input size.
+"""
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from modules.glide_path import glide_sip_required_batch
+from modules.goals import sip_required_batch
+from modules.planning import GOAL_TYPES, get_allocation_for_profile
+from modules.risk_scoring import default_scorer
+
+RISK_COLUMNS = ["age", "income_stability", "horizon_years", "crash_reaction", "experience", "dip_behavior"]
+REQUIRED_COLUMNS = ["amount", "years", "inflation"] + RISK_COLUMNS
+
+
+def plan_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Inflation-adjusted target, SIP, risk profile, glide-path SIP and allocation for every row."""
+    missing = [c for c in REQUIRED_COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"Missing input columns: {', '.join(missing)}")
+
+    amount = df["amount"].to_numpy(dtype=float)
+    years = df["years"].to_numpy(dtype=float)
+    inflation = df["inflation"].to_numpy(dtype=float)
+
+    goal_type = df["goal_type"] if "goal_type" in df.columns else pd.Series("General", index=df.index)
+    default_return = goal_type.map({k: v["default_return"] for k, v in GOAL_TYPES.items()})
+    default_return = default_return.fillna(GOAL_TYPES["General"]["default_return"])
+    if "return" in df.columns:
+        annual_return = df["return"].fillna(default_return).to_numpy(dtype=float)
+    else:
+        annual_return = default_return.to_numpy(dtype=float)
+
+    # Same scoring as the Planner's "Update risk profile" button
+    scorer = default_scorer()
+    risk_score = scorer.score(df)
+    profile = scorer.label(risk_score)
+
+    inflated_target = amount * np.power(1 + inflation / 100.0, years)
+    out = df.copy()
+    out["return"] = annual_return
+    out["inflated_target"] = inflated_target
+    out["sip"] = sip_required_batch(inflated_target, years, annual_return)
+    out["risk_score"] = risk_score
+    out["risk_profile"] = profile
+    # Rows with a missing answer have no profile, so no glide path or allocation either
+    labelled = pd.notna(profile)
+    glide_sip = np.full(len(out), np.nan)
+    glide_sip[labelled] = glide_sip_required_batch(inflated_target[labelled], years[labelled], profile[labelled])
+    out["glide_sip"] = glide_sip
+
+    allocations = {p: get_allocation_for_profile(p) for p in pd.unique(profile[labelled])}
+    for bucket in get_allocation_for_profile("Moderate"):
+        lookup = {p: alloc[bucket] for p, alloc in allocations.items()}
+        out[bucket] = pd.Series(profile, index=out.index).map(lookup)
+    return out
+
+
+def read_chunks(path, chunksize):
+    """
+    Yield DataFrame chunks from a CSV or Parquet file. Chunks are indexed by
+    row position in the file, as pandas does for CSV chunks.
+    """
+    path = Path(path)
+    if path.suffix.lower() in (".parquet", ".pq"):
+        import pyarrow.parquet as pq
+        start = 0
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            # to_pandas() numbers every record batch from 0
+            df = batch.to_pandas()
+            df.index = pd.RangeIndex(start, start + len(df))
+            start += len(df)
+            yield df
+    else:
+        yield from pd.read_csv(path, chunksize=chunksize)
+
+
+class ChunkWriter:
+    """Append result chunks to a CSV or Parquet file as they arrive."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.parquet = self.path.suffix.lower() in (".parquet", ".pq")
+        self._writer = None
+        self._first = True
+
+    def write(self, df: pd.DataFrame):
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table)
+        else:
+            df.to_csv(self.path, mode="w" if self._first else "a", header=self._first, index=False)
+        self._first = False
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def _ordered_results(chunks, workers):
+    """
+    Plan chunks in order. With workers > 1 a process pool is used, keeping at
+    most 2 * workers chunks in flight so memory stays bounded.
+    """
+    if workers <= 1:
+        for chunk in chunks:
+            yield plan_frame(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = []
+        for chunk in chunks:
+            pending.append(pool.submit(plan_frame, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
+
+
+def run(input_path, output_path, chunksize=100_000, workers=1) -> int:
+    """Stream input_path through plan_frame into output_path; returns rows written."""
+    writer = ChunkWriter(output_path)
+    rows = 0
+    try:
+        for result in _ordered_results(read_chunks(input_path, chunksize), workers):
+            writer.write(result)
+            rows += len(result)
+    finally:
+        writer.close()
+    return rows
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Generate goal plans in bulk from CSV/Parquet.")
+    ap.add_argument("input", help="input .csv or .parquet file")
+    ap.add_argument("output", help="output .csv or .parquet file")
+    ap.add_argument("--chunksize", type=int, default=100_000, help="rows per chunk (default 100000)")
+    ap.add_argument("--workers", type=int, default=1, help="worker processes; 0 = all cores (default 1)")
+    args = ap.parse_args(argv)
+
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    rows = run(args.input, args.output, args.chunksize, workers)
+    print(f"Wrote {rows:,} plans to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+# modules/cashflows.py
+"""
+Cash-flow engine for goal plans beyond a flat SIP: an annual step-up on the
+monthly SIP, an initial lump sum, and one-off contributions (+) or
+withdrawals (-) in given months.
+
+Conventions follow sip_required: monthly compounding at annual_return / 12,
+SIP paid at the end of each month, step-ups applied every 12 months. Month
+0 is "today" (same as a lump sum), month years*12 is the deadline.
+
+The corpus is linear in the base SIP, so the required SIP has a closed form
+(the step-up is a geometric series). Solving for the return has none and
+uses a vectorized bisection. Every function broadcasts over goals.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from modules.goals import sip_required_batch
+
+
+class CashFlows(NamedTuple):
+    """One-off flows for a batch: goal index, month and amount per flow."""
+    goal: np.ndarray
+    month: np.ndarray
+    amount: np.ndarray
+
+    @classmethod
+    def of(cls, flows, goal: int = 0) -> "CashFlows":
+        """From (month, amount) pairs for a single goal."""
+        pairs = np.asarray(list(flows), dtype=float).reshape(-1, 2)
+        return cls(np.full(len(pairs), goal, dtype=np.int64), pairs[:, 0].astype(np.int64), pairs[:, 1])
+
+    @classmethod
+    def from_frame(cls, df, goal="goal", month="month", amount="amount") -> "CashFlows":
+        return cls(df[goal].to_numpy(dtype=np.int64), df[month].to_numpy(dtype=np.int64),
+                   df[amount].to_numpy(dtype=float))
+
+
+def _as_flows(flows) -> CashFlows | None:
+    if flows is None or isinstance(flows, CashFlows):
+        return flows
+    return CashFlows.of(flows)
+
+
+def sip_factor(years, annual_return, step_up=0.0) -> np.ndarray:
+    """
+    Corpus at the deadline per ₹1 of base monthly SIP. With step_up == 0
+    this is the annuity factor sip_required uses.
+    """
+    r = np.asarray(annual_return, dtype=float) / 100 / 12
+    n = np.round(np.asarray(years, dtype=float) * 12)
+    g = np.asarray(step_up, dtype=float) / 100
+
+    full_years, rest = np.divmod(n, 12)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        flat = np.where(r == 0, n, (np.power(1 + r, n) - 1) / r)
+        year_block = np.where(r == 0, 12.0, (np.power(1 + r, 12) - 1) / r)      # FV of one year of SIP
+        rest_block = np.where(r == 0, rest, (np.power(1 + r, rest) - 1) / r)    # FV of the final partial year
+        q, a = np.power(1 + r, 12), 1 + g
+        # sum_{k<full_years} a^k q^(full_years-1-k), a geometric series
+        same = np.isclose(q, a, rtol=1e-12, atol=0)
+        series = np.where(same, full_years * np.power(q, full_years - 1),
+                          (np.power(q, full_years) - np.power(a, full_years)) / (q - a))
+    stepped = year_block * series * np.power(1 + r, rest) + np.power(a, full_years) * rest_block
+    return np.where(g == 0, flat, stepped)
+
+
+def _flows_value(flows: CashFlows | None, shape, n, r) -> np.ndarray:
+    """Value at each goal's deadline of its one-off flows."""
+    if flows is None or len(flows.amount) == 0:
+        return np.zeros(shape)
+    n_flat = np.broadcast_to(n, shape).ravel()
+    r_flat = np.broadcast_to(r, shape).ravel()
+    goal = flows.goal
+    if np.any((goal < 0) | (goal >= n_flat.size)):
+        raise ValueError("Cash flow refers to a goal outside the batch")
+    if np.any((flows.month < 0) | (flows.month > n_flat[goal])):
+        raise ValueError("Cash flow month must be between 0 and the goal's deadline")
+    grown = flows.amount * np.power(1 + r_flat[goal], n_flat[goal] - flows.month)
+    return np.bincount(goal, weights=grown, minlength=n_flat.size).reshape(shape)
+
+
+def future_value(base_sip, years, annual_return, step_up=0.0, lump_sum=0.0, flows=None) -> np.ndarray:
+    """Corpus at the deadline for a contribution plan."""
+    r = np.asarray(annual_return, dtype=float) / 100 / 12
+    n = np.round(np.asarray(years, dtype=float) * 12)
+    base = np.asarray(base_sip, dtype=float)
+    lump = np.asarray(lump_sum, dtype=float)
+    shape = np.broadcast_shapes(base.shape, r.shape, n.shape, np.shape(step_up), lump.shape)
+    return (base * sip_factor(years, annual_return, step_up) + lump * np.power(1 + r, n)
+            + _flows_value(_as_flows(flows), shape, n, r))
+
+
+def required_sip(target_amount, years, annual_return, step_up=0.0, lump_sum=0.0, flows=None) -> np.ndarray:
+    """
+    Base monthly SIP (first year's amount) that reaches the target given the
+    step-up, lump sum and one-off flows. 0 when those alone are enough.
+    A plain flat SIP goes through sip_required_batch, so it equals
+    sip_required within float rounding (a few ulp).
+    """
+    target = np.asarray(target_amount, dtype=float)
+    flows = _as_flows(flows)
+    if np.all(np.asarray(step_up) == 0) and np.all(np.asarray(lump_sum) == 0) and flows is None:
+        return sip_required_batch(target, years, annual_return)
+
+    r = np.asarray(annual_return, dtype=float) / 100 / 12
+    n = np.round(np.asarray(years, dtype=float) * 12)
+    lump = np.asarray(lump_sum, dtype=float)
+    shape = np.broadcast_shapes(target.shape, r.shape, n.shape, np.shape(step_up), lump.shape)
+    remaining = target - lump * np.power(1 + r, n) - _flows_value(flows, shape, n, r)
+    return np.maximum(remaining / sip_factor(years, annual_return, step_up), 0.0)
+
+
+def required_return(target_amount, years, base_sip, step_up=0.0, lump_sum=0.0, flows=None,
+                    low: float = 0.0, high: float = 50.0, tol: float = 1e-6) -> np.ndarray:
+    """
+    Annual return (%) at which the plan just reaches the target, found by
+    bisection on all goals at once. NaN where even `high` falls short;
+    `low` where the plan already reaches the target at `low`.
+    """
+    target = np.asarray(target_amount, dtype=float)
+    flows = _as_flows(flows)
+    shape = np.broadcast_shapes(target.shape, np.shape(years), np.shape(base_sip), np.shape(step_up),
+                                np.shape(lump_sum))
+
+    def gap(ret):
+        return future_value(base_sip, years, ret, step_up, lump_sum, flows) - target
+
+    lo, hi = np.full(shape, low), np.full(shape, high)
+    reachable = gap(hi) >= 0
+    done_at_low = gap(lo) >= 0
+    for _ in range(int(np.ceil(np.log2((high - low) / tol)))):
+        mid = (lo + hi) / 2
+        above = gap(mid) >= 0
+        hi = np.where(above, mid, hi)
+        lo = np.where(above, lo, mid)
+    out = np.where(done_at_low, low, hi)
+    return np.where(reachable, out, np.nan)
+
+
+def contribution_schedule(base_sip, years, step_up=0.0, lump_sum=0.0, flows=None) -> np.ndarray:
+    """Money paid in at the end of each month 0..years*12 for one goal (month 0 holds the lump sum)."""
+    n = int(round(years * 12))
+    months = np.arange(n + 1)
+    paid = np.where(months > 0, base_sip * np.power(1 + step_up / 100, (months - 1) // 12), 0.0)
+    paid[0] += lump_sum
+    flows = _as_flows(flows)
+    if flows is not None:
+        if np.any((flows.month < 0) | (flows.month > n)):
+            raise ValueError("Cash flow month must be between 0 and the goal's deadline")
+        np.add.at(paid, flows.month, flows.amount)
+    return paid
+
+
+def corpus_path(base_sip, years, annual_return, step_up=0.0, lump_sum=0.0, flows=None) -> np.ndarray:
+    """Corpus at the end of each month 0..years*12 for one goal."""
+    paid = contribution_schedule(base_sip, years, step_up, lump_sum, flows)
+    growth = np.power(1 + annual_return / 100 / 12, np.arange(len(paid)))
+    # corpus_t = sum_{m<=t} paid_m * (1+r)^(t-m)
+    return growth * np.cumsum(paid / growth)
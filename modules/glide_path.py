@@ -0,0 +1,111 @@
+# modules/glide_path.py
+"""
+Glide paths: the allocation starts at the profile's mix and moves linearly
+towards a defensive landing mix over the last DERISK_YEARS before the
+deadline. Templates are (months, asset classes) arrays cached per
+(profile, months), so batches only compute each distinct pair once.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from modules.planning import get_allocation_for_profile
+
+ASSET_CLASSES = ("Equity Funds", "Hybrid / Balanced", "Debt / Liquid")
+# Assumed long-run annual return (%) per asset class
+ASSET_RETURNS = np.array([12.0, 9.0, 7.0])
+# Mix held in the final month before the deadline
+LANDING_ALLOCATION = {
+    "Aggressive": (20, 30, 50),
+    "Moderate": (10, 25, 65),
+    "Conservative": (0, 20, 80),
+}
+DERISK_YEARS = 7
+
+
+def canonical_profile(profile: str | None) -> str:
+    p = (profile or "Moderate").lower()
+    if "aggress" in p:
+        return "Aggressive"
+    if "conserv" in p:
+        return "Conservative"
+    return "Moderate"
+
+
+@lru_cache(maxsize=1024)
+def glide_template(profile: str, months: int) -> np.ndarray:
+    """
+    Allocation fractions for each month of a goal, shape (months, 3) in
+    ASSET_CLASSES order. Row 0 is the first month, row -1 the last.
+    """
+    profile = canonical_profile(profile)
+    start_alloc = get_allocation_for_profile(profile)
+    start = np.array([start_alloc[a] for a in ASSET_CLASSES], dtype=float) / 100
+    end = np.array(LANDING_ALLOCATION[profile], dtype=float) / 100
+
+    remaining = np.arange(months, 0, -1, dtype=float)          # months left incl. current
+    progress = np.clip(remaining / (DERISK_YEARS * 12), 0, 1)[:, None]
+    template = end + (start - end) * progress
+    template.setflags(write=False)
+    return template
+
+
+@lru_cache(maxsize=1024)
+def _monthly_rates(profile: str, months: int) -> np.ndarray:
+    rates = glide_template(profile, months) @ (ASSET_RETURNS / 100 / 12)
+    rates.setflags(write=False)
+    return rates
+
+
+@lru_cache(maxsize=1024)
+def glide_sip_factor(profile: str, months: int) -> float:
+    """Future value of ₹1 paid at the end of every month along the glide path."""
+    growth = 1 + _monthly_rates(canonical_profile(profile), months)
+    # growth of a contribution made at the end of month m = product of later months
+    later = np.cumprod(growth[::-1])[::-1]
+    return float(later[1:].sum() + 1.0)
+
+
+def glide_sip_required(target_amount: float, years: int, profile: str | None) -> float:
+    return target_amount / glide_sip_factor(canonical_profile(profile), round(years * 12))
+
+
+def _distinct_pairs(profiles, years):
+    """Distinct (profile, months) pairs of a batch and each goal's index into them."""
+    # Fractional years round to whole months, as the flat-return path does
+    months = np.rint(np.asarray(years, dtype=float) * 12).astype(np.int64)
+    raw, raw_inverse = np.unique(np.asarray(profiles, dtype=object).astype(str), return_inverse=True)
+    names = list(LANDING_ALLOCATION)
+    codes = np.array([names.index(canonical_profile(p)) for p in raw])[raw_inverse].reshape(months.shape)
+
+    unique, inverse = np.unique(np.column_stack([codes.ravel(), months.ravel()]), axis=0, return_inverse=True)
+    return [(names[c], int(m)) for c, m in unique], inverse.reshape(months.shape)
+
+
+def glide_sip_required_batch(target_amount, years, profiles) -> np.ndarray:
+    """
+    Glide-path SIP for many goals. Each distinct (profile, years) pair is
+    evaluated once through the template cache and broadcast back.
+    """
+    pairs, inverse = _distinct_pairs(profiles, years)
+    factors = np.array([glide_sip_factor(*pair) for pair in pairs])
+    return np.asarray(target_amount, dtype=float) / factors[inverse]
+
+
+def glide_paths(profiles, years):
+    """
+    Per-goal allocation matrices for a batch. Returns (templates, index):
+    goal i's (months, 3) matrix is templates[index[i]], shared read-only
+    between goals with the same profile and horizon.
+    """
+    pairs, inverse = _distinct_pairs(profiles, years)
+    return [glide_template(*pair) for pair in pairs], inverse.astype(np.int32)
+
+
+def glide_schedule(monthly_sip: float, years: int, profile: str | None) -> np.ndarray:
+    """Corpus at the end of every month for a SIP following the glide path."""
+    growth = 1 + _monthly_rates(canonical_profile(profile), round(years * 12))
+    cum = np.cumprod(growth)
+    # corpus_t = sip * sum_{m<=t} prod_{m<k<=t} growth_k
+    return monthly_sip * cum * np.cumsum(1 / cum)
@@ -0,0 +1,146 @@
+# modules/goal_batch.py
+"""
+Columnar goal container. Each field is one NumPy array and goal type / risk
+profile are stored as int8 category codes, so a goal costs 20 bytes instead
+of a dataclass or dict per row.
+"""
+
+import numpy as np
+
+from modules.goals import Goal, TARGET_COL, YEARS_COL, RETURN_COL, sip_required_batch
+from modules.planning import GOAL_TYPES
+
+GOAL_TYPE_CATEGORIES = tuple(GOAL_TYPES)
+RISK_CATEGORIES = ("Conservative", "Moderate", "Aggressive")
+# Same horizon bound as the API; well inside the int16 years column
+MAX_YEARS = 100
+
+
+def encode(values, categories) -> np.ndarray:
+    """Category codes for `values`; unknown or missing values become -1."""
+    index = {c: i for i, c in enumerate(categories)}
+    return np.fromiter((index.get(v, -1) for v in values), dtype=np.int8)
+
+
+def _decode(code, categories):
+    return categories[code] if code >= 0 else None
+
+
+def _checked_years(years) -> np.ndarray:
+    """Years as int16, refusing fractional or out-of-range values instead of wrapping."""
+    raw = np.asarray(years, dtype=np.float64)
+    bad = ~np.isfinite(raw) | (raw != np.round(raw)) | (raw < 1) | (raw > MAX_YEARS)
+    if bad.any():
+        i = int(np.flatnonzero(bad)[0])
+        raise ValueError(f"years must be whole numbers from 1 to {MAX_YEARS}; row {i} has {raw.ravel()[i]!r}")
+    return np.ascontiguousarray(raw, dtype=np.int16)
+
+
+def _check_codes(codes, categories, name):
+    if len(codes) and (codes.min() < -1 or codes.max() >= len(categories)):
+        raise ValueError(f"{name} must be -1 or an index into {categories}")
+
+
+class GoalBatch:
+    """Many goals held as parallel arrays. Rows are addressed by position."""
+
+    __slots__ = ("target_amount", "years", "expected_return", "goal_type_codes", "risk_codes")
+
+    def __init__(self, target_amount, years, expected_return, goal_type_codes=None, risk_codes=None):
+        self.target_amount = np.ascontiguousarray(target_amount, dtype=np.float64)
+        n = len(self.target_amount)
+        self.years = _checked_years(years)
+        self.expected_return = np.ascontiguousarray(expected_return, dtype=np.float64)
+        self.goal_type_codes = (np.zeros(n, dtype=np.int8) if goal_type_codes is None
+                                else np.ascontiguousarray(goal_type_codes, dtype=np.int8))
+        self.risk_codes = (np.full(n, -1, dtype=np.int8) if risk_codes is None
+                           else np.ascontiguousarray(risk_codes, dtype=np.int8))
+        if not all(len(a) == n for a in (self.years, self.expected_return, self.goal_type_codes, self.risk_codes)):
+            raise ValueError("GoalBatch columns must all have the same length")
+        if not np.isfinite(self.target_amount).all() or (self.target_amount < 0).any():
+            raise ValueError("target_amount must be finite and non-negative")
+        if not np.isfinite(self.expected_return).all():
+            raise ValueError("expected_return must be finite")
+        _check_codes(self.goal_type_codes, GOAL_TYPE_CATEGORIES, "goal_type_codes")
+        _check_codes(self.risk_codes, RISK_CATEGORIES, "risk_codes")
+
+    @classmethod
+    def from_goals(cls, goals, goal_type: str = "General") -> "GoalBatch":
+        if goal_type not in GOAL_TYPE_CATEGORIES:
+            raise ValueError(f"Unknown goal_type '{goal_type}'; expected one of: {', '.join(GOAL_TYPE_CATEGORIES)}")
+        goals = list(goals)
+        return cls(
+            [g.target_amount for g in goals],
+            [g.years for g in goals],
+            [g.expected_return for g in goals],
+            np.full(len(goals), GOAL_TYPE_CATEGORIES.index(goal_type), dtype=np.int8),
+            encode((g.risk_profile for g in goals), RISK_CATEGORIES),
+        )
+
+    @classmethod
+    def from_records(cls, records) -> "GoalBatch":
+        """Build from saved-goal dicts as stored by the app."""
+        records = list(records)
+        return cls(
+            [r[TARGET_COL] for r in records],
+            [r[YEARS_COL] for r in records],
+            [r[RETURN_COL] for r in records],
+            encode((r.get("Goal type") for r in records), GOAL_TYPE_CATEGORIES),
+            encode((r.get("Risk") for r in records), RISK_CATEGORIES),
+        )
+
+    @classmethod
+    def from_frame(cls, df) -> "GoalBatch":
+        """Build from a saved-goals style DataFrame."""
+        goal_type = df["Goal type"] if "Goal type" in df.columns else None
+        risk = df["Risk"] if "Risk" in df.columns else None
+        return cls(
+            df[TARGET_COL].to_numpy(),
+            df[YEARS_COL].to_numpy(),
+            df[RETURN_COL].to_numpy(),
+            None if goal_type is None else encode(goal_type, GOAL_TYPE_CATEGORIES),
+            None if risk is None else encode(risk, RISK_CATEGORIES),
+        )
+
+    def __len__(self):
+        return len(self.target_amount)
+
+    def __getitem__(self, i) -> Goal:
+        """Materialize one row as a scalar Goal."""
+        goal_type = _decode(self.goal_type_codes[i], GOAL_TYPE_CATEGORIES) or "General"
+        return Goal(
+            f"{goal_type} Goal {i + 1}",
+            float(self.target_amount[i]),
+            int(self.years[i]),
+            float(self.expected_return[i]),
+            _decode(self.risk_codes[i], RISK_CATEGORIES),
+        )
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def sip(self) -> np.ndarray:
+        return sip_required_batch(self.target_amount, self.years, self.expected_return)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the column arrays."""
+        return sum(getattr(self, name).nbytes for name in self.__slots__)
+
+    @property
+    def bytes_per_goal(self) -> float:
+        return self.nbytes / len(self) if len(self) else 0.0
+
+    def to_frame(self):
+        """
+        DataFrame view of the batch. Numeric columns share memory with the
+        batch arrays and the category columns reuse the int8 codes.
+        """
+        import pandas as pd
+        return pd.DataFrame({
+            TARGET_COL: self.target_amount,
+            YEARS_COL: self.years,
+            RETURN_COL: self.expected_return,
+            "Goal type": pd.Categorical.from_codes(self.goal_type_codes, GOAL_TYPE_CATEGORIES),
+            "Risk": pd.Categorical.from_codes(self.risk_codes, RISK_CATEGORIES),
+        }, copy=False)
@@ -1,9 +1,21 @@
 # modules/goals.py
 
 from dataclasses import dataclass
+from functools import lru_cache
 from math import pow
 
-@dataclass
+import numpy as np
+
+# What-if grid: horizons of 1-40 years x returns of 5-20% in 0.5% steps
+WHATIF_YEARS = np.arange(1, 41)
+WHATIF_RETURNS = np.arange(5.0, 20.5, 0.5)
+
+# Column names used by the saved-goals table in app.py
+TARGET_COL = "Inflation-adjusted Target (₹)"
+YEARS_COL = "Years"
+RETURN_COL = "Return (%)"
+
+@dataclass(slots=True)
 class Goal:
     name: str
     target_amount: float      # how much money you need
@@ -28,6 +40,75 @@ def sip_required(goal: Goal) -> float:
     return monthly
 
 
+def sip_required_batch(target_amount, years, expected_return) -> np.ndarray:
+    """
+    Vectorized sip_required for many goals in one pass.
+    Inputs may be scalars or array-likes and are broadcast together.
+    """
+    target = np.asarray(target_amount, dtype=float)
+    r = np.asarray(expected_return, dtype=float) / 100 / 12
+    n = np.asarray(years, dtype=float) * 12
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        factor = (np.power(1 + r, n) - 1) / r
+        monthly = np.where(r == 0, target / n, target / factor)
+    return monthly
+
+
+def sip_required_frame(df) -> np.ndarray:
+    """
+    SIP for every row of a saved-goals style DataFrame
+    (inflation-adjusted target, years and return columns).
+    """
+    return sip_required_batch(
+        df[TARGET_COL].to_numpy(dtype=float),
+        df[YEARS_COL].to_numpy(dtype=float),
+        df[RETURN_COL].to_numpy(dtype=float),
+    )
+
+
+@lru_cache(maxsize=256)
+def corpus_schedule(monthly_sip: float, years: int, annual_return: float,
+                    monthly: bool = False) -> np.ndarray:
+    """
+    Corpus after each year (or each month if monthly=True) of a flat SIP,
+    computed in one array expression. Memoized; the returned array is
+    read-only so cached results can be shared safely.
+    """
+    r = annual_return / 100 / 12
+    step = 1 if monthly else 12
+    months = np.arange(step, years * 12 + 1, step, dtype=float)
+
+    if r == 0:
+        values = monthly_sip * months
+    else:
+        values = monthly_sip * np.expm1(months * np.log1p(r)) / r
+    values.setflags(write=False)
+    return values
+
+
+@lru_cache(maxsize=1)
+def sip_factor_grid() -> np.ndarray:
+    """
+    SIP required per ₹1 of target for every (years, return) pair of the
+    what-if grid. Rows follow WHATIF_YEARS, columns WHATIF_RETURNS.
+    SIP is linear in the target, so any goal is a lookup times a multiply.
+    """
+    grid = sip_required_batch(1.0, WHATIF_YEARS[:, None], WHATIF_RETURNS[None, :])
+    grid.setflags(write=False)
+    return grid
+
+
+def sip_from_grid(target_amount: float, years: int, annual_return: float) -> float:
+    """SIP via the precomputed grid, falling back to the formula off-grid."""
+    row = int(years) - int(WHATIF_YEARS[0])
+    col = (annual_return - WHATIF_RETURNS[0]) / 0.5
+    if years == int(years) and 0 <= row < len(WHATIF_YEARS) and col == int(col) \
+            and 0 <= col < len(WHATIF_RETURNS):
+        return float(target_amount * sip_factor_grid()[row, int(col)])
+    return float(sip_required_batch(target_amount, years, annual_return))
+
+
 def describe_goal_plan(goal: Goal) -> str:
     monthly = sip_required(goal)
     text = [
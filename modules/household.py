@@ -0,0 +1,143 @@
+# modules/household.py
+"""
+Household timeline: every saved goal projected month by month into
+(goals x months) matrices of contributions, corpus and maturity payouts,
+with the monthly budget alongside.
+
+Month t (1..months) is the end of the t-th month from today. A goal pays its
+SIP (stepped up every 12 months if step_up > 0) up to and including its
+deadline month, when the corpus is paid out and drops to zero.
+"""
+
+from dataclasses import dataclass
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from modules.goals import RETURN_COL, YEARS_COL
+
+SIP_COL = "Monthly SIP (₹)"
+
+
+def _contributions(sip, n, step_up, t) -> np.ndarray:
+    """(..., months) SIP paid per month, zero after each goal's deadline n."""
+    stepped = sip[..., None] * np.power(1 + step_up[..., None] / 100, (t - 1) // 12)
+    return np.where(t <= n[..., None], stepped, 0.0)
+
+
+def _corpus(paid, r, t) -> np.ndarray:
+    """Corpus before payout: corpus_t = sum_{m<=t} paid_m (1+r)^(t-m), along the last axis."""
+    growth = np.power(1 + r[..., None], t)
+    return growth * np.cumsum(paid / growth, axis=-1)
+
+
+@dataclass
+class HouseholdTimeline:
+    names: list
+    contributions: np.ndarray     # (goals, months) SIP paid at the end of each month
+    corpus: np.ndarray            # (goals, months) value held for each goal, 0 after maturity
+    payouts: np.ndarray           # (goals, months) corpus released in the maturity month
+    maturity_month: np.ndarray    # (goals,) month each goal matures
+    budget: float | None = None
+
+    @property
+    def months(self) -> int:
+        return self.contributions.shape[1]
+
+    @property
+    def total_contributions(self) -> np.ndarray:
+        return self.contributions.sum(axis=0)
+
+    @property
+    def total_corpus(self) -> np.ndarray:
+        return self.corpus.sum(axis=0)
+
+    def over_budget(self) -> np.ndarray:
+        """Months in which the goals' combined SIP exceeds the budget."""
+        if self.budget is None:
+            return np.zeros(self.months, dtype=bool)
+        return self.total_contributions > self.budget + 1e-9
+
+    def to_frame(self, yearly: bool = False) -> pd.DataFrame:
+        """
+        Long-form frame (Month, Goal, Contribution, Corpus, Payout) for
+        charting. yearly=True keeps every 12th month and sums contributions
+        and payouts over each year.
+        """
+        months = np.arange(1, self.months + 1)
+        contrib, payouts, corpus = self.contributions, self.payouts, self.corpus
+        if yearly:
+            pad = -self.months % 12
+            fold = lambda a: np.pad(a, ((0, 0), (0, pad))).reshape(len(a), -1, 12).sum(axis=2)
+            contrib, payouts = fold(contrib), fold(payouts)
+            corpus = np.pad(corpus, ((0, 0), (0, pad)), mode="edge")[:, 11::12]
+            months = np.arange(12, self.months + pad + 1, 12)
+        g = len(self.names)
+        return pd.DataFrame({
+            "Month": np.tile(months, g),
+            "Goal": np.repeat(self.names, len(months)),
+            "Contribution": contrib.ravel(),
+            "Corpus": corpus.ravel(),
+            "Payout": payouts.ravel(),
+        })
+
+
+def project_household(monthly_sip, years, annual_return, step_up=0.0, names=None,
+                      budget: float | None = None, months: int | None = None) -> HouseholdTimeline:
+    """Timeline for one household's goals (1-D inputs, one entry per goal)."""
+    sip = np.atleast_1d(np.asarray(monthly_sip, dtype=float))
+    n = np.round(np.broadcast_to(np.asarray(years, dtype=float), sip.shape) * 12).astype(np.int64)
+    r = np.broadcast_to(np.asarray(annual_return, dtype=float), sip.shape) / 100 / 12
+    step = np.broadcast_to(np.asarray(step_up, dtype=float), sip.shape)
+    horizon = months or int(n.max(initial=0))
+    t = np.arange(1, horizon + 1)
+
+    paid = _contributions(sip, n, step, t)
+    grown = _corpus(paid, r, t)
+    matures = t == n[:, None]
+    payouts = np.where(matures, grown, 0.0)
+    corpus = np.where(t < n[:, None], grown, 0.0)
+    names = list(names) if names is not None else [f"Goal {i + 1}" for i in range(len(sip))]
+    return HouseholdTimeline(names, paid, corpus, payouts, n, budget)
+
+
+def timeline_from_saved_goals(goals, budget: float | None = None, step_up=0.0) -> HouseholdTimeline:
+    """Timeline for the app's saved-goal dicts."""
+    return project_household(
+        [g[SIP_COL] for g in goals], [g[YEARS_COL] for g in goals], [g[RETURN_COL] for g in goals],
+        step_up=step_up, names=[g["Goal"] for g in goals], budget=budget,
+    )
+
+
+class HouseholdTotals(NamedTuple):
+    contributions: np.ndarray     # (households, months)
+    corpus: np.ndarray            # (households, months)
+    months_over_budget: np.ndarray  # (households,) or None without a budget
+
+
+def project_households(monthly_sip, years, annual_return, step_up=0.0, budget=None,
+                       months: int | None = None) -> HouseholdTotals:
+    """
+    Combined monthly totals for many households. Inputs are (households,
+    goals) arrays padded with zero SIPs; goals are accumulated one at a time
+    so memory stays at (households, months).
+    """
+    sip = np.atleast_2d(np.asarray(monthly_sip, dtype=float))
+    n = np.round(np.broadcast_to(np.asarray(years, dtype=float), sip.shape) * 12).astype(np.int64)
+    r = np.broadcast_to(np.asarray(annual_return, dtype=float), sip.shape) / 100 / 12
+    step = np.broadcast_to(np.asarray(step_up, dtype=float), sip.shape)
+    horizon = months or int(n.max(initial=0))
+    t = np.arange(1, horizon + 1)
+
+    contributions = np.zeros((len(sip), horizon))
+    corpus = np.zeros((len(sip), horizon))
+    for j in range(sip.shape[1]):
+        paid = _contributions(sip[:, j], n[:, j], step[:, j], t)
+        contributions += paid
+        corpus += np.where(t < n[:, j, None], _corpus(paid, r[:, j], t), 0.0)
+
+    over = None
+    if budget is not None:
+        over = (contributions > np.asarray(budget, dtype=float).reshape(-1, 1) + 1e-9).sum(axis=1)
+    return HouseholdTotals(contributions, corpus, over)
@@ -0,0 +1,169 @@
+# modules/instrumentation.py
+"""
+Opt-in timing instrumentation. Enable with ROBO_PROFILE=1 (or enable()).
+When disabled every hook is a single flag check.
+
+Timings are (run, name, seconds, timestamp) records kept in a process-wide
+ring buffer. A "run" is one Streamlit rerun: begin_run() starts it, lap()
+closes the previous page section and starts the next, end_run() closes the
+last one.
+"""
+
+import contextvars
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque, namedtuple
+
+Timing = namedtuple("Timing", "run name seconds timestamp")
+
+BUFFER_SIZE = int(os.environ.get("ROBO_PROFILE_BUFFER", "5000"))
+_enabled = os.environ.get("ROBO_PROFILE", "") not in ("", "0", "false")
+_buffer = deque(maxlen=BUFFER_SIZE)
+_lock = threading.Lock()
+_run_ids = itertools.count(1)
+_current_run = contextvars.ContextVar("current_run", default=None)
+_current_lap = contextvars.ContextVar("current_lap", default=None)
+
+
+def enable(on: bool = True):
+    global _enabled
+    _enabled = on
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def record(name: str, seconds: float):
+    if _enabled:
+        with _lock:
+            _buffer.append(Timing(_current_run.get(), name, seconds, time.time()))
+
+
+class timed:
+    """Context manager timing a block: `with timed("page.chat"): ...`"""
+
+    __slots__ = ("name", "_start")
+
+    def __init__(self, name: str):
+        self.name = name
+        self._start = None
+
+    def __enter__(self):
+        if _enabled:
+            self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self._start is not None:
+            record(self.name, time.perf_counter() - self._start)
+        return False
+
+
+def instrument(fn=None, *, name: str | None = None):
+    """Decorator timing every call of a function when instrumentation is on."""
+    if fn is None:
+        return functools.partial(instrument, name=name)
+    label = name or f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__name__}"
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not _enabled:
+            return fn(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            record(label, time.perf_counter() - start)
+    return wrapper
+
+
+def begin_run() -> int | None:
+    """Start a new rerun; returns its id (None when disabled)."""
+    if not _enabled:
+        return None
+    run = next(_run_ids)
+    _current_run.set(run)
+    _current_lap.set((time.perf_counter(), None, None))
+    return run
+
+
+def lap(name: str):
+    """Close the current section (if any) and start timing `name`."""
+    if not _enabled or _current_run.get() is None:
+        return
+    now = time.perf_counter()
+    run_start, section, section_start = _current_lap.get()
+    if section is not None:
+        record(section, now - section_start)
+    _current_lap.set((run_start, name, now))
+
+
+def end_run():
+    """Close the last section and record the total rerun time."""
+    if not _enabled or _current_run.get() is None:
+        return
+    now = time.perf_counter()
+    run_start, section, section_start = _current_lap.get()
+    if section is not None:
+        record(section, now - section_start)
+    record("rerun.total", now - run_start)
+    _current_lap.set((run_start, None, None))
+
+
+def timings(run: int | None = None) -> list:
+    with _lock:
+        items = list(_buffer)
+    return items if run is None else [t for t in items if t.run == run]
+
+
+def breakdown(run: int) -> dict:
+    """Total seconds per name for one rerun, slowest first."""
+    totals = {}
+    for t in timings(run):
+        totals[t.name] = totals.get(t.name, 0.0) + t.seconds
+    return dict(sorted(totals.items(), key=lambda kv: -kv[1]))
+
+
+def summary() -> dict:
+    """Per-name count / sum / max / p50 / p95 over the whole buffer."""
+    by_name = {}
+    for t in timings():
+        by_name.setdefault(t.name, []).append(t.seconds)
+    out = {}
+    for name, values in by_name.items():
+        values.sort()
+        n = len(values)
+        out[name] = {
+            "count": n, "sum": sum(values), "max": values[-1],
+            "p50": values[(n - 1) // 2], "p95": values[min(int(n * 0.95), n - 1)],
+        }
+    return out
+
+
+def export_json(path: str) -> str:
+    with open(path, "w") as f:
+        json.dump({"summary": summary(), "timings": [t._asdict() for t in timings()]}, f, indent=2)
+    return path
+
+
+def prometheus_text(prefix: str = "roboadvisor") -> str:
+    metric = f"{prefix}_section_seconds"
+    lines = [f"# HELP {metric} Time spent per instrumented section.", f"# TYPE {metric} summary"]
+    for name, s in sorted(summary().items()):
+        label = name.replace("\\", "\\\\").replace('"', '\\"')
+        lines.append(f'{metric}{{section="{label}",quantile="0.5"}} {s["p50"]:.6f}')
+        lines.append(f'{metric}{{section="{label}",quantile="0.95"}} {s["p95"]:.6f}')
+        lines.append(f'{metric}_sum{{section="{label}"}} {s["sum"]:.6f}')
+        lines.append(f'{metric}_count{{section="{label}"}} {s["count"]}')
+    return "\n".join(lines) + "\n"
+
+
+def export_prometheus(path: str) -> str:
+    with open(path, "w") as f:
+        f.write(prometheus_text())
+    return path
@@ -0,0 +1,188 @@
+# modules/optimizer.py
+"""
+Split a constrained monthly budget across goals.
+
+All inputs broadcast over a trailing "goals" axis, so a single household is
+1-D and a batch of households is a 2-D (households x goals) array padded
+with zero targets. Budget has one value per household.
+
+The budget is spent month by month: when a goal matures its SIP is freed
+and goes to the goals still running, so horizon extensions are solved
+against the whole budget rather than each goal's opening SIP.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from modules.goals import sip_required_batch
+
+# Goals that cannot finish this many years past the latest deadline report inf
+MAX_EXTENSION_YEARS = 60
+
+
+@dataclass
+class BudgetAllocation:
+    required: np.ndarray      # SIP each goal needs for its original horizon
+    allocated: np.ndarray     # SIP assigned from the budget in the first month
+    shortfall: np.ndarray     # required - allocated
+    feasible: np.ndarray      # True per household when every goal meets its original deadline
+    extra_years: np.ndarray   # whole years added to each deadline (inf if never funded)
+
+
+def _extension(completion, deadline) -> np.ndarray:
+    """Whole years from `deadline` to `completion` (both in months), 0 if on time."""
+    with np.errstate(invalid="ignore"):
+        return np.where(completion <= deadline, 0.0, np.ceil((completion - deadline) / 12 - 1e-9))
+
+
+def _capped_level(target, avail, weights) -> np.ndarray:
+    """
+    Smallest level s per row with sum(min(avail, s) * weights) >= target.
+    The sum is piecewise linear in s with breaks at the avail values, so
+    sorting them gives every break and the crossing is solved directly.
+    """
+    order = np.argsort(avail, axis=-1)
+    v = np.take_along_axis(avail, order, axis=-1)
+    w = np.take_along_axis(weights, order, axis=-1)
+    below = np.cumsum(v * w, axis=-1) - v * w
+    above = np.cumsum(w[:, ::-1], axis=-1)[:, ::-1]
+    j = np.argmax(below + v * above >= target[:, None] * (1 - 1e-12), axis=-1)[:, None]
+    below_j = np.take_along_axis(below, j, axis=-1)[:, 0]
+    above_j = np.take_along_axis(above, j, axis=-1)[:, 0]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(above_j > 0, (target - below_j) / above_j, 0.0)
+
+
+def _priority_schedule(target, deadline, rate, budget, order):
+    """
+    Fund goals one at a time in `order`. Each goal gets the earliest whole-year
+    deadline the budget left by higher-priority goals allows, then draws the
+    smallest level SIP (capped by what is left each month) that meets it.
+    Returns (first-month SIP, extra years) per goal.
+    """
+    households, goals = target.shape
+    horizon = int(deadline.max(initial=0)) + 12 * (MAX_EXTENSION_YEARS + 1)
+    t = np.arange(1, horizon + 1, dtype=float)
+    avail = np.repeat(budget, horizon, axis=-1)
+    allocated = np.zeros(target.shape)
+    extra = np.zeros(target.shape)
+    rows = np.arange(households)
+
+    for k in order.T:
+        T, n, lr = target[rows, k], deadline[rows, k], np.log1p(rate[rows, k])[:, None]
+        growth = np.exp(t * lr)
+        corpus = growth * np.cumsum(avail / growth, axis=-1)
+        reached = corpus[:, :horizon - 12] >= T[:, None] * (1 - 1e-12)
+        completion = np.where(reached.any(axis=-1), reached.argmax(axis=-1) + 1.0, np.inf)
+        years = np.where(T > 0, _extension(completion, n), 0.0)
+        funded = np.isfinite(years)
+
+        d = np.where(funded, n + 12 * np.where(funded, years, 0), 0)[:, None]
+        weights = np.where(t <= d, np.exp((d - t) * lr), 0.0)
+        level = np.where(T > 0, _capped_level(T, avail, weights), 0.0)
+        draw = np.where(funded[:, None], np.where(t <= d, np.minimum(avail, level[:, None]), 0.0), avail)
+
+        allocated[rows, k] = draw[:, 0]
+        extra[rows, k] = years
+        avail = np.maximum(avail - draw, 0.0)
+    return allocated, extra
+
+
+def _months_to_reach(target, corpus, sip, r) -> np.ndarray:
+    """Months for `corpus` plus a level `sip` to grow to `target` (inf if never)."""
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        months = np.where(r == 0, (target - corpus) / sip,
+                          np.log((target * r + sip) / (corpus * r + sip)) / np.log1p(r))
+    return np.where(corpus >= target, 0.0, np.where(np.isnan(months) | (months < 0), np.inf, months))
+
+
+def _proportional_schedule(target, deadline, rate, required, budget):
+    """
+    Share the budget in proportion to each running goal's required SIP. When
+    a goal completes, the next period re-splits the whole budget among the
+    rest, so nothing freed is left idle. Returns (first-month SIP, extra years).
+    """
+    short = required.sum(axis=-1, keepdims=True) > budget
+    corpus = np.zeros(target.shape)
+    completion = np.where(target > 0, np.inf, 0.0)
+    done = target <= 0
+    elapsed = np.zeros(budget.shape)
+    allocated = None
+
+    for _ in range(target.shape[-1]):
+        live = ~done
+        if not live.any():
+            break
+        need = np.where(live, required, 0.0).sum(axis=-1, keepdims=True)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scale = np.where(short & (need > 0), budget / need, 1.0)
+        sip = np.where(live, required * scale, 0.0)
+        if allocated is None:
+            allocated = sip
+        months = np.where(live, np.ceil(_months_to_reach(target, corpus, sip, rate) - 1e-9), np.inf)
+        step = months.min(axis=-1, keepdims=True)
+        stuck = ~np.isfinite(step)
+        step = np.where(stuck, 0.0, step)
+
+        grow = np.power(1 + rate, step)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            annuity = np.where(rate == 0, step, np.expm1(step * np.log1p(rate)) / rate)
+        corpus = np.where(live, corpus * grow + sip * annuity, corpus)
+        hit = live & (months == step)
+        completion = np.where(hit, elapsed + step, completion)
+        elapsed = elapsed + step
+        done = done | hit | stuck
+
+    if allocated is None:
+        allocated = np.zeros(target.shape)
+    return allocated, np.where(target > 0, _extension(completion, deadline), 0.0)
+
+
+def allocate_budget(target, years, annual_return, budget, priority=None,
+                    strategy: str = "priority") -> BudgetAllocation:
+    """
+    Allocate `budget` per month across goals and find the horizon
+    extensions that make the plan fit it.
+
+    strategy="priority": goals in order of priority (lower first), then
+    nearest deadline. Each goal takes the earliest deadline the budget left
+    by the goals before it allows, so the extensions are the smallest
+    possible in that order; budget freed by goals that mature flows down.
+    strategy="proportional": every running goal gets the same fraction of
+    its required SIP and the whole budget is re-split as goals complete,
+    so all goals progress together.
+    """
+    target = np.asarray(target, dtype=float)
+    years = np.asarray(years, dtype=float)
+    annual_return = np.broadcast_to(np.asarray(annual_return, dtype=float), target.shape)
+    years = np.broadcast_to(years, target.shape)
+    budget = np.asarray(budget, dtype=float)[..., None]
+
+    active = target > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        required = np.where(active, sip_required_batch(target, np.maximum(years, 1), annual_return), 0.0)
+
+    shape = target.shape
+    flat = lambda a: np.broadcast_to(a, shape).reshape(-1, shape[-1])
+    T, n, r = flat(target), flat(np.rint(years * 12)), flat(annual_return / 100 / 12)
+    B = np.broadcast_to(budget, shape[:-1] + (1,)).reshape(-1, 1)
+
+    if strategy == "priority":
+        prio = np.zeros(shape) if priority is None else np.broadcast_to(np.asarray(priority, dtype=float), shape)
+        order = flat(np.lexsort((years, prio), axis=-1))
+        allocated, extra_years = _priority_schedule(T, n, r, B, order)
+    elif strategy == "proportional":
+        allocated, extra_years = _proportional_schedule(T, n, r, flat(required), B)
+    else:
+        raise ValueError(f"Unknown strategy: {strategy}")
+
+    allocated = allocated.reshape(shape)
+    extra_years = extra_years.reshape(shape)
+    return BudgetAllocation(
+        required=required,
+        allocated=allocated,
+        shortfall=np.maximum(required - allocated, 0.0),
+        feasible=np.all(extra_years == 0, axis=-1),
+        extra_years=extra_years,
+    )
@@ -0,0 +1,136 @@
+# modules/parser.py
+"""
+Free-text goal parser. Patterns are compiled once at import time and each
+string is scanned in a single pass.
+"""
+
+import re
+from typing import Iterable, Iterator, NamedTuple
+
+UNIT_MULTIPLIERS = {
+    "k": 1_000, "thousand": 1_000,
+    "l": 1_00_000, "lac": 1_00_000, "lacs": 1_00_000, "lakh": 1_00_000, "lakhs": 1_00_000,
+    "cr": 1_00_00_000, "crore": 1_00_00_000, "crores": 1_00_00_000,
+}
+
+_NUM = r"\d[\d,]*(?:\.\d+)?"
+_RANGE_SEP = r"\s*(?:-|–|to)\s*"
+_UNIT = r"thousand|crores|crore|lakhs|lakh|lacs|lac|cr|l|k"
+_CURRENCY = r"rs\.?|inr|₹"
+
+# Amount with a currency prefix: "rs 50000", "₹1.5 cr", "rs. 10-15 lakh"
+_CURRENCY_AMOUNT = rf"(?:{_CURRENCY})\s*(?P<c_lo>{_NUM})(?:{_RANGE_SEP}(?P<c_hi>{_NUM}))?\s*(?P<c_unit>{_UNIT})?(?![a-z])"
+# Amount with a unit suffix: "50 lakh", "1.5cr", "10-15 l", "50000 rs"
+_UNIT_AMOUNT = rf"(?P<a_lo>{_NUM})(?:{_RANGE_SEP}(?P<a_hi>{_NUM}))?\s*(?:(?P<a_unit>{_UNIT})|{_CURRENCY})(?![a-z])"
+_YEARS = rf"(?P<y_lo>{_NUM})(?:{_RANGE_SEP}(?P<y_hi>{_NUM}))?\s*(?:years|year|yrs|yr)(?![a-z])"
+_RETURN = rf"(?P<r_lo>{_NUM})(?:{_RANGE_SEP}(?P<r_hi>{_NUM}))?\s*(?:%|percent(?![a-z]))"
+
+# One token grammar for every field: optional currency, a number or range,
+# then an optional unit / "years" / "%" suffix. The leading lookahead lets
+# the scanner skip ordinary words quickly.
+GOAL_PATTERN = re.compile(
+    rf"(?=[\d₹ri])(?:(?P<cur>{_CURRENCY})\s*)?(?P<lo>{_NUM})(?:{_RANGE_SEP}(?P<hi>{_NUM}))?\s*"
+    rf"(?:(?P<unit>{_UNIT})(?![a-z])|(?P<yr>years|year|yrs|yr)(?![a-z])|(?P<pct>%|percent(?![a-z]))"
+    rf"|(?P<cur2>rs|₹)(?![a-z]))?",
+    re.IGNORECASE,
+)
+# Per-field patterns for pandas .str.extract (first match of each field)
+_AMOUNT_PATTERN = re.compile(rf"{_CURRENCY_AMOUNT}|{_UNIT_AMOUNT}", re.IGNORECASE)
+_YEARS_PATTERN = re.compile(_YEARS, re.IGNORECASE)
+_RETURN_PATTERN = re.compile(_RETURN, re.IGNORECASE)
+
+
+class ParsedGoal(NamedTuple):
+    amount: float | None
+    years: int | None
+    expected_return: float | None
+    amount_range: tuple | None = None     # (low, high) when a range was given
+    years_range: tuple | None = None
+    return_range: tuple | None = None
+
+
+def _bounds(lo, hi):
+    """Numeric (low, high) of a matched number or range; high is None for a single value."""
+    lo = float(lo.replace(",", ""))
+    if hi is None:
+        return lo, None
+    hi = float(hi.replace(",", ""))
+    return (lo, hi) if lo <= hi else (hi, lo)
+
+
+def parse_goal(text: str) -> ParsedGoal:
+    """
+    Extract amount (₹), years and expected return (%) from free text.
+    The first match of each field wins. For ranges the conservative end is
+    used: the highest amount, the shortest horizon and the lowest return.
+    """
+    amount = years = ret = None
+    amount_range = years_range = return_range = None
+
+    for m in GOAL_PATTERN.finditer(text):
+        cur, lo, hi, unit, yr, pct, cur2 = m.groups()
+        if yr:
+            if years is not None:
+                continue
+            lo, hi = _bounds(lo, hi)
+            years = max(int(round(lo)), 1)
+            years_range = (lo, hi) if hi is not None else None
+        elif pct:
+            if ret is not None:
+                continue
+            lo, hi = _bounds(lo, hi)
+            ret = lo
+            return_range = (lo, hi) if hi is not None else None
+        elif unit or cur or cur2:
+            if amount is not None:
+                continue
+            lo, hi = _bounds(lo, hi)
+            mult = UNIT_MULTIPLIERS[unit.lower()] if unit else 1
+            amount = (hi if hi is not None else lo) * mult
+            amount_range = (lo * mult, hi * mult) if hi is not None else None
+        else:
+            continue
+        if amount is not None and years is not None and ret is not None:
+            break
+
+    return ParsedGoal(amount, years, ret, amount_range, years_range, return_range)
+
+
+def parse_many(texts: Iterable[str]) -> Iterator[ParsedGoal]:
+    """Stream parse results for an iterable of strings (None/NaN-safe)."""
+    for text in texts:
+        yield parse_goal(text) if isinstance(text, str) else ParsedGoal(None, None, None)
+
+
+def parse_series(series):
+    """
+    Parse a pandas string Series with vectorized `.str.extract` calls.
+    Returns a DataFrame with amount, years and expected_return columns,
+    matching parse_goal on the conservative end of ranges.
+    """
+    s = series.astype("string")
+
+    a = s.str.extract(_AMOUNT_PATTERN)
+    use_cur = a["c_lo"].notna()
+    lo = _numeric(a["c_lo"].where(use_cur, a["a_lo"]))
+    hi = _numeric(a["c_hi"].where(use_cur, a["a_hi"]))
+    unit = a["c_unit"].where(use_cur, a["a_unit"]).str.lower()
+    mult = unit.map(UNIT_MULTIPLIERS).astype("Float64").fillna(1)
+    amount = lo.where(hi.isna() | (lo > hi), hi) * mult
+
+    y = s.str.extract(_YEARS_PATTERN)
+    y_lo, y_hi = _numeric(y["y_lo"]), _numeric(y["y_hi"])
+    years = y_lo.where(y_hi.isna() | (y_lo < y_hi), y_hi).round().clip(lower=1).astype("Int64")
+
+    r = s.str.extract(_RETURN_PATTERN)
+    r_lo, r_hi = _numeric(r["r_lo"]), _numeric(r["r_hi"])
+    expected_return = r_lo.where(r_hi.isna() | (r_lo < r_hi), r_hi)
+
+    frame = amount.to_frame("amount")
+    frame["years"] = years
+    frame["expected_return"] = expected_return
+    return frame
+
+
+def _numeric(col):
+    return col.str.replace(",", "", regex=False).astype("Float64")
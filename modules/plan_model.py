@@ -0,0 +1,106 @@
+# modules/plan_model.py
+"""
+Dependency-tracked plan model. Each derived value records the versions of
+the inputs it was computed from and is only recomputed when one of them
+changes, so refreshing many saved goals after an assumption change only
+redoes the affected work.
+"""
+
+from modules.planning import (
+    calculate_sip, generate_insights, get_allocation_for_profile, inflate_target, risk_heat_label,
+)
+
+INPUTS = ("original_target", "years", "inflation", "return", "risk_profile")
+
+# derived name -> (dependencies, function of the dependency values)
+DERIVED = {
+    "inflated_target": (("original_target", "inflation", "years"),
+                        lambda amount, infl, years: inflate_target(amount, infl, years)),
+    "sip": (("inflated_target", "years", "return"), calculate_sip),
+    "allocation": (("risk_profile",), get_allocation_for_profile),
+    "risk_heat": (("risk_profile", "years"), risk_heat_label),
+    "insights": (("years", "return", "inflation"),
+                 lambda years, ret, infl: generate_insights({"years": years, "return": ret, "inflation": infl})),
+}
+
+
+class PlanModel:
+    """Inputs and lazily refreshed derived values for one goal."""
+
+    __slots__ = ("_values", "_versions", "_seen", "recomputed")
+
+    def __init__(self, **inputs):
+        missing = set(INPUTS) - set(inputs)
+        if missing:
+            raise ValueError(f"Missing plan inputs: {', '.join(sorted(missing))}")
+        self._values = dict(inputs)
+        self._versions = dict.fromkeys(inputs, 0)
+        self._seen = {}          # derived name -> dependency versions it was computed from
+        self.recomputed = 0      # number of derived evaluations, for instrumentation
+
+    def set(self, name: str, value) -> bool:
+        """Update an input; returns True if it actually changed."""
+        if name not in INPUTS:
+            raise KeyError(f"'{name}' is not a plan input")
+        if self._values[name] == value:
+            return False
+        self._values[name] = value
+        self._versions[name] += 1
+        return True
+
+    def get(self, name: str):
+        if name in INPUTS:
+            return self._values[name]
+        deps, fn = DERIVED[name]
+        args = [self.get(d) for d in deps]           # refreshes upstream derived values first
+        stamp = tuple(self._versions[d] for d in deps)
+        if self._seen.get(name) != stamp:
+            value = fn(*args)
+            if name not in self._values or self._values[name] != value:
+                self._versions[name] = self._versions.get(name, 0) + 1
+            self._values[name] = value
+            self._seen[name] = stamp
+            self.recomputed += 1
+        return self._values[name]
+
+    def stale(self) -> list:
+        """Derived values whose inputs changed since they were last computed."""
+        out = []
+        for name, (deps, _) in DERIVED.items():
+            if any(d in out for d in deps) or \
+                    self._seen.get(name) != tuple(self._versions.get(d, 0) for d in deps):
+                out.append(name)
+        return out
+
+    def snapshot(self) -> dict:
+        return {**{k: self._values[k] for k in INPUTS}, **{k: self.get(k) for k in DERIVED}}
+
+
+class PlanPortfolio:
+    """Saved goals sharing portfolio-wide assumptions (inflation, risk profile)."""
+
+    SHARED = ("inflation", "risk_profile")
+
+    def __init__(self, plans=None):
+        self.plans = list(plans or [])
+
+    @classmethod
+    def from_saved_goals(cls, goals) -> "PlanPortfolio":
+        return cls(PlanModel(
+            original_target=g["Original Target (₹)"], years=g["Years"], inflation=g["Inflation (%)"],
+            risk_profile=g["Risk"], **{"return": g["Return (%)"]},
+        ) for g in goals)
+
+    def add(self, plan: PlanModel):
+        self.plans.append(plan)
+
+    def set_assumption(self, name: str, value) -> list:
+        """Apply an assumption to every goal; returns indices of goals it changed."""
+        if name not in self.SHARED:
+            raise KeyError(f"'{name}' is not a shared assumption")
+        return [i for i, plan in enumerate(self.plans) if plan.set(name, value)]
+
+    def refresh(self, names=tuple(DERIVED), indices=None) -> list:
+        """Bring the requested derived values up to date; returns their values per goal."""
+        plans = self.plans if indices is None else [self.plans[i] for i in indices]
+        return [{n: p.get(n) for n in names} for p in plans]
@@ -0,0 +1,115 @@
+# modules/planning.py
+"""
+Headless planning logic shared by the Streamlit app, batch jobs and services.
+Nothing here imports UI libraries.
+"""
+
+from types import MappingProxyType
+
+from modules.goals import Goal, describe_goal_plan, corpus_schedule
+from modules.instrumentation import instrument
+from modules.parser import parse_goal
+from modules.rules import rulebook
+
+# Shared, read-only tables: held once per process and never copied into session state
+GOAL_TYPES = MappingProxyType({
+    "General": MappingProxyType({"icon": "📌", "note": "Flexible goal.", "default_return": 12.0, "amount_hint": "2L, 5L, 10L"}),
+    "Education": MappingProxyType({"icon": "🎓", "note": "Equity-heavy.", "default_return": 11.0, "amount_hint": "15L - 30L"}),
+    "House": MappingProxyType({"icon": "🏠", "note": "Medium/Long term.", "default_return": 10.0, "amount_hint": "40L - 1.5Cr"}),
+    "Marriage": MappingProxyType({"icon": "💍", "note": "5-15 years.", "default_return": 11.0, "amount_hint": "10L - 25L"}),
+    "Vehicle": MappingProxyType({"icon": "🚗", "note": "Shorter term.", "default_return": 9.0, "amount_hint": "8L - 15L"}),
+    "Retirement": MappingProxyType({"icon": "🧓", "note": "Long term.", "default_return": 12.0, "amount_hint": "1Cr - 3Cr"}),
+})
+
+@instrument
+def extract_goal_details(text: str):
+    parsed = parse_goal(text)
+    return parsed.amount, parsed.years, parsed.expected_return
+
+@instrument
+def calculate_sip(target_amount, years, annual_return):
+    r = annual_return / 100.0
+    monthly_rate = r / 12.0
+    months = years * 12
+    if monthly_rate == 0: return target_amount / months
+    sip = target_amount * monthly_rate / ((1 + monthly_rate) ** months - 1)
+    return sip
+
+@instrument
+def sip_growth_schedule(monthly_sip, years, annual_return, monthly=False):
+    values = corpus_schedule(float(monthly_sip), int(years), float(annual_return), monthly)
+    return list(zip(range(1, len(values) + 1), values.tolist()))
+
+@instrument
+def glide_growth_schedule(monthly_sip, years, risk_profile, monthly=False):
+    from modules.glide_path import glide_schedule
+    values = glide_schedule(float(monthly_sip), int(years), risk_profile)
+    if not monthly: values = values[11::12]
+    return list(zip(range(1, len(values) + 1), values.tolist()))
+
+ALLOCATIONS = MappingProxyType({
+    "Aggressive": MappingProxyType({"Equity Funds": 70, "Hybrid / Balanced": 20, "Debt / Liquid": 10}),
+    "Conservative": MappingProxyType({"Equity Funds": 20, "Hybrid / Balanced": 30, "Debt / Liquid": 50}),
+    "Moderate": MappingProxyType({"Equity Funds": 50, "Hybrid / Balanced": 30, "Debt / Liquid": 20}),
+})
+
+@instrument
+def get_allocation_for_profile(profile: str):
+    if not profile: profile = "Moderate"
+    p = profile.lower()
+    if "aggress" in p: return dict(ALLOCATIONS["Aggressive"])
+    if "conserv" in p: return dict(ALLOCATIONS["Conservative"])
+    return dict(ALLOCATIONS["Moderate"])
+
+@instrument
+def risk_heat_label(risk_profile: str, years: int):
+    label, note = rulebook()["risk_heat"].lookup(risk_profile, years)
+    return label, note
+
+@instrument
+def affordability_comment(monthly_sip: float, monthly_income: float):
+    if monthly_income <= 0: return "ℹ️ Add income in Budget Planner to see hints."
+    ratio = monthly_sip / monthly_income
+    if ratio > 0.5: return "🔴 This SIP is > 50% of your income. It may not be affordable."
+    if ratio > 0.3: return "🟠 This SIP is 30–50% of your income. A bit tight."
+    if ratio > 0.15: return "🟡 This SIP is moderate (15–30% of income)."
+    return "🟢 This SIP is under 15% of your income. Affordable."
+
+@instrument
+def generate_insights(lp):
+    return list(rulebook().insights.evaluate(lp))
+
+@instrument
+def get_investment_suggestions(profile: str, goal_type: str, years: int):
+    return [dict(s) for s in rulebook()["suggestions"].lookup(profile, years, goal_type)]
+
+@instrument
+def get_detailed_investment_split(profile: str, years: int):
+    return [dict(s) for s in rulebook()["investment_split"].lookup(profile, years)]
+
+
+def inflate_target(amount: float, inflation: float, years: int) -> float:
+    return amount * ((1 + inflation / 100.0) ** years)
+
+@instrument
+def build_goal_plan(amount, years, expected_return, inflation, goal_type="General", risk_profile=None):
+    """
+    Full plan for one goal, as produced by the Planner chat:
+    returns the plan dict and the describe_goal_plan text.
+    """
+    rp = risk_profile or "Moderate"
+    meta = GOAL_TYPES.get(goal_type, GOAL_TYPES["General"])
+    assumed_return = expected_return if expected_return is not None else meta["default_return"]
+    inflated_target = inflate_target(amount, inflation, years)
+    monthly_sip = calculate_sip(inflated_target, years, assumed_return)
+    # glide_path builds on this module's allocations, so it is imported here
+    from modules.glide_path import glide_sip_required
+    glide_sip = glide_sip_required(inflated_target, years, rp)
+
+    goal = Goal(f"{goal_type} Goal (inflation-adjusted)", inflated_target, years, assumed_return, rp)
+    plan = {
+        "original_target": amount, "inflated_target": inflated_target, "years": years,
+        "inflation": inflation, "return": assumed_return, "sip": monthly_sip, "glide_sip": glide_sip,
+        "risk_profile": rp, "goal_type": goal_type
+    }
+    return plan, describe_goal_plan(goal)
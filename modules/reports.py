@@ -0,0 +1,244 @@
+# modules/reports.py
+"""
+Client report generation: one self-contained HTML file per client with the
+plan summary, allocation pie, detailed split bar and growth chart drawn as
+inline SVG (print to PDF from any browser).
+
+    python -m modules.reports clients.csv reports/ --chunksize 500 --workers 0
+
+Input is the bulk plan input (see modules/bulk.py) plus optional client_id
+and client_name columns, or an already planned file from modules.bulk.
+Reports are written as each chunk finishes and recorded in
+reports/manifest.csv; rerunning skips clients already in the manifest.
+"""
+
+import argparse
+import csv
+import html
+import math
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+from string import Template
+
+import pandas as pd
+
+from modules.bulk import plan_frame, read_chunks
+from modules.goals import corpus_schedule
+from modules.planning import generate_insights, get_allocation_for_profile, get_detailed_investment_split
+
+TEMPLATE_PATH = Path(__file__).parent / "data" / "report_template.html"
+MANIFEST = "manifest.csv"
+PLAN_COLUMNS = ["amount", "years", "inflation", "return", "inflated_target", "sip", "glide_sip", "risk_profile"]
+NOT_ASSESSED = "<p>Complete the risk questionnaire to see an allocation.</p>"
+PALETTE = ("#6C28FE", "#3B82F6", "#10B981", "#F472B6", "#F59E0B", "#64748B")
+
+
+@lru_cache(maxsize=1)
+def report_template() -> Template:
+    return Template(TEMPLATE_PATH.read_text(encoding="utf-8"))
+
+
+def _legend(labels, x, y):
+    return "".join(
+        f'<rect x="{x}" y="{y + i * 20}" width="12" height="12" fill="{PALETTE[i % len(PALETTE)]}"/>'
+        f'<text x="{x + 18}" y="{y + i * 20 + 11}" font-size="12">{html.escape(str(label))}</text>'
+        for i, label in enumerate(labels)
+    )
+
+
+def pie_svg(labels, values, size: int = 180) -> str:
+    """Donut chart with a legend on the right."""
+    total = float(sum(values)) or 1.0
+    c, r = size / 2, size / 2 - 4
+    parts, angle = [], -math.pi / 2
+    for i, value in enumerate(values):
+        if value <= 0:
+            continue
+        sweep = 2 * math.pi * value / total
+        if sweep >= 2 * math.pi - 1e-9:
+            parts.append(f'<circle cx="{c}" cy="{c}" r="{r}" fill="{PALETTE[i % len(PALETTE)]}"/>')
+        else:
+            x0, y0 = c + r * math.cos(angle), c + r * math.sin(angle)
+            angle += sweep
+            x1, y1 = c + r * math.cos(angle), c + r * math.sin(angle)
+            parts.append(f'<path d="M{c},{c} L{x0:.2f},{y0:.2f} A{r},{r} 0 {int(sweep > math.pi)} 1 {x1:.2f},{y1:.2f} Z" '
+                         f'fill="{PALETTE[i % len(PALETTE)]}"/>')
+    parts.append(f'<circle cx="{c}" cy="{c}" r="{r * 0.55:.1f}" fill="#fff"/>')
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" width="{size + 180}" height="{size}" role="img">'
+            f'{"".join(parts)}{_legend(labels, size + 16, 12)}</svg>')
+
+
+def bar_svg(labels, values, width: int = 360, row: int = 26) -> str:
+    """Horizontal percentage bars."""
+    top = max(values, default=0) or 1
+    label_w, bar_w = 110, width - 160
+    parts = []
+    for i, (label, value) in enumerate(zip(labels, values)):
+        y = i * row
+        w = bar_w * value / top
+        parts.append(
+            f'<text x="0" y="{y + 16}" font-size="12">{html.escape(str(label))}</text>'
+            f'<rect x="{label_w}" y="{y + 4}" width="{w:.1f}" height="16" rx="3" fill="{PALETTE[i % len(PALETTE)]}"/>'
+            f'<text x="{label_w + w + 6:.1f}" y="{y + 16}" font-size="12">{value:g}%</text>'
+        )
+    return f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{len(values) * row}" role="img">{"".join(parts)}</svg>'
+
+
+def line_svg(values, target: float | None = None, width: int = 760, height: int = 220) -> str:
+    """Corpus by year, with an optional dashed target line."""
+    pad_l, pad_b = 70, 24
+    top = max(max(values, default=0), target or 0) or 1
+    n = len(values)
+    xs = [pad_l + (width - pad_l - 10) * (i + 1) / n for i in range(n)]
+    ys = [(height - pad_b) * (1 - v / top) + 4 for v in values]
+    points = " ".join(f"{x:.1f},{y:.1f}" for x, y in zip([pad_l, *xs], [height - pad_b + 4, *ys]))
+    parts = [
+        f'<line x1="{pad_l}" y1="{height - pad_b + 4}" x2="{width - 10}" y2="{height - pad_b + 4}" stroke="#cbd5e1"/>',
+        f'<polyline points="{points}" fill="none" stroke="#6C28FE" stroke-width="2.5"/>',
+        f'<text x="0" y="14" font-size="11">₹{top:,.0f}</text>',
+        f'<text x="{width - 60}" y="{height}" font-size="11">Year {n}</text>',
+    ]
+    if target:
+        y = (height - pad_b) * (1 - target / top) + 4
+        parts.append(f'<line x1="{pad_l}" y1="{y:.1f}" x2="{width - 10}" y2="{y:.1f}" stroke="#10B981" stroke-dasharray="6 4"/>'
+                     f'<text x="{pad_l + 4}" y="{y - 4:.1f}" font-size="11" fill="#10B981">Target</text>')
+    return f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height + 4}" role="img">{"".join(parts)}</svg>'
+
+
+# Allocation charts depend only on the profile (and horizon), so each is drawn once per process
+@lru_cache(maxsize=16)
+def allocation_pie(profile: str) -> str:
+    alloc = get_allocation_for_profile(profile)
+    return pie_svg(list(alloc), list(alloc.values()))
+
+
+@lru_cache(maxsize=64)
+def split_bar(profile: str, years: int) -> str:
+    split = get_detailed_investment_split(profile, years)
+    return bar_svg([s["Bucket"] for s in split], [s["Percent"] for s in split])
+
+
+def render_report(plan: dict, client_id: str, client_name: str | None = None) -> str:
+    """HTML report for one planned row (plan_frame output as a dict)."""
+    years = int(plan["years"])
+    goal_type = plan.get("goal_type") or "General"
+    profile = plan["risk_profile"]
+    # No profile when a questionnaire answer was missing: show no allocation rather than guess one
+    assessed = profile is not None and not pd.isna(profile)
+    summary = [
+        ("Goal", f"{goal_type} goal"),
+        ("Target today", f"₹{plan['amount']:,.0f}"),
+        (f"Target in {years} years (at {plan['inflation']:g}% inflation)", f"₹{plan['inflated_target']:,.0f}"),
+        ("Assumed return", f"{plan['return']:.1f}% p.a."),
+        ("Monthly SIP required", f"₹{plan['sip']:,.0f}"),
+        ("Monthly SIP on the glide path", f"₹{plan['glide_sip']:,.0f}" if assessed else "—"),
+        ("Risk profile", profile if assessed else "Not assessed (incomplete questionnaire)"),
+    ]
+    insights = generate_insights({"years": years, "return": plan["return"], "inflation": plan["inflation"]})
+    growth = corpus_schedule(float(plan["sip"]), years, float(plan["return"]))
+    # Names read from CSV are NaN (or blank) when missing
+    missing = client_name is None or pd.isna(client_name) or not str(client_name).strip()
+    name = f"Client {client_id}" if missing else str(client_name)
+    return report_template().substitute(
+        title=html.escape(f"Goal plan for {name}"),
+        subtitle=html.escape(f"Client ID {client_id}"),
+        summary_rows="\n".join(f"<tr><td>{html.escape(k)}</td><td>{html.escape(str(v))}</td></tr>" for k, v in summary),
+        pie=allocation_pie(profile) if assessed else NOT_ASSESSED,
+        bar=split_bar(profile, years) if assessed else NOT_ASSESSED,
+        growth=line_svg(growth.tolist(), plan["inflated_target"]),
+        insights="\n".join(f"<li>{html.escape(i)}</li>" for i in insights),
+        generated=date.today().isoformat(),
+    )
+
+
+def _file_name(client_id) -> str:
+    return re.sub(r"[^\w.-]", "_", str(client_id)) + ".html"
+
+
+def render_chunk(df: pd.DataFrame, out_dir) -> list:
+    """Plan (if needed) and render every row; returns manifest rows (client_id, file)."""
+    out_dir = Path(out_dir)
+    if any(c not in df.columns for c in PLAN_COLUMNS):
+        df = plan_frame(df)
+    done = []
+    for row in df.to_dict("records"):
+        client_id = str(row["client_id"])
+        path = out_dir / _file_name(client_id)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(render_report(row, client_id, row.get("client_name")), encoding="utf-8")
+        os.replace(tmp, path)
+        done.append((client_id, path.name))
+    return done
+
+
+def _pending_chunks(input_path, chunksize, completed):
+    for chunk in read_chunks(input_path, chunksize):
+        if "client_id" not in chunk.columns:
+            chunk = chunk.assign(client_id=chunk.index)
+        chunk = chunk[~chunk["client_id"].astype(str).isin(completed)]
+        if len(chunk):
+            yield chunk
+
+
+def run(input_path, out_dir, chunksize=500, workers=1) -> tuple:
+    """
+    Render reports for every client not yet in the manifest. Returns
+    (rendered now, skipped as already done).
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest = out_dir / MANIFEST
+    new_manifest = not manifest.exists() or manifest.stat().st_size == 0
+    completed = set()
+    if not new_manifest:
+        with open(manifest, newline="", encoding="utf-8") as f:
+            completed = {r["client_id"] for r in csv.DictReader(f)}
+
+    chunks = _pending_chunks(input_path, chunksize, completed)
+    rendered = 0
+    with open(manifest, "a", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        if new_manifest:
+            writer.writerow(["client_id", "file"])
+        for rows in _results(chunks, out_dir, workers):
+            writer.writerows(rows)
+            f.flush()
+            rendered += len(rows)
+    return rendered, len(completed)
+
+
+def _results(chunks, out_dir, workers):
+    """Rendered chunks as they finish; at most 2 * workers in flight."""
+    if workers <= 1:
+        for chunk in chunks:
+            yield render_chunk(chunk, out_dir)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = []
+        for chunk in chunks:
+            pending.append(pool.submit(render_chunk, chunk, out_dir))
+            if len(pending) >= 2 * workers:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Render HTML client reports from a CSV/Parquet of goals.")
+    ap.add_argument("input", help="bulk plan input (or output) file with an optional client_id column")
+    ap.add_argument("out_dir", help="directory for the reports and manifest.csv")
+    ap.add_argument("--chunksize", type=int, default=500, help="clients per work unit (default 500)")
+    ap.add_argument("--workers", type=int, default=1, help="worker processes; 0 = all cores (default 1)")
+    args = ap.parse_args(argv)
+
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    rendered, skipped = run(args.input, args.out_dir, args.chunksize, workers)
+    print(f"Rendered {rendered:,} reports into {args.out_dir} ({skipped:,} already done)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,48 @@
 # modules/risk_profile.py
+"""
+Risk questionnaire: the interactive prompt, the answer schema, and
+non-interactive ingestion of response files for server/batch use.
+
+    python -m modules.risk_profile responses.csv profiles.csv --invalid rejected.csv
+"""
+
+import argparse
+import csv
+import json
+from itertools import islice
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+RISK_LABELS = np.array(["Conservative", "Moderate", "Aggressive"])
+# Column carrying why a record could not be read (bad JSON, not an object); such rows are reported as invalid
+PARSE_ERROR = "_parse_error"
+
+
+class Question(NamedTuple):
+    key: str
+    prompt: str
+    kind: str            # "number" (non-negative) or "scale" (whole number 1-5)
+
+
+QUESTIONS = (
+    Question("age", "How old are you?", "number"),
+    Question("income_stability", "How stable is your income? (1 = unstable, 5 = very stable)", "scale"),
+    Question("horizon_years", "How long do you want to stay invested? (years)", "number"),
+    Question("crash_reaction", "How do you react to market crashes? (1 = panic, 5 = stay calm)", "scale"),
+    Question("experience", "How much investment experience do you have? (1 = none, 5 = expert)", "scale"),
+    Question("dip_behavior", "If your portfolio dropped 10%, what would you do? (1 = sell, 5 = buy more)", "scale"),
+)
+
+
+class InvalidResponse(NamedTuple):
+    row: int
+    errors: list
+
 
 def ask_risk_questions():
-    questions = [
-        ("How old are you?", "number"),
-        ("How stable is your income? (1 = unstable, 5 = very stable)", "scale"),
-        ("How long do you want to stay invested? (years)", "number"),
-        ("How do you react to market crashes? (1 = panic, 5 = stay calm)", "scale"),
-        ("How much investment experience do you have? (1 = none, 5 = expert)", "scale"),
-        ("If your portfolio dropped 10%, what would you do? (1 = sell, 5 = buy more)", "scale"),
-    ]
+    questions = [(q.prompt, q.kind) for q in QUESTIONS]
 
     answers = []
     for q, qtype in questions:
@@ -36,10 +70,165 @@ def calculate_risk_profile(answers):
         return "Aggressive"
 
 
+def calculate_risk_profile_batch(answers) -> np.ndarray:
+    """
+    Vectorized calculate_risk_profile: `answers` is an (n, 6) array-like,
+    one row of questionnaire answers per client. Rows with a missing
+    (NaN) answer get None rather than a label.
+    """
+    total = np.asarray(answers, dtype=float).sum(axis=1)
+    labels = RISK_LABELS[np.searchsorted([15, 22], np.nan_to_num(total), side="right")].astype(object)
+    return np.where(np.isfinite(total), labels, None)
+
+
 def get_risk_profile():
     print("\n--- RISK PROFILE TEST ---")
     answers = ask_risk_questions()
     profile = calculate_risk_profile(answers)
 
     print("\nYour risk profile is:", profile)
-    return profile
\ No newline at end of file
+    return profile
+
+
+def _invalid_mask(kind: str, values: np.ndarray) -> np.ndarray:
+    """True where a (float, NaN for missing/non-numeric) answer breaks its question's rule."""
+    with np.errstate(invalid="ignore"):
+        if kind == "scale":
+            return ~((values >= 1) & (values <= 5) & (values == np.round(values)))
+        return ~(np.isfinite(values) & (values >= 0))
+
+
+def _describe_error(q: Question, raw) -> str:
+    if raw is None or raw == "" or (isinstance(raw, float) and np.isnan(raw)):
+        return f"{q.key}: missing"
+    expected = "a whole number 1-5" if q.kind == "scale" else "a non-negative number"
+    return f"{q.key}: expected {expected}, got {raw!r}"
+
+
+def validate_frame(df):
+    """
+    Validate a DataFrame of raw responses against QUESTIONS. Returns
+    (valid rows with numeric answer columns, list of InvalidResponse).
+    The frame's index is used as the row number.
+    """
+    import pandas as pd
+    unparsed = (df[PARSE_ERROR].notna().to_numpy() if PARSE_ERROR in df.columns
+                else np.zeros(len(df), dtype=bool))
+    bad = unparsed.copy()
+    columns, masks = {}, []
+    for q in QUESTIONS:
+        raw = df[q.key] if q.key in df.columns else pd.Series(np.nan, index=df.index)
+        values = pd.to_numeric(raw, errors="coerce").to_numpy(dtype=float)
+        mask = _invalid_mask(q.kind, values)
+        columns[q.key], bad = values, bad | mask
+        masks.append(mask)
+
+    invalid = []
+    for i in np.flatnonzero(bad):
+        if unparsed[i]:
+            errors = [df[PARSE_ERROR].iat[i]]
+        else:
+            errors = [_describe_error(q, df[q.key].iat[i] if q.key in df.columns else None)
+                      for q, mask in zip(QUESTIONS, masks) if mask[i]]
+        invalid.append(InvalidResponse(int(df.index[i]), errors))
+
+    valid = df.loc[~bad].drop(columns=PARSE_ERROR, errors="ignore")
+    for key, values in columns.items():
+        valid[key] = values[~bad]
+    return valid, invalid
+
+
+def validate_response(record: dict) -> dict:
+    """Validate one response; returns the numeric answers or raises ValueError listing every problem."""
+    answers, errors = {}, []
+    for q in QUESTIONS:
+        raw = record.get(q.key)
+        try:
+            value = float(raw)
+        except (TypeError, ValueError):
+            value = float("nan")
+        if _invalid_mask(q.kind, np.float64(value)):
+            errors.append(_describe_error(q, raw))
+        answers[q.key] = value
+    if errors:
+        raise ValueError("; ".join(errors))
+    return answers
+
+
+def _parse_line(line: str):
+    """One JSON-lines record; a line that is not valid JSON becomes a parse-error record."""
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        return {PARSE_ERROR: f"invalid JSON: {e}"}
+
+
+def read_responses(source, batch_size: int = 50_000):
+    """
+    Yield DataFrames of raw responses, numbered by input row. `source` is a
+    CSV or JSON-lines path, or any iterable of dicts. Lines that are not
+    valid JSON objects keep their row number and carry a PARSE_ERROR.
+    """
+    import pandas as pd
+    start = 0
+    if isinstance(source, (str, Path)) and Path(source).suffix.lower() == ".csv":
+        for chunk in pd.read_csv(source, chunksize=batch_size, dtype=str):
+            yield chunk
+        return
+    if isinstance(source, (str, Path)):
+        with open(source, encoding="utf-8") as f:
+            yield from read_responses((_parse_line(line) for line in f if line.strip()), batch_size)
+        return
+    records = (r if isinstance(r, dict) else {PARSE_ERROR: f"expected an object, got {type(r).__name__}"}
+               for r in source)
+    while batch := list(islice(records, batch_size)):
+        yield pd.DataFrame.from_records(batch, index=pd.RangeIndex(start, start + len(batch)))
+        start += len(batch)
+
+
+def profile_responses(source, batch_size: int = 50_000, scorer=None):
+    """
+    Stream questionnaire responses into the risk scorer. Yields
+    (scored DataFrame, invalid responses) per batch; invalid rows are
+    reported and skipped without stopping the stream.
+    """
+    if scorer is None:
+        from modules.risk_scoring import default_scorer
+        scorer = default_scorer()
+    for chunk in read_responses(source, batch_size):
+        valid, invalid = validate_frame(chunk)
+        yield scorer.score_frame(valid), invalid
+
+
+def write_invalid(invalid, path):
+    with open(path, "a", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        for row in invalid:
+            writer.writerow([row.row, "; ".join(row.errors)])
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Score a CSV / JSON-lines file of questionnaire responses.")
+    ap.add_argument("input")
+    ap.add_argument("output", help="CSV of valid responses with risk_score and risk_profile")
+    ap.add_argument("--invalid", help="CSV of rejected rows (row, errors); default: only count them")
+    ap.add_argument("--batch-size", type=int, default=50_000)
+    args = ap.parse_args(argv)
+
+    Path(args.output).unlink(missing_ok=True)
+    if args.invalid:
+        Path(args.invalid).unlink(missing_ok=True)
+    scored = rejected = 0
+    wrote_header = False
+    for frame, invalid in profile_responses(args.input, args.batch_size):
+        frame.to_csv(args.output, mode="a", header=not wrote_header, index_label="row")
+        wrote_header = True
+        if args.invalid and invalid:
+            write_invalid(invalid, args.invalid)
+        scored += len(frame)
+        rejected += len(invalid)
+    print(f"Scored {scored:,} responses, rejected {rejected:,}")
+
+
+if __name__ == "__main__":
+    main()
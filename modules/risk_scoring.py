@@ -0,0 +1,82 @@
+# modules/risk_scoring.py
+"""
+Configurable risk scoring. Each questionnaire answer is mapped to points
+(age through bands, the rest through a scale factor), weighted and summed;
+the total is cut into labels by thresholds. The bundled config
+(modules/data/risk_scoring.json) reproduces calculate_risk_profile and the
+Planner's answer construction exactly. Set ROBO_RISK_CONFIG to use another.
+"""
+
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+DEFAULT_CONFIG = Path(__file__).parent / "data" / "risk_scoring.json"
+
+
+class RiskScorer:
+    def __init__(self, config: dict):
+        self.questions = list(config["questions"])
+        self._rules = config["questions"]
+        self.weights = np.array([q.get("weight", 1.0) for q in self._rules.values()])
+        self.thresholds = np.asarray(config["thresholds"], dtype=float)
+        self.labels = np.asarray(config["labels"])
+        if len(self.labels) != len(self.thresholds) + 1:
+            raise ValueError("Risk config needs exactly one more label than thresholds")
+
+    @classmethod
+    def from_file(cls, path) -> "RiskScorer":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def points(self, answers) -> np.ndarray:
+        """
+        Per-question points for a mapping of question -> array of raw answers
+        (a DataFrame works). Returns an (n, questions) array.
+        """
+        cols = []
+        for name, rule in self._rules.items():
+            raw = np.asarray(answers[name], dtype=float)
+            if "bands" in rule:
+                bands = rule["bands"]
+                scores = np.asarray(bands["scores"], dtype=float)
+                cols.append(scores[np.searchsorted(bands["upper"], raw, side="right")])
+            else:
+                cols.append(raw * rule.get("scale", 1.0))
+        return np.column_stack(cols)
+
+    def score(self, answers) -> np.ndarray:
+        """Continuous weighted score per record."""
+        return self.points(answers) @ self.weights
+
+    def label(self, scores) -> np.ndarray:
+        """Label per score; None where the score is NaN (an answer was missing), never the top band."""
+        scores = np.asarray(scores, dtype=float)
+        labels = self.labels[np.searchsorted(self.thresholds, np.nan_to_num(scores), side="right")].astype(object)
+        return np.where(np.isfinite(scores), labels, None)
+
+    def score_frame(self, df):
+        """Score a DataFrame of questionnaire responses in one pass: adds risk_score and risk_profile."""
+        scores = self.score(df)
+        out = df.copy()
+        out["risk_score"] = scores
+        out["risk_profile"] = self.label(scores)
+        return out
+
+    def profile_for(self, **answers) -> tuple:
+        """(label, score) for a single respondent's answers given as keywords."""
+        score = float(self.score({k: [v] for k, v in answers.items()})[0])
+        label = self.label([score])[0]
+        return (None if label is None else str(label)), score
+
+
+@lru_cache(maxsize=4)
+def _load(path: str) -> RiskScorer:
+    return RiskScorer.from_file(path)
+
+
+def default_scorer() -> RiskScorer:
+    return _load(os.environ.get("ROBO_RISK_CONFIG", str(DEFAULT_CONFIG)))
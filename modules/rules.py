@@ -0,0 +1,192 @@
+# modules/rules.py
+"""
+Declarative planning rules (modules/data/rules.json) compiled into lookup
+tables.
+
+Profile and goal-type strings are reduced to a bitmask of the keywords they
+contain (e.g. "aggress"), once per distinct string. Each table's rules only
+look at those masks and a horizon bucket, so at load time every
+(profile mask, goal mask, horizon) combination is resolved to its output and
+stored in a flat index; a lookup is a few cached calls and one list index.
+"first" tables return the first matching rule's output, "all" tables
+concatenate every match. Insights compare numeric fields against thresholds
+and are keyed by the set of rules that fired.
+"""
+
+import json
+import operator
+from bisect import bisect_left
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+RULES_PATH = Path(__file__).parent / "data" / "rules.json"
+
+_OPS = {"<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge, "==": operator.eq}
+
+
+def _as_list(value) -> list:
+    return value if isinstance(value, list) else [value]
+
+
+class KeywordMasker:
+    """Lower-cased substring matching of a string against a keyword list, as a bitmask."""
+
+    def __init__(self, keywords, default: str):
+        self.keywords = tuple(keywords)
+        self.default = default
+        self.mask = lru_cache(maxsize=1024)(self._mask)
+
+    def _mask(self, value) -> int:
+        text = (value or self.default).lower()
+        return sum(1 << i for i, k in enumerate(self.keywords) if k in text)
+
+    def bits(self, keywords) -> int:
+        return sum(1 << self.keywords.index(k) for k in _as_list(keywords))
+
+    def mask_array(self, values) -> np.ndarray:
+        import pandas as pd
+        codes, uniques = pd.factorize(pd.Series(values, dtype=object), use_na_sentinel=False)
+        masks = np.array([self.mask(None if pd.isna(u) else u) for u in uniques], dtype=np.int64)
+        return masks[codes]
+
+    @property
+    def size(self) -> int:
+        return 1 << len(self.keywords)
+
+
+class RuleTable:
+    """Rules on profile / goal type / horizon, resolved ahead of time for every combination."""
+
+    def __init__(self, spec: dict, profiles: KeywordMasker, goal_types: KeywordMasker):
+        self.profiles, self.goal_types = profiles, goal_types
+        self.upper = list(spec["horizon"]["upper"])
+        names = spec["horizon"]["names"]
+        rules = [self._compile(r.get("when", {}), names) + (r["then"],) for r in spec["rules"]]
+        first = spec["match"] == "first"
+
+        self._index = []
+        for p in range(profiles.size):
+            for g in range(goal_types.size):
+                for h in range(len(names)):
+                    hits = [then for pbits, gbits, hset, then in rules
+                            if (not pbits or p & pbits) and (not gbits or g & gbits) and h in hset]
+                    if first:
+                        self._index.append(hits[0] if hits else None)
+                    else:
+                        self._index.append([item for then in hits for item in then])
+        self._horizons = len(names)
+
+    def _compile(self, when: dict, names) -> tuple:
+        pbits = self.profiles.bits(when["profile"]) if "profile" in when else 0
+        gbits = self.goal_types.bits(when["goal_type"]) if "goal_type" in when else 0
+        hset = {names.index(h) for h in _as_list(when["horizon"])} if "horizon" in when else set(range(len(names)))
+        return pbits, gbits, hset
+
+    def _key(self, pmask, gmask, h):
+        return (pmask * self.goal_types.size + gmask) * self._horizons + h
+
+    def lookup(self, profile, years, goal_type=None):
+        """Output for one goal. Shared with every other lookup, so copy before mutating."""
+        return self._index[self._key(self.profiles.mask(profile), self.goal_types.mask(goal_type),
+                                     bisect_left(self.upper, years))]
+
+    def lookup_array(self, profiles, years, goal_types=None) -> np.ndarray:
+        """Outputs for many goals at once, as an object array."""
+        pmask = self.profiles.mask_array(profiles)
+        gmask = self.goal_types.mask_array([None] * len(pmask) if goal_types is None else goal_types)
+        return self.outputs()[self.keys(pmask, gmask, years)]
+
+    def keys(self, pmask, gmask, years) -> np.ndarray:
+        """Index positions for precomputed masks (see KeywordMasker.mask_array)."""
+        return self._key(pmask, gmask, np.searchsorted(self.upper, np.asarray(years, dtype=float), side="left"))
+
+    def outputs(self, column: int | None = None) -> np.ndarray:
+        """The compiled index as an object array (or one element of each output)."""
+        index = np.empty(len(self._index), dtype=object)
+        index[:] = self._index if column is None else [o[column] for o in self._index]
+        return index
+
+
+class ThresholdRules:
+    """Rules comparing numeric fields to thresholds; outputs keyed by which rules fired."""
+
+    def __init__(self, spec: dict):
+        self.rules = [([(field, _OPS[op], value) for field, (op, value) in r["when"].items()], r["then"])
+                      for r in spec["rules"]]
+        self.fallback = list(spec.get("fallback", []))
+        self._outputs = {}
+
+    def _output(self, fired: int) -> list:
+        out = self._outputs.get(fired)
+        if out is None:
+            out = [then for i, (_, then) in enumerate(self.rules) if fired >> i & 1] or self.fallback
+            self._outputs[fired] = out
+        return out
+
+    def evaluate(self, values: dict) -> list:
+        fired = 0
+        for i, (conds, _) in enumerate(self.rules):
+            if all(op(values[field], value) for field, op, value in conds):
+                fired |= 1 << i
+        return self._output(fired)
+
+    def evaluate_frame(self, df) -> np.ndarray:
+        fired = np.zeros(len(df), dtype=np.int64)
+        for i, (conds, _) in enumerate(self.rules):
+            hit = np.ones(len(df), dtype=bool)
+            for field, op, value in conds:
+                hit &= op(df[field].to_numpy(dtype=float), value)
+            fired |= hit.astype(np.int64) << i
+        unique, inverse = np.unique(fired, return_inverse=True)
+        outputs = np.empty(len(unique), dtype=object)
+        outputs[:] = [self._output(int(f)) for f in unique]
+        return outputs[inverse]
+
+
+class RuleBook:
+    def __init__(self, config: dict):
+        keywords, defaults = config["keywords"], config["defaults"]
+        self.profiles = KeywordMasker(keywords["profile"], defaults["profile"])
+        self.goal_types = KeywordMasker(keywords["goal_type"], defaults["goal_type"])
+        self.tables = {name: RuleTable(spec, self.profiles, self.goal_types) for name, spec in config["tables"].items()}
+        self.insights = ThresholdRules(config["insights"])
+
+    def __getitem__(self, name) -> RuleTable:
+        return self.tables[name]
+
+
+@lru_cache(maxsize=1)
+def rulebook() -> RuleBook:
+    with open(RULES_PATH, encoding="utf-8") as f:
+        return RuleBook(json.load(f))
+
+
+def apply_rules(df: "pd.DataFrame", profile_col="risk_profile", years_col="years", goal_type_col="goal_type",
+                return_col="return", inflation_col="inflation") -> "pd.DataFrame":
+    """
+    Evaluate every rule table for a DataFrame of goals in one pass. Missing
+    goal-type column means "General"; insights are added when the return and
+    inflation columns are present. Cell values are shared between rows with
+    the same outcome.
+    """
+    import pandas as pd
+    book = rulebook()
+    years = df[years_col].to_numpy(dtype=float)
+    pmask = book.profiles.mask_array(df[profile_col].to_numpy(dtype=object))
+    gmask = (book.goal_types.mask_array(df[goal_type_col].to_numpy(dtype=object)) if goal_type_col in df.columns
+             else np.full(len(df), book.goal_types.mask(None), dtype=np.int64))
+
+    heat, split, suggestions = book["risk_heat"], book["investment_split"], book["suggestions"]
+    heat_keys = heat.keys(pmask, gmask, years)
+    out = pd.DataFrame(index=df.index)
+    out["risk_heat"] = heat.outputs(0)[heat_keys]
+    out["risk_heat_note"] = heat.outputs(1)[heat_keys]
+    out["investment_split"] = split.outputs()[split.keys(pmask, gmask, years)]
+    out["suggestions"] = suggestions.outputs()[suggestions.keys(pmask, gmask, years)]
+    if return_col in df.columns and inflation_col in df.columns:
+        values = pd.DataFrame({"years": years, "return": df[return_col].to_numpy(dtype=float),
+                               "inflation": df[inflation_col].to_numpy(dtype=float)})
+        out["insights"] = book.insights.evaluate_frame(values)
+    return out
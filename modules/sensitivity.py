@@ -0,0 +1,169 @@
+# modules/sensitivity.py
+"""
+Scenario sweeps and sensitivity metrics.
+
+A SweepGrid is the Cartesian product of inflation x return x horizon x
+step-up values. sweep() evaluates it for one or many goals (target in
+today's money plus the SIP currently planned), yielding results chunk by
+chunk: each chunk maps a flat scenario range back to grid coordinates with
+unravel_index, so nothing of size goals x grid is ever materialized.
+Chunks can be spread over a process pool.
+
+tornado() moves one assumption at a time between its low and high value and
+reports the swing in required SIP and terminal corpus, plus elasticities at
+the base point.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from modules.cashflows import future_value, required_sip
+
+AXES = ("inflation", "return", "years", "step_up")
+
+
+@dataclass(frozen=True)
+class SweepGrid:
+    inflation: tuple
+    annual_return: tuple
+    years: tuple
+    step_up: tuple = (0.0,)
+
+    @classmethod
+    def from_ranges(cls, inflation, annual_return, years, step_up=(0.0,)) -> "SweepGrid":
+        return cls(*(tuple(np.atleast_1d(np.asarray(v, dtype=float)).tolist())
+                     for v in (inflation, annual_return, years, step_up)))
+
+    @property
+    def axes(self) -> tuple:
+        return self.inflation, self.annual_return, self.years, self.step_up
+
+    @property
+    def shape(self) -> tuple:
+        return tuple(len(a) for a in self.axes)
+
+    @property
+    def size(self) -> int:
+        return int(np.prod(self.shape))
+
+
+def _evaluate(amount, base_sip, grid: SweepGrid, start: int, stop: int) -> dict:
+    """Scenarios start..stop of the flattened (goals, *grid.shape) space."""
+    flat = np.arange(start, stop)
+    goal, i_infl, i_ret, i_years, i_step = np.unravel_index(flat, (len(amount), *grid.shape))
+    inflation = np.asarray(grid.inflation)[i_infl]
+    ret = np.asarray(grid.annual_return)[i_ret]
+    years = np.asarray(grid.years)[i_years]
+    step_up = np.asarray(grid.step_up)[i_step]
+
+    target = amount[goal] * np.power(1 + inflation / 100, years)
+    corpus = future_value(base_sip[goal], years, ret, step_up)
+    return {
+        "goal": goal, "inflation": inflation, "return": ret, "years": years, "step_up": step_up,
+        "inflated_target": target,
+        "sip": required_sip(target, years, ret, step_up),
+        "corpus": corpus,
+        "funded": corpus / target,
+    }
+
+
+def sweep(amount, base_sip, grid: SweepGrid, chunk_size: int = 1_000_000, workers: int | None = None,
+          as_frame: bool = False):
+    """
+    Yield results for every goal x scenario, chunk_size rows at a time, in
+    order. Each chunk is a dict of arrays (or a DataFrame with as_frame).
+    workers > 1 evaluates chunks in a process pool with at most 2 * workers
+    in flight; workers=0 uses every core.
+    """
+    amount = np.atleast_1d(np.asarray(amount, dtype=float))
+    base_sip = np.broadcast_to(np.asarray(base_sip, dtype=float), amount.shape).copy()
+    total = len(amount) * grid.size
+    bounds = [(s, min(s + chunk_size, total)) for s in range(0, total, chunk_size)]
+    workers = (os.cpu_count() or 1) if workers == 0 else (workers or 1)
+    wrap = pd.DataFrame if as_frame else (lambda d: d)
+
+    if workers <= 1 or len(bounds) == 1:
+        for start, stop in bounds:
+            yield wrap(_evaluate(amount, base_sip, grid, start, stop))
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = []
+        for start, stop in bounds:
+            pending.append(pool.submit(_evaluate, amount, base_sip, grid, start, stop))
+            if len(pending) >= 2 * workers:
+                yield wrap(pending.pop(0).result())
+        for future in pending:
+            yield wrap(future.result())
+
+
+def sweep_summary(amount, base_sip, grid: SweepGrid, **kwargs) -> pd.DataFrame:
+    """
+    Per-goal reduction of a full sweep, accumulated chunk by chunk:
+    SIP range and mean, and the share of scenarios the current SIP funds.
+    """
+    goals = len(np.atleast_1d(amount))
+    sip_min = np.full(goals, np.inf)
+    sip_max = np.full(goals, -np.inf)
+    sip_sum = np.zeros(goals)
+    funded = np.zeros(goals)
+    for chunk in sweep(amount, base_sip, grid, **kwargs):
+        g = chunk["goal"]
+        np.minimum.at(sip_min, g, chunk["sip"])
+        np.maximum.at(sip_max, g, chunk["sip"])
+        sip_sum += np.bincount(g, weights=chunk["sip"], minlength=goals)
+        funded += np.bincount(g, weights=chunk["funded"] >= 1, minlength=goals)
+    return pd.DataFrame({
+        "sip_min": sip_min, "sip_mean": sip_sum / grid.size, "sip_max": sip_max,
+        "funded_share": funded / grid.size,
+    })
+
+
+def _metrics(amount, base_sip, inflation, ret, years, step_up):
+    target = amount * np.power(1 + inflation / 100, years)
+    return required_sip(target, years, ret, step_up), future_value(base_sip, years, ret, step_up)
+
+
+def tornado(amount, base_sip, base: dict, ranges: dict, rel_step: float = 0.01) -> pd.DataFrame:
+    """
+    One-at-a-time sensitivity for one or many goals.
+
+    base maps every name in AXES to its base value; ranges maps the axes to
+    vary to (low, high). Returns one row per (goal, axis) with SIP and corpus
+    at low / high, their swing, and elasticities (% change in the metric per
+    1% change in the assumption, NaN where the base value is 0). Rows are
+    sorted by SIP swing within each goal, as drawn in a tornado chart.
+    """
+    missing = set(AXES) - set(base)
+    if missing:
+        raise ValueError(f"Missing base values: {', '.join(sorted(missing))}")
+    amount = np.atleast_1d(np.asarray(amount, dtype=float))
+    base_sip = np.broadcast_to(np.asarray(base_sip, dtype=float), amount.shape)
+    sip0, corpus0 = _metrics(amount, base_sip, *(base[a] for a in AXES))
+
+    rows = []
+    for axis, (low, high) in ranges.items():
+        if axis not in AXES:
+            raise KeyError(f"'{axis}' is not a sweep axis")
+        at = lambda value: _metrics(amount, base_sip, *(value if a == axis else base[a] for a in AXES))
+        sip_lo, corpus_lo = at(low)
+        sip_hi, corpus_hi = at(high)
+        x0 = base[axis]
+        if x0:
+            sip_up, corpus_up = at(x0 * (1 + rel_step))
+            sip_dn, corpus_dn = at(x0 * (1 - rel_step))
+            sip_el = (sip_up - sip_dn) / (2 * rel_step * sip0)
+            corpus_el = (corpus_up - corpus_dn) / (2 * rel_step * corpus0)
+        else:
+            sip_el = corpus_el = np.full(amount.shape, np.nan)
+        rows.append(pd.DataFrame({
+            "goal": np.arange(len(amount)), "axis": axis, "low": low, "high": high,
+            "sip_low": sip_lo, "sip_high": sip_hi, "sip_swing": np.abs(sip_hi - sip_lo),
+            "corpus_low": corpus_lo, "corpus_high": corpus_hi, "corpus_swing": np.abs(corpus_hi - corpus_lo),
+            "sip_elasticity": sip_el, "corpus_elasticity": corpus_el,
+        }))
+    out = pd.concat(rows, ignore_index=True)
+    return out.sort_values(["goal", "sip_swing"], ascending=[True, False], ignore_index=True)
@@ -0,0 +1,207 @@
+# modules/session.py
+"""
+Per-session memory controls for the Streamlit deployment: chat history that
+keeps only recent messages in memory and spills older ones to disk, a rough
+per-session memory budget, and a process-wide registry that holds each
+session's rebuildable state, sheds it when the session goes idle and
+deletes the spill files of sessions that never come back.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+DEFAULT_SPILL_DIR = os.environ.get("ROBO_SESSION_DIR", os.path.join(os.getcwd(), ".sessions"))
+# State that can be rebuilt (goals reload from the goal store), dropped first under pressure
+DROPPABLE = ("plan_portfolio", "goals")
+
+
+def deep_sizeof(obj, _seen=None) -> int:
+    """Approximate bytes held by obj and the containers/objects it references."""
+    seen = _seen if _seen is not None else set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        size += sum(deep_sizeof(v, seen) for v in obj)
+    elif hasattr(obj, "memory_bytes"):
+        size += obj.memory_bytes()
+    return size
+
+
+class ChatHistory:
+    """
+    Append-only chat log. The newest `max_in_memory` messages stay in memory,
+    older ones are appended to a JSONL file and can be read back on demand.
+    Iterating yields only the in-memory messages.
+    """
+
+    def __init__(self, path, max_in_memory: int = 50):
+        self.path = Path(path)
+        self.max_in_memory = max_in_memory
+        self._recent = deque()
+        self._spilled = 0
+        self._lock = threading.Lock()
+
+    def append(self, message: dict):
+        with self._lock:
+            self._recent.append(message)
+            if len(self._recent) > self.max_in_memory:
+                self._spill(len(self._recent) - self.max_in_memory)
+
+    def _spill(self, count: int):
+        if count <= 0:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            for _ in range(count):
+                f.write(json.dumps(self._recent.popleft(), ensure_ascii=False) + "\n")
+        self._spilled += count
+
+    def spill(self, keep: int = 0):
+        """Move all but the newest `keep` messages to disk."""
+        with self._lock:
+            self._spill(len(self._recent) - keep)
+
+    def older(self, limit: int = 50) -> list:
+        """The most recent `limit` spilled messages, oldest first."""
+        if not self._spilled or not self.path.exists():
+            return []
+        with open(self.path, encoding="utf-8") as f:
+            tail = deque(f, maxlen=limit)
+        return [json.loads(line) for line in tail]
+
+    @property
+    def spilled_count(self) -> int:
+        return self._spilled
+
+    def memory_bytes(self) -> int:
+        return sum(deep_sizeof(m) for m in list(self._recent))
+
+    def __iter__(self):
+        return iter(list(self._recent))
+
+    def __len__(self):
+        return self._spilled + len(self._recent)
+
+    def clear(self):
+        with self._lock:
+            self._recent.clear()
+            self._spilled = 0
+            self.path.unlink(missing_ok=True)
+
+
+def enforce_budget(state, budget_bytes: int, droppable=DROPPABLE, chat_key="messages") -> int:
+    """
+    Keep a session's state under budget_bytes: first spill chat history down
+    to its last few messages, then drop keys that can be rebuilt (e.g. goals
+    reloaded from the goal store). Only the chat and the droppable keys are
+    sized, since nothing else is shed. Returns the estimated size afterwards.
+    """
+    def size():
+        return sum(deep_sizeof(state[k]) for k in (chat_key, *droppable) if k in state)
+
+    used = size()
+    chat = state.get(chat_key)
+    if used > budget_bytes and isinstance(chat, ChatHistory):
+        chat.spill(keep=min(4, chat.max_in_memory))
+        used = size()
+    for key in droppable:
+        if used <= budget_bytes:
+            break
+        if key in state:
+            del state[key]
+            used = size()
+    return used
+
+
+class SessionRegistry:
+    """
+    Process-wide record of sessions. Each session gets a plain dict for its
+    chat and rebuildable state; sessions idle longer than idle_seconds have
+    their chat spilled and droppable keys removed, and sessions idle longer
+    than expire_seconds are forgotten along with their spill file. Sweeps run
+    at most every check_seconds.
+    """
+
+    def __init__(self, idle_seconds: float = 30 * 60, spill_dir=DEFAULT_SPILL_DIR,
+                 expire_seconds: float = 24 * 60 * 60, check_seconds: float = 60):
+        self.idle_seconds = idle_seconds
+        self.expire_seconds = expire_seconds
+        self.check_seconds = check_seconds
+        self.spill_dir = Path(spill_dir)
+        self._sessions = {}          # session id -> [last seen, state dict]
+        self._idle = set()           # sessions already shed
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+
+    def chat_path(self, session_id: str) -> Path:
+        return self.spill_dir / f"{session_id}.jsonl"
+
+    def touch(self, session_id: str, chat: ChatHistory) -> dict:
+        """Mark the session active; returns its state dict (chat under "messages")."""
+        with self._lock:
+            entry = self._sessions.setdefault(session_id, [0.0, {}])
+            entry[0] = time.monotonic()
+            entry[1]["messages"] = chat
+            self._idle.discard(session_id)
+            return entry[1]
+
+    def evict_idle(self, force: bool = False) -> int:
+        """
+        Shed idle sessions and expire abandoned ones; returns how many were
+        shed this time. A no-op until check_seconds after the last sweep
+        unless force is set.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if not force and now < self._next_check:
+                return 0
+            self._next_check = now + self.check_seconds
+            idle = [(sid, state) for sid, (seen, state) in self._sessions.items()
+                    if seen < now - self.idle_seconds and sid not in self._idle]
+            expired = [(sid, state) for sid, (seen, state) in self._sessions.items()
+                       if seen < now - self.expire_seconds]
+            self._idle.update(sid for sid, _ in idle)
+            # Dropped under the lock so a session touched meanwhile keeps its state
+            for _, state in idle:
+                for key in DROPPABLE:
+                    state.pop(key, None)
+            for sid, _ in expired:
+                del self._sessions[sid]
+                self._idle.discard(sid)
+            live = set(self._sessions)
+
+        for _, state in idle:
+            chat = state.get("messages")
+            if isinstance(chat, ChatHistory):
+                chat.spill()
+        for sid, state in expired:
+            chat = state.get("messages")
+            if isinstance(chat, ChatHistory):
+                chat.clear()
+            self.chat_path(sid).unlink(missing_ok=True)
+        self._sweep_files(live)
+        return len(idle)
+
+    def _sweep_files(self, live):
+        """Delete spill files left by sessions this process no longer knows (e.g. before a restart)."""
+        if not self.spill_dir.is_dir():
+            return
+        cutoff = time.time() - self.expire_seconds
+        for path in self.spill_dir.glob("*.jsonl"):
+            try:
+                if path.stem not in live and path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def __len__(self):
+        return len(self._sessions)
@@ -0,0 +1,98 @@
+# modules/simulation.py
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+# Annual (expected return %, volatility %) per risk profile
+PROFILE_MARKET_MODEL = {
+    "Conservative": (8.0, 6.0),
+    "Moderate": (10.0, 12.0),
+    "Aggressive": (12.0, 18.0),
+}
+
+DEFAULT_CHUNK_SIZE = 20_000
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+@dataclass
+class SimulationResult:
+    n_paths: int
+    target: float
+    success_probability: float
+    mean_corpus: float
+    percentiles: dict          # percentile -> final corpus
+
+
+def market_model_for_profile(profile: str | None):
+    """Return (annual_return %, annual_volatility %) for a risk profile."""
+    p = (profile or "Moderate").lower()
+    if "aggress" in p:
+        return PROFILE_MARKET_MODEL["Aggressive"]
+    if "conserv" in p:
+        return PROFILE_MARKET_MODEL["Conservative"]
+    return PROFILE_MARKET_MODEL["Moderate"]
+
+
+def _simulate_chunk(monthly_sip, months, annual_return, volatility, n_paths, seed):
+    """
+    Final corpus for n_paths random paths. Monthly growth is lognormal with
+    mean annual_return / 12, so the average path matches calculate_sip.
+    Only one month of returns is held in memory at a time.
+    """
+    rng = np.random.default_rng(seed)
+    sigma = volatility / 100 / np.sqrt(12)
+    mu = np.log1p(annual_return / 100 / 12) - 0.5 * sigma ** 2
+
+    corpus = np.zeros(n_paths)
+    growth = np.empty(n_paths)
+    for _ in range(months):
+        rng.standard_normal(out=growth)
+        growth *= sigma
+        growth += mu
+        np.exp(growth, out=growth)
+        corpus *= growth
+        corpus += monthly_sip
+    return corpus
+
+
+def simulate_goal(monthly_sip, years, target, annual_return=None, volatility=None,
+                  risk_profile=None, n_paths=100_000, seed=None,
+                  chunk_size=DEFAULT_CHUNK_SIZE, workers=None) -> SimulationResult:
+    """
+    Monte Carlo projection of a monthly SIP over `years`.
+    Missing return / volatility fall back to the risk profile's market model.
+    Paths are generated in chunks of `chunk_size`; pass `workers` > 1 to
+    spread chunks over a process pool. Results depend only on `seed`,
+    not on the number of workers.
+    """
+    model_return, model_vol = market_model_for_profile(risk_profile)
+    if annual_return is None:
+        annual_return = model_return
+    if volatility is None:
+        volatility = model_vol
+
+    months = int(years * 12)
+    sizes = [chunk_size] * (n_paths // chunk_size)
+    if n_paths % chunk_size:
+        sizes.append(n_paths % chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [(monthly_sip, months, annual_return, volatility, size, s)
+            for size, s in zip(sizes, seeds)]
+
+    if workers and workers > 1 and len(args) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunks = list(pool.map(_simulate_chunk, *zip(*args)))
+    else:
+        chunks = [_simulate_chunk(*a) for a in args]
+
+    corpus = np.concatenate(chunks) if chunks else np.zeros(0)
+    pct_values = np.percentile(corpus, PERCENTILES) if corpus.size else [0.0] * len(PERCENTILES)
+    return SimulationResult(
+        n_paths=int(corpus.size),
+        target=float(target),
+        success_probability=float(np.mean(corpus >= target)) if corpus.size else 0.0,
+        mean_corpus=float(corpus.mean()) if corpus.size else 0.0,
+        percentiles={p: float(v) for p, v in zip(PERCENTILES, pct_values)},
+    )
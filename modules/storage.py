@@ -0,0 +1,149 @@
+# modules/storage.py
+"""
+SQLite-backed goal repository. Per-user totals are kept up to date by
+triggers, so dashboard metrics never rescan the goals table.
+"""
+
+import sqlite3
+import threading
+from dataclasses import dataclass
+
+# Saved-goal keys used by the app -> column names in the goals table
+GOAL_FIELDS = {
+    "Goal": "name",
+    "Goal type": "goal_type",
+    "Original Target (₹)": "original_target",
+    "Inflation-adjusted Target (₹)": "inflated_target",
+    "Years": "years",
+    "Risk": "risk",
+    "Inflation (%)": "inflation",
+    "Return (%)": "expected_return",
+    "Monthly SIP (₹)": "monthly_sip",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS goals (
+    id INTEGER PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    goal_type TEXT NOT NULL,
+    original_target REAL NOT NULL,
+    inflated_target REAL NOT NULL,
+    years INTEGER NOT NULL,
+    risk TEXT,
+    inflation REAL NOT NULL,
+    expected_return REAL NOT NULL,
+    monthly_sip REAL NOT NULL,
+    created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_goals_user_type ON goals (user_id, goal_type);
+
+CREATE TABLE IF NOT EXISTS goal_totals (
+    user_id TEXT PRIMARY KEY,
+    goal_count INTEGER NOT NULL DEFAULT 0,
+    total_sip REAL NOT NULL DEFAULT 0,
+    total_target REAL NOT NULL DEFAULT 0
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_goals_insert AFTER INSERT ON goals BEGIN
+    INSERT OR IGNORE INTO goal_totals (user_id) VALUES (NEW.user_id);
+    UPDATE goal_totals SET goal_count = goal_count + 1,
+        total_sip = total_sip + NEW.monthly_sip,
+        total_target = total_target + NEW.inflated_target
+    WHERE user_id = NEW.user_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_goals_delete AFTER DELETE ON goals BEGIN
+    UPDATE goal_totals SET goal_count = goal_count - 1,
+        total_sip = total_sip - OLD.monthly_sip,
+        total_target = total_target - OLD.inflated_target
+    WHERE user_id = OLD.user_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_goals_update AFTER UPDATE OF monthly_sip, inflated_target ON goals BEGIN
+    UPDATE goal_totals SET
+        total_sip = total_sip - OLD.monthly_sip + NEW.monthly_sip,
+        total_target = total_target - OLD.inflated_target + NEW.inflated_target
+    WHERE user_id = NEW.user_id;
+END;
+"""
+
+_COLUMNS = list(GOAL_FIELDS.values())
+_INSERT = f"INSERT INTO goals (user_id, {', '.join(_COLUMNS)}) VALUES (?, {', '.join('?' * len(_COLUMNS))})"
+
+
+@dataclass
+class GoalTotals:
+    goal_count: int = 0
+    total_sip: float = 0.0
+    total_target: float = 0.0
+
+
+class GoalStore:
+    """Thread-safe goal repository; one instance can be shared by all sessions."""
+
+    def __init__(self, path: str = "roboadvisor.db"):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            if path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+
+    def add_goal(self, user_id: str, goal: dict) -> int:
+        """Insert one saved-goal dict; returns its id."""
+        with self._lock, self._conn:
+            cur = self._conn.execute(_INSERT, _row(user_id, goal))
+            return cur.lastrowid
+
+    def add_goals(self, user_id: str, goals) -> int:
+        """Insert many saved-goal dicts in a single transaction."""
+        rows = [_row(user_id, g) for g in goals]
+        with self._lock, self._conn:
+            self._conn.executemany(_INSERT, rows)
+        return len(rows)
+
+    def update_goals(self, user_id: str, goals) -> int:
+        """Write back edited saved-goal dicts (matched on their "id") in one transaction."""
+        sets = ", ".join(f"{col} = ?" for col in _COLUMNS)
+        rows = [(*_row(user_id, g)[1:], g["id"], user_id) for g in goals]
+        with self._lock, self._conn:
+            self._conn.executemany(f"UPDATE goals SET {sets} WHERE id = ? AND user_id = ?", rows)
+        return len(rows)
+
+    def delete_goal(self, user_id: str, goal_id: int) -> bool:
+        with self._lock, self._conn:
+            cur = self._conn.execute("DELETE FROM goals WHERE id = ? AND user_id = ?", (goal_id, user_id))
+            return cur.rowcount > 0
+
+    def list_goals(self, user_id: str, goal_type: str | None = None) -> list:
+        """Saved-goal dicts for a user (optionally one goal type), oldest first."""
+        sql = f"SELECT id, {', '.join(_COLUMNS)} FROM goals WHERE user_id = ?"
+        params = [user_id]
+        if goal_type is not None:
+            sql += " AND goal_type = ?"
+            params.append(goal_type)
+        with self._lock:
+            rows = self._conn.execute(sql + " ORDER BY id", params).fetchall()
+        return [_goal(r) for r in rows]
+
+    def totals(self, user_id: str) -> GoalTotals:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT goal_count, total_sip, total_target FROM goal_totals WHERE user_id = ?", (user_id,)
+            ).fetchone()
+        return GoalTotals(*row) if row else GoalTotals()
+
+    def close(self):
+        self._conn.close()
+
+
+def _row(user_id: str, goal: dict) -> tuple:
+    return (user_id, *(goal.get(key) for key in GOAL_FIELDS))
+
+
+def _goal(row) -> dict:
+    goal = {key: row[col] for key, col in GOAL_FIELDS.items()}
+    goal["id"] = row["id"]
+    return goal
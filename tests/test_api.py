@@ -0,0 +1,77 @@
+# tests/test_api.py
+import asyncio
+import json
+
+import pytest
+
+from modules.api import PlanServer, ValidationError, validate_goal
+
+
+@pytest.mark.parametrize("field", ["target_amount", "expected_return", "inflation"])
+@pytest.mark.parametrize("value", [float("nan"), float("inf"), float("-inf")])
+def test_rejects_non_finite_numbers(field, value):
+    payload = {"target_amount": 1e6, "years": 10, field: value}
+    with pytest.raises(ValidationError, match="finite"):
+        validate_goal(payload)
+
+
+async def _exchange(raw: bytes) -> tuple:
+    server = PlanServer(workers=0)
+    srv = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+    port = srv.sockets[0].getsockname()[1]
+    try:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(raw)
+        await writer.drain()
+        status_line = await reader.readline()
+        headers = {}
+        while (line := await reader.readline()) not in (b"\r\n", b""):
+            key, _, value = line.decode().partition(":")
+            headers[key.strip().lower()] = value.strip()
+        body = await reader.readexactly(int(headers["content-length"]))
+        writer.close()
+        return int(status_line.split()[1]), json.loads(body)
+    finally:
+        srv.close()
+        await srv.wait_closed()
+
+
+@pytest.mark.parametrize("length", ["abc", "-5", "1.5"])
+def test_malformed_content_length_is_400(length):
+    raw = f"POST /plan HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode()
+    status, body = asyncio.run(_exchange(raw))
+    assert status == 400
+    assert "Content-Length" in body["error"]
+
+
+def test_valid_plan_request():
+    payload = json.dumps({"target_amount": 1e6, "years": 10, "inflation": 5}).encode()
+    raw = b"POST /plan HTTP/1.1\r\nContent-Length: " + str(len(payload)).encode() + b"\r\n\r\n" + payload
+    status, body = asyncio.run(_exchange(raw))
+    assert status == 200
+    assert body["sip"] > 0
+
+
+def _post_plan(payload) -> tuple:
+    data = json.dumps(payload).encode()
+    raw = b"POST /plan HTTP/1.1\r\nContent-Length: " + str(len(data)).encode() + b"\r\n\r\n" + data
+    return asyncio.run(_exchange(raw))
+
+
+@pytest.mark.parametrize("payload, field", [
+    ({"target_amount": 100000, "years": 1, "expected_return": -2400}, "expected_return"),
+    ({"target_amount": 100000, "years": 100, "inflation": 1e6}, "inflation"),
+])
+def test_out_of_range_rates_are_422(payload, field):
+    status, body = _post_plan(payload)
+    assert status == 422
+    assert field in body["error"]
+
+
+def test_unexpected_errors_are_500(monkeypatch):
+    async def boom(body):
+        raise ZeroDivisionError("float division by zero")
+    monkeypatch.setattr(PlanServer, "plan", lambda self, body: boom(body))
+    status, body = _post_plan({"target_amount": 1e6, "years": 10})
+    assert status == 500
+    assert "ZeroDivisionError" in body["error"]
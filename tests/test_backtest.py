@@ -0,0 +1,50 @@
+"""Backtester against closed forms and a per-window loop."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.backtest import ReturnSeries, backtest, load_returns
+
+BUCKETS = ["Core Equity", "Hybrid", "Debt"]
+
+
+def _series(returns) -> ReturnSeries:
+    return ReturnSeries([f"m{i}" for i in range(len(returns))], BUCKETS, np.asarray(returns, dtype=float))
+
+
+def test_constant_return_matches_annuity():
+    r, months, sip = 0.01, 36, 1_000.0
+    result = backtest(_series(np.full((60, 3), r)), [0.5, 0.3, 0.2], sip, months, target=43_000)
+    expected = sip * ((1 + r) ** months - 1) / r
+    np.testing.assert_allclose(result.final_value, expected, rtol=1e-12)
+    np.testing.assert_allclose(result.cagr, (1 + r) ** 12 - 1, rtol=1e-12)
+    assert len(result.start_dates) == 25 and np.all(result.max_drawdown == 0)
+    assert result.hit_rate == 1.0 and result.invested == sip * months
+
+
+@pytest.mark.parametrize("rebalance_every", [0, 1, 12])
+def test_matches_per_window_loop(rebalance_every):
+    rng = np.random.default_rng(3)
+    returns = rng.normal(0.008, 0.04, (40, 3))
+    weights = np.array([0.6, 0.25, 0.15])
+    result = backtest(_series(returns), weights, 500.0, 24, rebalance_every)
+
+    for start in range(len(returns) - 24 + 1):
+        holdings = np.zeros(3)
+        for m in range(24):
+            holdings = holdings * (1 + returns[start + m]) + 500.0 * weights
+            if rebalance_every and (m + 1) % rebalance_every == 0:
+                holdings = holdings.sum() * weights
+        assert result.final_value[start] == pytest.approx(holdings.sum(), rel=1e-12)
+
+
+def test_cache_is_written_to_cache_dir_not_next_to_csv(tmp_path):
+    data, cache = tmp_path / "data", tmp_path / "cache"
+    data.mkdir()
+    pd.DataFrame({"date": ["2020-01", "2020-02"], "Debt": [0.01, 0.02]}).to_csv(data / "returns.csv", index=False)
+
+    series = load_returns(data / "returns.csv", cache_dir=cache)
+    assert series.buckets == ["Debt"] and series.returns.tolist() == [[0.01], [0.02]]
+    assert sorted(p.name for p in data.iterdir()) == ["returns.csv"]
+    assert len(list(cache.glob("*.returns.npy"))) == 1
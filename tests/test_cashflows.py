@@ -0,0 +1,44 @@
+"""Cash-flow engine against sip_required and a month-by-month simulation."""
+
+import numpy as np
+import pytest
+
+from modules.cashflows import CashFlows, future_value, required_sip
+from modules.goals import Goal, sip_required
+
+
+def _simulate(base_sip, years, annual_return, step_up=0.0, lump_sum=0.0, flows=()):
+    r = annual_return / 100 / 12
+    corpus = lump_sum + dict(flows).get(0, 0.0)
+    for month in range(1, round(years * 12) + 1):
+        sip = base_sip * (1 + step_up / 100) ** ((month - 1) // 12)
+        corpus = corpus * (1 + r) + sip + dict(flows).get(month, 0.0)
+    return corpus
+
+
+def test_flat_sip_matches_scalar_within_rounding():
+    targets = np.array([1e5, 2.5e6, 1e8])
+    years = np.arange(1, 41)
+    returns = np.array([0.0, 4.0, 7.3, 12.0, 20.0])
+    t, y, r = np.meshgrid(targets, years, returns, indexing="ij")
+    expected = [sip_required(Goal("g", a, b, c)) for a, b, c in zip(t.ravel(), y.ravel(), r.ravel())]
+    np.testing.assert_allclose(required_sip(t, y, r).ravel(), expected, rtol=1e-12)
+
+
+@pytest.mark.parametrize("years, annual_return, step_up, lump_sum, flows", [
+    (10, 12.0, 10.0, 0.0, ()),
+    (7.5, 9.0, 5.0, 50_000.0, ()),
+    (15, 0.0, 8.0, 0.0, ((24, 100_000.0),)),
+    (20, 11.0, 0.0, 200_000.0, ((60, -150_000.0), (120, 80_000.0))),
+    (12, 8.0, ((1 + 8 / 1200) ** 12 - 1) * 100, 0.0, ()),  # step-up equal to a year's growth
+])
+def test_plans_match_monthly_simulation(years, annual_return, step_up, lump_sum, flows):
+    target = 5_000_000.0
+    cash = CashFlows.of(flows) if flows else None
+    sip = float(required_sip(target, years, annual_return, step_up, lump_sum, cash))
+    np.testing.assert_allclose(_simulate(sip, years, annual_return, step_up, lump_sum, flows), target, rtol=1e-9)
+    np.testing.assert_allclose(future_value(sip, years, annual_return, step_up, lump_sum, cash), target, rtol=1e-9)
+
+
+def test_lump_sum_alone_needs_no_sip():
+    assert required_sip(1_000_000, 10, 12, lump_sum=1_000_000) == 0.0
@@ -0,0 +1,41 @@
+"""Glide-path SIP and projection consistency."""
+
+import numpy as np
+
+from modules.glide_path import glide_paths, glide_schedule, glide_sip_required, glide_sip_required_batch, glide_template
+from modules.planning import build_goal_plan
+
+PROFILES = ["Aggressive", "moderate growth", None, "Conservative"]
+YEARS = [3, 10, 10, 25]
+
+
+def test_batch_matches_scalar():
+    targets = np.array([5e5, 2e6, 1e6, 3e7])
+    expected = [glide_sip_required(t, y, p) for t, y, p in zip(targets, YEARS, PROFILES)]
+    np.testing.assert_allclose(glide_sip_required_batch(targets, YEARS, PROFILES), expected, rtol=1e-12)
+
+
+def test_paths_share_templates():
+    templates, index = glide_paths(PROFILES, YEARS)
+    assert len(templates) == 3  # "moderate growth" and None are both Moderate over 10 years
+    assert index[1] == index[2]
+    for i, (p, y) in enumerate(zip(PROFILES, YEARS)):
+        np.testing.assert_array_equal(templates[index[i]], glide_template(p, y * 12))
+
+
+def test_plan_glide_sip_reaches_target():
+    plan, _ = build_goal_plan(1_000_000, 12, 11, 6, "Education", "Aggressive")
+    corpus = glide_schedule(plan["glide_sip"], plan["years"], plan["risk_profile"])
+    assert len(corpus) == 12 * 12
+    np.testing.assert_allclose(corpus[-1], plan["inflated_target"], rtol=1e-12)
+
+
+def test_pairs_do_not_collide_and_fractional_years_round_to_months():
+    # With a code * 10_000 + months key, (Moderate, 0) and (Aggressive, 10_000 months) shared a key
+    templates, index = glide_paths(["Moderate", "Aggressive"], [0, 10_000 / 12])
+    assert index[0] != index[1] and len(templates[index[1]]) == 10_000
+
+    targets = np.array([1e6, 1e6, 1e6])
+    batch = glide_sip_required_batch(targets, [7.5, 7, 8], ["Moderate"] * 3)
+    np.testing.assert_allclose(batch[0], glide_sip_required(1e6, 7.5, "Moderate"), rtol=1e-12)
+    assert batch[1] > batch[0] > batch[2]
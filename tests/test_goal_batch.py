@@ -0,0 +1,21 @@
+# tests/test_goal_batch.py
+import pytest
+
+from modules.goal_batch import GoalBatch
+from modules.goals import Goal
+
+
+@pytest.mark.parametrize("years", [40_000, 0, 2.5, float("nan")])
+def test_rejects_out_of_range_years(years):
+    with pytest.raises(ValueError, match="years"):
+        GoalBatch([1e6], [years], [10.0])
+
+
+def test_unknown_goal_type_is_named():
+    with pytest.raises(ValueError, match="'Yacht'"):
+        GoalBatch.from_goals([Goal("g", 1e5, 5, 10.0)], goal_type="Yacht")
+
+
+def test_round_trip():
+    batch = GoalBatch.from_goals([Goal("g", 1e5, 5, 10.0, "Aggressive")], goal_type="House")
+    assert batch[0] == Goal("House Goal 1", 1e5, 5, 10.0, "Aggressive")
@@ -0,0 +1,34 @@
+# tests/test_goals.py
+import numpy as np
+import pandas as pd
+
+from modules.goals import (
+    Goal, RETURN_COL, TARGET_COL, YEARS_COL, sip_required, sip_required_batch, sip_required_frame,
+)
+
+
+def _grid():
+    targets = np.array([1.0, 2.5e5, 1e6, 3.7e7, 1e9])
+    years = np.arange(1, 41)
+    returns = np.concatenate([[0.0], np.arange(0.5, 20.5, 0.5), [7.3, 11.11]])
+    t, y, r = np.meshgrid(targets, years, returns, indexing="ij")
+    return t.ravel(), y.ravel(), r.ravel()
+
+
+def test_batch_matches_scalar():
+    t, y, r = _grid()
+    expected = [sip_required(Goal("g", a, int(b), c)) for a, b, c in zip(t.tolist(), y.tolist(), r.tolist())]
+    np.testing.assert_allclose(sip_required_batch(t, y, r), expected, rtol=1e-12, atol=0)
+
+
+def test_batch_zero_rate_and_broadcast():
+    assert sip_required_batch(120_000.0, 10, 0.0) == 1000.0
+    out = sip_required_batch(1e6, np.array([[5], [10]]), np.array([8.0, 12.0]))
+    assert out.shape == (2, 2)
+    np.testing.assert_allclose(out[1, 1], sip_required(Goal("g", 1e6, 10, 12.0)), rtol=1e-12)
+
+
+def test_frame_matches_batch():
+    t, y, r = _grid()
+    df = pd.DataFrame({TARGET_COL: t, YEARS_COL: y, RETURN_COL: r})
+    np.testing.assert_array_equal(sip_required_frame(df), sip_required_batch(t, y, r))
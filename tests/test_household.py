@@ -0,0 +1,63 @@
+"""Household timeline against targets and a month-by-month loop."""
+
+import numpy as np
+import pytest
+
+from modules.goals import sip_required_batch
+from modules.household import project_household, project_households
+
+TARGETS = np.array([500_000.0, 2_000_000.0, 1_200_000.0])
+YEARS = np.array([3, 10, 6.5])
+RETURNS = np.array([7.0, 12.0, 0.0])
+
+
+def _loop(sip, years, annual_return, step_up, horizon):
+    """Corpus and payouts of one goal, one month at a time."""
+    n, r = round(years * 12), annual_return / 100 / 12
+    corpus, held, payouts = 0.0, np.zeros(horizon), np.zeros(horizon)
+    for t in range(1, horizon + 1):
+        if t > n:
+            break
+        corpus = corpus * (1 + r) + sip * (1 + step_up / 100) ** ((t - 1) // 12)
+        if t == n:
+            payouts[t - 1] = corpus
+        else:
+            held[t - 1] = corpus
+    return held, payouts
+
+
+def test_payouts_equal_targets():
+    sip = sip_required_batch(TARGETS, YEARS, RETURNS)
+    timeline = project_household(sip, YEARS, RETURNS)
+    assert timeline.months == 120
+    np.testing.assert_allclose(timeline.payouts.sum(axis=1), TARGETS, rtol=1e-9)
+    np.testing.assert_array_equal(timeline.maturity_month, [36, 120, 78])
+    for g, n in enumerate(timeline.maturity_month):
+        assert timeline.payouts[g, n - 1] > 0 and np.all(timeline.corpus[g, n - 1:] == 0)
+        assert np.all(timeline.contributions[g, n:] == 0)
+
+
+@pytest.mark.parametrize("step_up", [0.0, 10.0])
+def test_matches_monthly_loop(step_up):
+    sip = np.array([5_000.0, 12_000.0, 8_000.0])
+    timeline = project_household(sip, YEARS, RETURNS, step_up=step_up, budget=20_000)
+    paid = np.zeros(timeline.months)
+    for g in range(3):
+        held, payouts = _loop(sip[g], YEARS[g], RETURNS[g], step_up, timeline.months)
+        np.testing.assert_allclose(timeline.corpus[g], held, rtol=1e-9, atol=1e-6)
+        np.testing.assert_allclose(timeline.payouts[g], payouts, rtol=1e-9, atol=1e-6)
+        for t in range(1, round(YEARS[g] * 12) + 1):
+            paid[t - 1] += sip[g] * (1 + step_up / 100) ** ((t - 1) // 12)
+    np.testing.assert_allclose(timeline.total_contributions, paid, rtol=1e-12)
+    np.testing.assert_array_equal(timeline.over_budget(), paid > 20_000)
+
+def test_batch_totals_match_single_households():
+    sips = np.array([[5_000.0, 12_000.0, 8_000.0], [3_000.0, 0.0, 0.0]])
+    years = np.array([YEARS, [2, 1, 1]])
+    returns = np.array([RETURNS, [9.0, 0.0, 0.0]])
+    totals = project_households(sips, years, returns, budget=[20_000, 2_000], months=120)
+    for h in range(2):
+        single = project_household(sips[h], years[h], returns[h], budget=[20_000, 2_000][h], months=120)
+        np.testing.assert_allclose(totals.contributions[h], single.total_contributions, rtol=1e-12)
+        np.testing.assert_allclose(totals.corpus[h], single.total_corpus, rtol=1e-12)
+        assert totals.months_over_budget[h] == single.over_budget().sum()
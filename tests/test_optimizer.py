@@ -0,0 +1,93 @@
+"""allocate_budget against month-by-month brute force on small households."""
+
+import itertools
+
+import numpy as np
+import pytest
+
+from modules.optimizer import allocate_budget
+
+HOUSEHOLDS = [
+    # targets, years, returns (% p.a.), monthly budget
+    ([500_000, 1_200_000, 3_000_000], [3, 8, 15], [8, 10, 12], 12_000),
+    ([800_000, 400_000, 900_000], [2, 4, 5], [7, 7, 9], 15_000),
+    ([250_000, 250_000, 600_000], [1, 2, 3], [0, 6, 10], 9_000),
+]
+
+
+def _level_fv(avail, level, deadline, r):
+    corpus = 0.0
+    for t in range(deadline):
+        corpus = corpus * (1 + r) + min(avail[t], level)
+    return corpus
+
+
+def _priority_feasible(targets, deadlines, rates, budget):
+    """Fund goals in order, each with the smallest capped level SIP meeting its deadline."""
+    avail = [budget] * max(deadlines)
+    for target, deadline, r in zip(targets, deadlines, rates):
+        if _level_fv(avail, budget, deadline, r) < target * (1 - 1e-9):
+            return False
+        lo, hi = 0.0, budget
+        for _ in range(100):
+            mid = (lo + hi) / 2
+            lo, hi = (lo, mid) if _level_fv(avail, mid, deadline, r) >= target else (mid, hi)
+        avail = [a - min(a, hi) if t < deadline else a for t, a in enumerate(avail)]
+    return True
+
+
+@pytest.mark.parametrize("targets, years, returns, budget", HOUSEHOLDS)
+def test_priority_extensions_are_lexicographically_minimal(targets, years, returns, budget):
+    rates = [r / 100 / 12 for r in returns]
+    best = next(ext for ext in itertools.product(range(12), repeat=len(targets))
+                if _priority_feasible(targets, [12 * (y + e) for y, e in zip(years, ext)], rates, budget))
+    alloc = allocate_budget(targets, years, returns, budget, strategy="priority")
+    assert tuple(alloc.extra_years) == best
+    assert alloc.feasible == (sum(best) == 0)
+
+
+@pytest.mark.parametrize("targets, years, returns, budget", HOUSEHOLDS)
+def test_proportional_matches_monthly_simulation(targets, years, returns, budget):
+    alloc = allocate_budget(targets, years, returns, budget, strategy="proportional")
+    required = alloc.required
+    rates = [r / 100 / 12 for r in returns]
+    corpus, done = [0.0] * len(targets), [0] * len(targets)
+    month = 0
+    while not all(done):
+        month += 1
+        live = [i for i, d in enumerate(done) if not d]
+        need = sum(required[i] for i in live)
+        for i in live:
+            corpus[i] = corpus[i] * (1 + rates[i]) + required[i] * budget / need
+        for i in live:
+            if corpus[i] >= targets[i] * (1 - 1e-12):
+                done[i] = month
+    expected = [max(0, -(-(m - 12 * y) // 12)) for m, y in zip(done, years)]
+    assert list(alloc.extra_years) == expected
+    assert alloc.allocated.sum() == pytest.approx(budget)
+
+
+def test_batch_matches_single_households():
+    width = max(len(h[0]) for h in HOUSEHOLDS)
+    pad = lambda v: list(v) + [0] * (width - len(v))
+    targets, years, returns, budgets = (np.array([pad(h[i]) if i < 3 else h[i] for h in HOUSEHOLDS], dtype=float)
+                                        for i in range(4))
+    for strategy in ("priority", "proportional"):
+        batch = allocate_budget(targets, np.maximum(years, 1), returns, budgets, strategy=strategy)
+        for row, household in enumerate(HOUSEHOLDS):
+            single = allocate_budget(*household, strategy=strategy)
+            np.testing.assert_allclose(batch.allocated[row], single.allocated, rtol=1e-9)
+            np.testing.assert_array_equal(batch.extra_years[row], single.extra_years)
+
+
+def test_budget_covering_every_goal_needs_no_extension():
+    for strategy in ("priority", "proportional"):
+        alloc = allocate_budget([500_000, 900_000], [5, 10], [10, 12], 50_000, strategy=strategy)
+        assert alloc.feasible
+        np.testing.assert_allclose(alloc.allocated, alloc.required, rtol=1e-9)
+
+
+def test_zero_budget_never_funds():
+    alloc = allocate_budget([500_000, 900_000], [5, 10], [10, 12], 0)
+    assert not alloc.feasible
+    assert np.isinf(alloc.extra_years).all()
@@ -0,0 +1,92 @@
+"""Client report rendering and resumable runs."""
+
+import csv
+
+import numpy as np
+import pandas as pd
+
+from modules.reports import MANIFEST, render_report, run
+
+CLIENTS = pd.DataFrame({
+    "client_id": ["a", "b", "c"], "client_name": ["Asha", np.nan, ""],
+    "amount": [1e6, 2e6, 5e5], "years": [10, 5, 3], "inflation": [6, 6, 5],
+    "age": [30, 50, 40], "income_stability": [3, 4, 2], "horizon_years": [10, 5, 3],
+    "crash_reaction": [2, 1, 3], "experience": [2, 1, 3], "dip_behavior": [2, 1, 3],
+})
+
+
+def _manifest_rows(out_dir):
+    with open(out_dir / MANIFEST, newline="", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+
+def test_missing_names_fall_back_to_client_id(tmp_path):
+    source = tmp_path / "clients.csv"
+    CLIENTS.to_csv(source, index=False)
+    run(source, tmp_path / "out")
+    assert "Goal plan for Asha" in (tmp_path / "out" / "a.html").read_text(encoding="utf-8")
+    for cid in "bc":
+        page = (tmp_path / "out" / f"{cid}.html").read_text(encoding="utf-8")
+        assert f"Goal plan for Client {cid}" in page and "nan" not in page.split("<title>")[1].split("</title>")[0]
+
+
+def test_empty_manifest_gets_one_header_and_rerun_resumes(tmp_path):
+    source, out = tmp_path / "clients.csv", tmp_path / "out"
+    CLIENTS.to_csv(source, index=False)
+    out.mkdir()
+    (out / MANIFEST).touch()
+
+    assert run(source, out) == (3, 0)
+    assert run(source, out) == (0, 3)
+    rows = _manifest_rows(out)
+    assert rows[0] == ["client_id", "file"] and rows.count(["client_id", "file"]) == 1
+    assert [r[0] for r in rows[1:]] == ["a", "b", "c"]
+
+
+def test_render_report_accepts_nan_name():
+    plan = {"amount": 1e6, "years": 10, "inflation": 6.0, "return": 12.0, "inflated_target": 1.79e6,
+            "sip": 7800.0, "glide_sip": 8800.0, "risk_profile": "Moderate"}
+    assert "Goal plan for Client 7" in render_report(plan, "7", float("nan"))
+
+
+def test_missing_answer_is_not_assessed(tmp_path):
+    source = tmp_path / "clients.csv"
+    clients = CLIENTS.astype({"crash_reaction": float})
+    clients.loc[0, "crash_reaction"] = np.nan
+    clients.to_csv(source, index=False)
+    run(source, tmp_path / "out")
+    page = (tmp_path / "out" / "a.html").read_text(encoding="utf-8")
+    assert "Not assessed" in page and "Aggressive" not in page
+
+
+def test_parquet_batches_get_distinct_client_ids(tmp_path, monkeypatch):
+    import sys
+    import types
+
+    clients = CLIENTS.drop(columns=["client_id", "client_name"])
+
+    class FakeBatch:
+        def __init__(self, df):
+            self.df = df
+
+        def to_pandas(self):
+            return self.df.reset_index(drop=True)
+
+    class FakeParquetFile:
+        def __init__(self, path):
+            pass
+
+        def iter_batches(self, batch_size):
+            for start in range(0, len(clients), batch_size):
+                yield FakeBatch(clients.iloc[start:start + batch_size])
+
+    parquet = types.ModuleType("pyarrow.parquet")
+    parquet.ParquetFile = FakeParquetFile
+    monkeypatch.setitem(sys.modules, "pyarrow", types.ModuleType("pyarrow"))
+    monkeypatch.setitem(sys.modules, "pyarrow.parquet", parquet)
+
+    out = tmp_path / "out"
+    assert run(tmp_path / "clients.parquet", out, chunksize=2) == (3, 0)
+    assert [r[0] for r in _manifest_rows(out)[1:]] == ["0", "1", "2"]
+    assert sorted(p.name for p in out.glob("*.html")) == ["0.html", "1.html", "2.html"]
+    assert run(tmp_path / "clients.parquet", out, chunksize=2) == (0, 3)
@@ -0,0 +1,57 @@
+"""Questionnaire file scoring."""
+
+import csv
+
+import numpy as np
+import pytest
+
+from modules.risk_profile import calculate_risk_profile, calculate_risk_profile_batch, main, validate_response
+
+GOOD = {"age": "30", "income_stability": "3", "horizon_years": "10",
+        "crash_reaction": "2", "experience": "2", "dip_behavior": "3"}
+
+
+def test_header_written_once_when_first_batch_is_all_invalid(tmp_path):
+    rows = [dict(GOOD, age="abc"), dict(GOOD, experience="9"), GOOD, dict(GOOD, age="45"), GOOD]
+    source = tmp_path / "responses.csv"
+    with open(source, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(GOOD))
+        writer.writeheader()
+        writer.writerows(rows)
+    output, rejected = tmp_path / "profiles.csv", tmp_path / "rejected.csv"
+
+    main([str(source), str(output), "--invalid", str(rejected), "--batch-size", "2"])
+
+    with open(output, newline="") as f:
+        lines = list(csv.reader(f))
+    assert lines[0][0] == "row" and sum(line[0] == "row" for line in lines) == 1
+    assert [line[0] for line in lines[1:]] == ["2", "3", "4"]
+    assert len(rejected.read_text().splitlines()) == 2
+
+
+def test_validate_response_lists_every_problem():
+    assert validate_response(GOOD)["age"] == 30.0
+    with pytest.raises(ValueError, match="age: missing.*crash_reaction"):
+        validate_response(dict(GOOD, age="", crash_reaction="6"))
+
+
+def test_batch_profile_masks_missing_rows():
+    answers = [[1, 2, 3, 4, 5, 6], [5, 5, 5, 5, 5, 5], [5, 5, np.nan, 5, 5, 5]]
+    labels = calculate_risk_profile_batch(answers)
+    assert list(labels[:2]) == [calculate_risk_profile(a) for a in answers[:2]]
+    assert labels[2] is None
+
+
+def test_bad_json_lines_are_reported_not_fatal(tmp_path):
+    import json
+    source = tmp_path / "responses.jsonl"
+    source.write_text("\n".join([json.dumps(GOOD), "{not json", "[1, 2]", json.dumps(dict(GOOD, age="45"))]) + "\n")
+    output, rejected = tmp_path / "profiles.csv", tmp_path / "rejected.csv"
+
+    main([str(source), str(output), "--invalid", str(rejected), "--batch-size", "3"])
+
+    with open(output, newline="") as f:
+        assert [line[0] for line in csv.reader(f)] == ["row", "0", "3"]
+    with open(rejected, newline="") as f:
+        errors = {int(r[0]): r[1] for r in csv.reader(f)}
+    assert errors[1].startswith("invalid JSON") and errors[2] == "expected an object, got list"
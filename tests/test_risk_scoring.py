@@ -0,0 +1,27 @@
+"""Risk labels never come from a missing answer."""
+
+import numpy as np
+import pandas as pd
+
+from modules.bulk import plan_frame
+from modules.risk_scoring import default_scorer
+
+ANSWERS = {"age": 30, "income_stability": 3, "horizon_years": 10, "crash_reaction": 3, "experience": 2, "dip_behavior": 3}
+
+
+def test_nan_score_has_no_label():
+    scorer = default_scorer()
+    labels = scorer.label([np.nan, -np.inf, np.inf, 0.0])
+    assert labels[0] is None and labels[1] is None and labels[2] is None
+    assert labels[3] == scorer.labels[0]
+    assert scorer.profile_for(**dict(ANSWERS, crash_reaction=np.nan))[0] is None
+
+
+def test_blank_answer_in_bulk_gets_no_profile_or_allocation():
+    df = pd.DataFrame([dict(ANSWERS, amount=1e6, years=10, inflation=6),
+                       dict(ANSWERS, amount=1e6, years=10, inflation=6, crash_reaction=np.nan)])
+    out = plan_frame(df)
+    assert out["risk_profile"].iloc[0] is not None
+    assert out["risk_profile"].iloc[1] is None
+    assert np.isnan(out["glide_sip"].iloc[1]) and np.isnan(out["Equity Funds"].iloc[1])
+
@@ -0,0 +1,119 @@
+"""The compiled rules table against the if/elif chains it replaced."""
+
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.planning import (generate_insights, get_detailed_investment_split, get_investment_suggestions,
+                              risk_heat_label)
+from modules.rules import apply_rules
+
+PROFILES = [None, "", "Aggressive", "aggressive", "Moderate", "moderately aggressive", "Conservative",
+            "Very Conservative", "conservative-aggressive", "Balanced", "MODERATE"]
+GOAL_TYPES = [None, "", "General", "House", "Education", "house", "Education for house", "Retirement", "Vehicle"]
+YEARS = [0, 1, 4.5, 5, 5.5, 6, 9, 10, 10.5, 11, 12, 12.5, 13, 20, 40]
+
+
+# --- reference implementations, as they were before the rules table ---
+
+def legacy_risk_heat_label(risk_profile, years):
+    rp = (risk_profile or "Moderate").lower()
+    if years <= 5: horizon_factor = "short"
+    elif years <= 12: horizon_factor = "medium"
+    else: horizon_factor = "long"
+    if "aggress" in rp and horizon_factor == "short": return "🔥 High execution risk", "High return expectations over a short horizon. Consider more debt / hybrid."
+    if "conserv" in rp and horizon_factor == "long": return "🟡 Cautious but slow", "Very conservative profile for a long-term goal. You may fall short if SIP is too low."
+    if horizon_factor == "short": return "🟠 Medium–High risk", "Short horizon means limited time to recover from volatility."
+    if horizon_factor == "long": return "🟢 Comfortable zone", "Long horizon gives you time to ride out market volatility."
+    return "🟡 Balanced risk", "Overall risk and horizon look reasonably aligned."
+
+
+def legacy_generate_insights(lp):
+    insights = []
+    years, ret, infl = lp["years"], lp["return"], lp["inflation"]
+    if years < 5 and ret >= 12: insights.append("For <5 years, assuming 12%+ returns is aggressive.")
+    if years >= 10 and ret <= 9: insights.append("For 10+ years, consider higher equity allocation to beat inflation.")
+    if infl < 4: insights.append("Inflation assumption is low. 5-7% is standard.")
+    if infl > 7: insights.append("High inflation assumption keeps you safe.")
+    if not insights: insights.append("Assumptions look broadly reasonable.")
+    return insights
+
+
+def legacy_get_investment_suggestions(profile, goal_type, years):
+    profile = (profile or "Moderate").lower()
+    goal_type = (goal_type or "General").lower()
+    horizon = "short" if years <= 5 else "medium" if years <= 10 else "long"
+    suggestions = []
+    if horizon == "short":
+        suggestions.append({"title": "Debt / Liquid mutual funds", "desc": "Focus on capital protection for goals under 5 years."})
+        suggestions.append({"title": "High-interest RD / FD", "desc": "Predictable, low-risk returns."})
+    elif horizon == "medium":
+        suggestions.append({"title": "Hybrid / Balanced Advantage", "desc": "Blends equity and debt, adjusting automatically."})
+        if "aggress" in profile or "moderate" in profile: suggestions.append({"title": "Large-cap index funds", "desc": "Growth with lower volatility than mid-caps."})
+    else:
+        suggestions.append({"title": "Equity index funds", "desc": "Low-cost broad market growth for 10+ years."})
+        suggestions.append({"title": "Flexi-cap funds", "desc": "Active management across market caps."})
+        if "conserv" in profile: suggestions.append({"title": "Hybrid equity-oriented", "desc": "Equity potential with debt cushioning."})
+    if "house" in goal_type: suggestions.append({"title": "Dedicated House Portfolio", "desc": "Keep separate to avoid dipping."})
+    if "education" in goal_type: suggestions.append({"title": "Inflation-focused", "desc": "Edu inflation is often higher than CPI."})
+    return suggestions
+
+
+def legacy_get_detailed_investment_split(profile, years):
+    profile = (profile or "Moderate").lower()
+    horizon = "short" if years <= 5 else "medium" if years <= 10 else "long"
+    if "aggress" in profile:
+        if horizon == "long": return [{"Bucket": "Core Equity", "Percent": 45}, {"Bucket": "Mid/Small Cap", "Percent": 20}, {"Bucket": "Thematic", "Percent": 10}, {"Bucket": "Hybrid", "Percent": 15}, {"Bucket": "Debt", "Percent": 10}]
+        if horizon == "medium": return [{"Bucket": "Core Equity", "Percent": 35}, {"Bucket": "Mid Cap", "Percent": 15}, {"Bucket": "Hybrid", "Percent": 25}, {"Bucket": "Debt", "Percent": 25}]
+        return [{"Bucket": "Large Cap", "Percent": 25}, {"Bucket": "Hybrid", "Percent": 25}, {"Bucket": "Debt", "Percent": 30}, {"Bucket": "Cash", "Percent": 20}]
+    if "conserv" in profile:
+        if horizon == "long": return [{"Bucket": "Large Cap", "Percent": 30}, {"Bucket": "Hybrid", "Percent": 30}, {"Bucket": "Debt", "Percent": 30}, {"Bucket": "Cash", "Percent": 10}]
+        if horizon == "medium": return [{"Bucket": "Large Cap", "Percent": 25}, {"Bucket": "Hybrid", "Percent": 30}, {"Bucket": "Debt", "Percent": 35}, {"Bucket": "Cash", "Percent": 10}]
+        return [{"Bucket": "Debt", "Percent": 50}, {"Bucket": "Cash", "Percent": 30}, {"Bucket": "Hybrid", "Percent": 20}]
+    if horizon == "long": return [{"Bucket": "Core Equity", "Percent": 40}, {"Bucket": "Mid Cap", "Percent": 15}, {"Bucket": "Hybrid", "Percent": 20}, {"Bucket": "Debt", "Percent": 15}, {"Bucket": "Cash", "Percent": 10}]
+    if horizon == "medium": return [{"Bucket": "Core Equity", "Percent": 30}, {"Bucket": "Hybrid", "Percent": 30}, {"Bucket": "Debt", "Percent": 30}, {"Bucket": "Cash", "Percent": 10}]
+    return [{"Bucket": "Debt", "Percent": 45}, {"Bucket": "Cash", "Percent": 25}, {"Bucket": "Hybrid", "Percent": 30}]
+
+
+# --- comparisons ---
+
+@pytest.mark.parametrize("profile", PROFILES)
+def test_profile_tables(profile):
+    for years in YEARS:
+        assert risk_heat_label(profile, years) == legacy_risk_heat_label(profile, years)
+        assert get_detailed_investment_split(profile, years) == legacy_get_detailed_investment_split(profile, years)
+        for goal_type in GOAL_TYPES:
+            assert (get_investment_suggestions(profile, goal_type, years)
+                    == legacy_get_investment_suggestions(profile, goal_type, years))
+
+
+def test_insights():
+    for years, ret, infl in itertools.product([1, 4, 4.9, 5, 9, 10, 15], [0, 8, 9, 9.5, 11.9, 12, 15],
+                                              [0, 3.9, 4, 5, 7, 7.1, 10]):
+        lp = {"years": years, "return": ret, "inflation": infl}
+        assert generate_insights(lp) == legacy_generate_insights(lp)
+
+
+def test_apply_rules_matches_scalar_rules():
+    combos = list(itertools.product(PROFILES, GOAL_TYPES, YEARS))
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(combos, columns=["risk_profile", "goal_type", "years"])
+    df["return"] = rng.choice([6.0, 9.0, 12.0, 14.0], len(df))
+    df["inflation"] = rng.choice([3.0, 5.0, 8.0], len(df))
+
+    out = apply_rules(df)
+    for row, result in zip(df.to_dict("records"), out.to_dict("records")):
+        profile, goal_type, years = row["risk_profile"], row["goal_type"], row["years"]
+        assert (result["risk_heat"], result["risk_heat_note"]) == legacy_risk_heat_label(profile, years)
+        assert list(result["investment_split"]) == legacy_get_detailed_investment_split(profile, years)
+        assert list(result["suggestions"]) == legacy_get_investment_suggestions(profile, goal_type, years)
+        assert list(result["insights"]) == legacy_generate_insights(row)
+
+
+def test_planning_imports_without_pandas():
+    import subprocess
+    import sys
+    code = "import sys, modules.planning; sys.exit('pandas' in sys.modules)"
+    assert subprocess.run([sys.executable, "-c", code]).returncode == 0
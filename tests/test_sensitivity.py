@@ -0,0 +1,86 @@
+"""Sweep and tornado against per-scenario brute force and across chunk sizes."""
+
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.sensitivity import AXES, SweepGrid, sweep, sweep_summary, tornado
+
+AMOUNT = np.array([1_000_000.0, 250_000.0])
+BASE_SIP = np.array([6_000.0, 4_000.0])
+GRID = SweepGrid.from_ranges(inflation=[4, 6], annual_return=[0, 8, 12], years=[1, 5, 7.5], step_up=[0, 10])
+BASE = {"inflation": 6.0, "return": 10.0, "years": 5.0, "step_up": 5.0}
+
+
+def _fv(sip, years, annual_return, step_up):
+    """Corpus of a stepped-up SIP, one month at a time."""
+    r, corpus = annual_return / 100 / 12, 0.0
+    for t in range(1, round(years * 12) + 1):
+        corpus = corpus * (1 + r) + sip * (1 + step_up / 100) ** ((t - 1) // 12)
+    return corpus
+
+
+def _scenario(amount, base_sip, inflation, ret, years, step_up):
+    target = amount * (1 + inflation / 100) ** years
+    corpus = _fv(base_sip, years, ret, step_up)
+    return target, target / _fv(1.0, years, ret, step_up), corpus
+
+
+def _collect(**kwargs) -> pd.DataFrame:
+    return pd.concat(sweep(AMOUNT, BASE_SIP, GRID, as_frame=True, **kwargs), ignore_index=True)
+
+
+def test_sweep_matches_brute_force():
+    out = _collect()
+    rows = list(itertools.product(range(len(AMOUNT)), *GRID.axes))
+    assert len(out) == len(rows) == len(AMOUNT) * GRID.size
+    for row, (g, infl, ret, years, step) in zip(out.to_dict("records"), rows):
+        assert (row["goal"], row["inflation"], row["return"], row["years"], row["step_up"]) == \
+            (g, infl, ret, years, step)
+        target, sip, corpus = _scenario(AMOUNT[g], BASE_SIP[g], infl, ret, years, step)
+        assert row["inflated_target"] == pytest.approx(target, rel=1e-12)
+        assert row["sip"] == pytest.approx(sip, rel=1e-9)
+        assert row["corpus"] == pytest.approx(corpus, rel=1e-9)
+        assert row["funded"] == pytest.approx(corpus / target, rel=1e-9)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 36, 1_000])
+def test_sweep_is_independent_of_chunk_size(chunk_size):
+    whole = _collect()
+    chunks = list(sweep(AMOUNT, BASE_SIP, GRID, chunk_size=chunk_size))
+    assert all(len(c["goal"]) <= chunk_size for c in chunks)
+    pd.testing.assert_frame_equal(_collect(chunk_size=chunk_size), whole, check_exact=True)
+    pd.testing.assert_frame_equal(sweep_summary(AMOUNT, BASE_SIP, GRID, chunk_size=chunk_size),
+                                  sweep_summary(AMOUNT, BASE_SIP, GRID), rtol=1e-12)
+
+
+def test_sweep_workers_match_serial():
+    pd.testing.assert_frame_equal(_collect(chunk_size=5, workers=2), _collect(), check_exact=True)
+
+
+def test_sweep_summary_matches_brute_force():
+    out = _collect()
+    summary = sweep_summary(AMOUNT, BASE_SIP, GRID, chunk_size=7)
+    by_goal = out.groupby("goal")
+    np.testing.assert_allclose(summary["sip_min"], by_goal["sip"].min(), rtol=1e-12)
+    np.testing.assert_allclose(summary["sip_max"], by_goal["sip"].max(), rtol=1e-12)
+    np.testing.assert_allclose(summary["sip_mean"], by_goal["sip"].mean(), rtol=1e-12)
+    np.testing.assert_allclose(summary["funded_share"], by_goal["funded"].apply(lambda f: (f >= 1).mean()))
+
+
+def test_tornado_rows_match_brute_force():
+    ranges = {"inflation": (4, 8), "return": (6, 14), "years": (3, 10), "step_up": (0, 10)}
+    out = tornado(AMOUNT, BASE_SIP, BASE, ranges)
+    assert len(out) == len(AMOUNT) * len(ranges)
+    for row in out.to_dict("records"):
+        g, axis = row["goal"], row["axis"]
+        at = lambda value: _scenario(AMOUNT[g], BASE_SIP[g], *(value if a == axis else BASE[a] for a in AXES))
+        _, sip_lo, corpus_lo = at(ranges[axis][0])
+        _, sip_hi, corpus_hi = at(ranges[axis][1])
+        assert (row["sip_low"], row["sip_high"]) == pytest.approx((sip_lo, sip_hi), rel=1e-9)
+        assert (row["corpus_low"], row["corpus_high"]) == pytest.approx((corpus_lo, corpus_hi), rel=1e-9)
+        assert row["sip_swing"] == pytest.approx(abs(sip_hi - sip_lo), rel=1e-9)
+    for _, rows in out.groupby("goal"):
+        assert rows["sip_swing"].is_monotonic_decreasing
@@ -0,0 +1,87 @@
+"""Session registry eviction, expiry and the memory budget."""
+
+import os
+import time
+
+from modules.session import ChatHistory, SessionRegistry, enforce_budget
+
+
+def _session(registry, sid, messages=10):
+    chat = ChatHistory(registry.chat_path(sid), max_in_memory=50)
+    for i in range(messages):
+        chat.append({"role": "user", "content": f"message {i}"})
+    state = registry.touch(sid, chat)
+    state["goals"] = [{"Goal": "Goal 1"}]
+    state["plan_portfolio"] = object()
+    return chat, state
+
+
+def test_idle_sessions_shed_rebuildable_state(tmp_path):
+    registry = SessionRegistry(idle_seconds=0, spill_dir=tmp_path, expire_seconds=3600)
+    chat, state = _session(registry, "a")
+    time.sleep(0.01)
+    assert registry.evict_idle(force=True) == 1
+    assert "goals" not in state and "plan_portfolio" not in state
+    assert chat.spilled_count == 10 and len(list(chat)) == 0
+    assert registry.evict_idle(force=True) == 0  # already shed
+    assert registry.touch("a", chat) is state and len(registry) == 1
+
+
+def test_expired_sessions_delete_spill_files(tmp_path):
+    registry = SessionRegistry(idle_seconds=0, spill_dir=tmp_path, expire_seconds=0)
+    chat, _ = _session(registry, "a")
+    chat.spill()
+    assert registry.chat_path("a").exists()
+    time.sleep(0.01)
+    registry.evict_idle(force=True)
+    assert not registry.chat_path("a").exists()
+    assert len(registry) == 0
+
+
+def test_sweep_removes_orphaned_files_only(tmp_path):
+    registry = SessionRegistry(idle_seconds=3600, spill_dir=tmp_path, expire_seconds=60)
+    old = tmp_path / "gone.jsonl"
+    old.write_text("{}\n")
+    os.utime(old, (time.time() - 120, time.time() - 120))
+    chat, _ = _session(registry, "live")
+    chat.spill()
+    os.utime(registry.chat_path("live"), (time.time() - 120, time.time() - 120))
+    registry.evict_idle(force=True)
+    assert not old.exists()
+    assert registry.chat_path("live").exists()
+
+
+def test_sweeps_are_throttled(tmp_path):
+    registry = SessionRegistry(idle_seconds=0, spill_dir=tmp_path, check_seconds=3600)
+    assert registry.evict_idle() == 0
+    _session(registry, "a")
+    time.sleep(0.01)
+    assert registry.evict_idle() == 0
+    assert registry.evict_idle(force=True) == 1
+
+
+def test_enforce_budget_spills_then_drops(tmp_path):
+    chat = ChatHistory(tmp_path / "s.jsonl", max_in_memory=50)
+    for i in range(50):
+        chat.append({"role": "user", "content": "x" * 200})
+    state = {"messages": chat, "goals": [{"Goal": "x" * 5000}], "plan_portfolio": None, "other": "y" * 10**6}
+    assert enforce_budget(state, 10_000) <= 10_000  # "other" is never sized or dropped
+    assert len(list(chat)) == 4 and "goals" in state and "plan_portfolio" in state
+
+    enforce_budget(state, 1_000)
+    assert "goals" not in state and "plan_portfolio" not in state and "other" in state
+
+
+def test_session_touched_during_eviction_keeps_reloaded_state(tmp_path, monkeypatch):
+    registry = SessionRegistry(idle_seconds=0, spill_dir=tmp_path)
+    chat, state = _session(registry, "a")
+    time.sleep(0.01)
+
+    def rerun_meanwhile(self, keep=0):
+        # The session comes back while its chat is being spilled and reloads its goals
+        touched = registry.touch("a", chat)
+        touched.setdefault("goals", ["reloaded"])
+    monkeypatch.setattr(ChatHistory, "spill", rerun_meanwhile)
+
+    registry.evict_idle(force=True)
+    assert state["goals"] == ["reloaded"]